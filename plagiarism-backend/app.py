@@ -1,47 +1,74 @@
 from flask import Flask, jsonify
 from config import Config
 from extensions import db, jwt, bcrypt, cors
-from routes.auth_routes import auth_bp
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from routes.file_routes import file_bp
 from werkzeug.exceptions import RequestEntityTooLarge
 import logging
 
-app = Flask(__name__)
-app.config.from_object(Config)
-app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024  # 10MB
 
-# Initialize extensions
-db.init_app(app)
-jwt.init_app(app)
-bcrypt.init_app(app)
-cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
+def create_app():
+    # Blueprints pull in the detectors, which load the semantic model
+    from routes.auth_routes import auth_bp
+    from routes.file_routes import file_bp
+    from models.file_model import File
+    from models.result_model import Result
+    from models.schema import upgrade_schema
+    from utils.vector_index import track_deletions
+    from utils.http_replay import install as install_http_replay
 
-# Register blueprints
-app.register_blueprint(auth_bp, url_prefix="/api/auth")
-app.register_blueprint(file_bp, url_prefix="/api/files")
-print(app.url_map)
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024  # 10MB
 
-logging.basicConfig(level=logging.INFO)
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    bcrypt.init_app(app)
+    cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
+
+    # Add model columns that existing tables predate
+    with app.app_context():
+        upgrade_schema(db)
+
+    # Drop history index entries when results/files are deleted
+    track_deletions(db.session, {Result: "result", File: "file"})
+
+    # Recorded / fault-injected search and page traffic (HTTP_REPLAY_MODE)
+    install_http_replay()
 
-@app.route("/api/protected", methods=["GET"])
-@jwt_required()
-def protected():
-    current_user = get_jwt_identity()
-    return jsonify({"message": f"Hello User {current_user}"}), 200
+    # Register blueprints
+    app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    app.register_blueprint(file_bp, url_prefix="/api/files")
+    print(app.url_map)
 
-# ==========================================
-# GLOBAL ERROR HANDLERS
-# ==========================================
+    @app.route("/api/protected", methods=["GET"])
+    @jwt_required()
+    def protected():
+        current_user = get_jwt_identity()
+        return jsonify({"message": f"Hello User {current_user}"}), 200
 
-@app.errorhandler(404)
-def not_found(e):
-    return jsonify({"error": "Resource not found"}), 404
+    # ==========================================
+    # GLOBAL ERROR HANDLERS
+    # ==========================================
 
+    @app.errorhandler(404)
+    def not_found(e):
+        return jsonify({"error": "Resource not found"}), 404
+
+    @app.errorhandler(500)
+    def internal_error(e):
+        return jsonify({"error": "Internal server error"}), 500
+
+    return app
+
+
+logging.basicConfig(level=logging.INFO)
 
-@app.errorhandler(500)
-def internal_error(e):
-    return jsonify({"error": "Internal server error"}), 500
+# Spawned pool workers (PDF reports) re-run this file as __mp_main__ when the
+# server was started with `python app.py`; they only need their own module,
+# not a second app and semantic model
+if __name__ != "__mp_main__":
+    app = create_app()
 
 
 if __name__ == "__main__":
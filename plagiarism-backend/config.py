@@ -11,6 +11,86 @@ class Config:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     GOOGLE_SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
     SERPER_API_KEY= os.getenv("SERPER_API_KEY")
+    SERPER_URL = os.getenv("SERPER_URL", "https://google.serper.dev/search")
+
+    # Semantic model inference backend: torch | torch-int8 | onnx | onnx-int8
+    # (onnx backends need: pip install "sentence-transformers[onnx]")
+    SEMANTIC_BACKEND = os.getenv("SEMANTIC_BACKEND", "torch")
+
+    # Word tokenizer for preprocessing: regex | nltk
+    TOKENIZER = os.getenv("TOKENIZER", "regex")
+
+    # Lexical candidates per file sentence passed to semantic scoring
+    CANDIDATE_TOP_K = int(os.getenv("CANDIDATE_TOP_K", 10))
+
+    # Web search queries per scan and optional corpus IDF table (JSON term -> idf)
+    SEARCH_QUERY_BUDGET = int(os.getenv("SEARCH_QUERY_BUDGET", 5))
+    QUERY_IDF_PATH = os.getenv("QUERY_IDF_PATH")
+
+    # Search client: queries per provider request, concurrency, rate limit,
+    # retries and daily quota (0 = unlimited)
+    SEARCH_BATCH_SIZE = int(os.getenv("SEARCH_BATCH_SIZE", 5))
+    SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", 4))
+    SEARCH_RATE_PER_SEC = float(os.getenv("SEARCH_RATE_PER_SEC", 5))
+    SEARCH_BURST = int(os.getenv("SEARCH_BURST", 10))
+    SEARCH_MAX_RETRIES = int(os.getenv("SEARCH_MAX_RETRIES", 3))
+    SEARCH_BACKOFF_BASE = float(os.getenv("SEARCH_BACKOFF_BASE", 0.5))
+    SEARCH_DAILY_QUOTA = int(os.getenv("SEARCH_DAILY_QUOTA", 0))
+    SEARCH_QUOTA_PATH = os.getenv("SEARCH_QUOTA_PATH", "search_quota.json")
+    # Token bucket state shared by all processes (empty = per process)
+    SEARCH_RATE_PATH = os.getenv("SEARCH_RATE_PATH", "search_rate.json")
+
+    # Record/replay of outbound search + page traffic (utils.http_replay):
+    # mode record | replay | live (empty = off), cassette dir, latency/failure
+    # profile none | lan | typical | degraded | outage
+    HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "")
+    HTTP_REPLAY_DIR = os.getenv("HTTP_REPLAY_DIR", "http_cassettes")
+    HTTP_REPLAY_PROFILE = os.getenv("HTTP_REPLAY_PROFILE", "none")
+
+    # Bulk PDF reports: render processes, reports queued/held at once, ids per request
+    REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 2))
+    REPORT_MAX_IN_FLIGHT = int(os.getenv("REPORT_MAX_IN_FLIGHT", 4))
+    REPORT_BULK_MAX = int(os.getenv("REPORT_BULK_MAX", 500))
+
+    # Byte cap per downloaded web source
+    PAGE_MAX_BYTES = int(os.getenv("PAGE_MAX_BYTES", 2 * 1024 * 1024))
+
+    # Total time budget per web scan (seconds) and parallel page fetches
+    SCAN_TIME_BUDGET = float(os.getenv("SCAN_TIME_BUDGET", 60))
+    SCAN_FETCH_CONCURRENCY = int(os.getenv("SCAN_FETCH_CONCURRENCY", 6))
+
+    # Scan sources: web | local | both, and the local BM25 reference corpus
+    SCAN_SOURCES = os.getenv("SCAN_SOURCES", "web")
+    LOCAL_CORPUS_DIR = os.getenv("LOCAL_CORPUS_DIR", "corpus_index")
+    LOCAL_SEARCH_RESULTS = int(os.getenv("LOCAL_SEARCH_RESULTS", 3))
+
+    # Sentence history index (ANN over past submissions)
+    SENTENCE_INDEX_DIR = os.getenv("SENTENCE_INDEX_DIR", "sentence_index")
+    SENTENCE_INDEX_NLIST = int(os.getenv("SENTENCE_INDEX_NLIST", 1024))
+    SENTENCE_INDEX_NPROBE = int(os.getenv("SENTENCE_INDEX_NPROBE", 8))
+    SENTENCE_INDEX_TRAIN_MIN = int(os.getenv("SENTENCE_INDEX_TRAIN_MIN", 20000))
+    SENTENCE_INDEX_COMPACT_RATIO = float(os.getenv("SENTENCE_INDEX_COMPACT_RATIO", 0.3))
+    HISTORY_MATCH_THRESHOLD = float(os.getenv("HISTORY_MATCH_THRESHOLD", 80))
+
+    # Precomputed sentence splits + embeddings per uploaded file (sharded,
+    # memory-mapped); unused entries expire, LRU trimmed above the size cap
+    EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", "embedding_store")
+    EMBEDDING_STORE_TTL_DAYS = int(os.getenv("EMBEDDING_STORE_TTL_DAYS", 14))
+    EMBEDDING_STORE_MAX_MB = int(os.getenv("EMBEDDING_STORE_MAX_MB", 2048))
+
+    # Per-chunk memo of web scan results for resubmitted drafts; expired
+    # entries are swept, oldest trimmed above the size cap
+    CHUNK_MEMO_ENABLED = os.getenv("CHUNK_MEMO_ENABLED", "1") == "1"
+    CHUNK_MEMO_DIR = os.getenv("CHUNK_MEMO_DIR", "chunk_memo")
+    CHUNK_MEMO_TTL_DAYS = int(os.getenv("CHUNK_MEMO_TTL_DAYS", 30))
+    CHUNK_MEMO_MAX_MB = int(os.getenv("CHUNK_MEMO_MAX_MB", 512))
+
+    # /check switches to streamed, sketch-based scoring above this size (bytes)
+    LARGE_DOC_THRESHOLD = int(os.getenv("LARGE_DOC_THRESHOLD", 2 * 1024 * 1024))
+
+    # Early-exit scoring cascade for /check
+    CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "1") == "1"
+    CASCADE_TFIDF_MARGIN = float(os.getenv("CASCADE_TFIDF_MARGIN", 0.03))
     
     
 
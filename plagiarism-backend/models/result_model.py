@@ -20,6 +20,10 @@ class Result(db.Model):
     jaccard_score = db.Column(db.Float, nullable=False)
     sequence_score = db.Column(db.Float, nullable=False)
 
+    # Score columns the cascade estimated from bounds instead of measuring
+    # (e.g. ["sequence"]); NULL/empty when all were measured
+    estimated_scores = db.Column(db.JSON)
+
     level = db.Column(db.String(20), nullable=False)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,32 @@
+from sqlalchemy import inspect, text
+
+
+# db.create_all() only creates missing tables, it never alters existing ones.
+# Columns added to a model after its table was created are listed here and
+# added on startup. They must be nullable (existing rows get NULL).
+
+ADDED_COLUMNS = {
+    "results": ["estimated_scores"],
+}
+
+
+def upgrade_schema(db):
+    inspector = inspect(db.engine)
+
+    for table_name, columns in ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+
+        existing = {c["name"] for c in inspector.get_columns(table_name)}
+
+        for name in columns:
+            if name in existing:
+                continue
+
+            column = db.metadata.tables[table_name].columns[name]
+            column_type = column.type.compile(dialect=db.engine.dialect)
+
+            with db.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+
+            print(f"🛠 Added column {table_name}.{name}")
@@ -1,30 +1,30 @@
 import io
 import os
-import html
-import fitz  # PyMuPDF (Required for PDF text extraction)
-from datetime import datetime
-from flask import Blueprint, request, jsonify, send_file
+import csv
+import json
+import zlib
+import queue
+import threading
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, send_file, Response, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 from models.user_model import User
 
 
-# ReportLab components for PDF generation
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, ListFlowable, ListItem
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch, mm
-
-
 # Project specific imports
+from config import Config
 from extensions import db
 from models.file_model import File
 from models.result_model import Result
-from utils.text_extractor import extract_text
-from utils.plagiarism_engine import PlagiarismEngine
-from utils.internet_detector import InternetDetector
+from utils.text_extractor import extract_text, read_plain
+from utils.plagiarism_engine import STOP_WORDS
+from utils.sketches import compare_streams
+from utils.score_cascade import ScoreCascade, check_level, percent
+from utils.internet_detector import InternetDetector, internet_level
+from utils.history_detector import HistoryDetector
+from utils.embedding_store import EmbeddingStore, get_embedding_store
+from utils.report_builder import build_report, report_payload, render_reports, stream_report_zip
 
 
 
@@ -47,6 +47,16 @@ def allowed_file(filename):
     return ext in ALLOWED_EXTENSIONS
 
 
+# Size of an uploaded file without reading it into memory
+def upload_size(file):
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
 
 # FILE UPLOAD ROUTE
 
@@ -86,6 +96,12 @@ def upload_file():
     db.session.add(new_file)
     db.session.commit()
 
+    # Background: sentence splits + embeddings (embedding store), then history index
+    HistoryDetector.index_in_background(
+        f"file:{new_file.id}", user_id, extracted_text,
+        file_key=EmbeddingStore.key(file_path)
+    )
+
     return jsonify({
         "message": "File uploaded successfully",
         "file_id": new_file.id,
@@ -107,30 +123,42 @@ def check_plagiarism():
     if not file1 or not file2:
         return jsonify({"error": "Both files are required"}), 400
 
-    text1 = file1.read().decode("utf-8", errors="ignore")
-    text2 = file2.read().decode("utf-8", errors="ignore")
+    # Large-document mode: streamed windows + sketches, bounded memory
+    mode = request.form.get("mode")
+    if mode not in ("standard", "large"):
+        largest = max(upload_size(file1), upload_size(file2))
+        mode = "large" if largest > Config.LARGE_DOC_THRESHOLD else "standard"
 
-    
-    tfidf_score = PlagiarismEngine.tfidf_similarity(text1, text2)
-    jaccard_score = PlagiarismEngine.jaccard_similarity(text1, text2)
-    sequence_score = PlagiarismEngine.sequence_similarity(text1, text2)
-
-   
-    final_score = (
-        (0.4 * tfidf_score) +
-        (0.3 * jaccard_score) +
-        (0.3 * sequence_score)
-    )
+    if mode == "large":
+        tfidf_score, jaccard_score, sequence_score = compare_streams(
+            file1.stream, file2.stream, stop_words=STOP_WORDS
+        )
+        cascade = None
+
+        final_score = (
+            (0.4 * tfidf_score) +
+            (0.3 * jaccard_score) +
+            (0.3 * sequence_score)
+        )
 
-    percentage_score = float(round(final_score * 100, 2))
+        percentage_score = float(round(final_score * 100, 2))
+        level = check_level(percentage_score)
+        estimated = []
 
-    
-    if percentage_score <= 30:
-        level = "Low"
-    elif percentage_score <= 70:
-        level = "Medium"
     else:
-        level = "High"
+        text1 = file1.read().decode("utf-8", errors="ignore")
+        text2 = file2.read().decode("utf-8", errors="ignore")
+
+        # Early-exit cascade; exact=true always computes every metric (audits)
+        exact = request.form.get("exact", "false").lower() in ("1", "true", "yes")
+        cascade = ScoreCascade.score(text1, text2, exact=exact)
+
+        tfidf_score = cascade["tfidf"]
+        jaccard_score = cascade["jaccard"]
+        sequence_score = cascade["sequence"]
+        estimated = cascade["estimated"]
+        percentage_score = float(cascade["score"])
+        level = cascade["level"]
 
     
     result = Result(
@@ -140,9 +168,10 @@ def check_plagiarism():
         file2_name=file2.filename,
         plagiarism_score=percentage_score,
 
-        tfidf_score=float(round(tfidf_score * 100, 2)),
-        jaccard_score=float(round(jaccard_score * 100, 2)),
-        sequence_score=float(round(sequence_score * 100, 2)),
+        tfidf_score=percent(tfidf_score),
+        jaccard_score=percent(jaccard_score),
+        sequence_score=percent(sequence_score),
+        estimated_scores=estimated or None,
 
         level=level
     )
@@ -154,10 +183,15 @@ def check_plagiarism():
         "plagiarism_score": percentage_score,
         "level": level,
         "breakdown": {
-            "tfidf": float(round(tfidf_score * 100, 2)),
-            "jaccard": float(round(jaccard_score * 100, 2)),
-            "sequence": float(round(sequence_score * 100, 2))
+            "tfidf": result.tfidf_score,
+            "jaccard": result.jaccard_score,
+            "sequence": result.sequence_score
         },
+        "estimated_scores": estimated,
+        "mode": mode,
+        "decided_by": cascade["tier"] if cascade else "sketch",
+        "exact": bool(cascade and cascade["exact"]),
+        "score_range": cascade["score_range"] if cascade else None,
         "result_id": result.id
     }), 200
     
@@ -165,6 +199,52 @@ def check_plagiarism():
 
 # INTERNET SOURCE DETECTION
 
+# Text of an /internet-check or /corpus-check upload. Extracted exactly as
+# /upload extracts a stored file, so the splits precomputed for the same
+# bytes apply; other types are read as UTF-8 text.
+def read_internet_upload(file):
+    extension = os.path.splitext(file.filename)[1].lower()
+
+    if extension in ALLOWED_EXTENSIONS:
+        return extract_text(file.stream, extension)
+
+    return read_plain(file.stream)
+
+
+# Store key of an upload and its precomputed embeddings (None until the
+# background precompute for the same file bytes has finished)
+def upload_embeddings(file):
+    key = EmbeddingStore.key(file.stream)
+    return key, get_embedding_store().get(key)
+
+
+SCAN_SOURCES = {"web", "local", "both"}
+
+
+def save_internet_result(user_id, filename, content, internet_result):
+    overall_score = internet_result.get("overall_score", 0)
+    matches = internet_result.get("matches", [])
+
+    new_result = Result(
+        user_id=user_id,
+        file1_name=filename,
+        file2_name="Web Search",
+        plagiarism_score=overall_score,
+        tfidf_score=overall_score,  # placeholder
+        jaccard_score=0,
+        sequence_score=0,
+        level=internet_level(overall_score),
+        internet_matches=matches,   #  Save actual matches list
+        original_text=content,
+        created_at=datetime.utcnow()
+    )
+
+    db.session.add(new_result)
+    db.session.commit()
+
+    return new_result
+
+
 @file_bp.route('/internet-check', methods=['POST'])
 @jwt_required()
 def internet_check():
@@ -177,24 +257,17 @@ def internet_check():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
+    sources = request.form.get("sources", Config.SCAN_SOURCES)
+
+    if sources not in SCAN_SOURCES:
+        return jsonify({"error": "sources must be web, local or both"}), 400
+
     try:
         filename = file.filename
 
         # 1️ .TEXT EXTRACTION (PDF + TXT)
-        
-        if filename.lower().endswith('.pdf'):
-
-            pdf_stream = file.read()
-            doc = fitz.open(stream=pdf_stream, filetype="pdf")
-
-            content = ""
-            for page in doc:
-                content += page.get_text()
-
-            doc.close()
-
-        else:
-            content = file.read().decode('utf-8', errors="ignore")
+        file_key, embeddings = upload_embeddings(file)
+        content = read_internet_upload(file)
 
         if not content.strip():
             return jsonify({
@@ -204,35 +277,193 @@ def internet_check():
         # 2. INTERNET SCAN
         print(f"\n--- Internet Scanning: {filename} ---")
 
-        internet_result = InternetDetector.detect_internet_plagiarism(content)
+        internet_result = InternetDetector.detect_internet_plagiarism(
+            content, sources=sources, embeddings=embeddings
+        )
 
         #  CORRECT KEYS
         overall_score = internet_result.get("overall_score", 0)
         matches = internet_result.get("matches", [])
         total_sources_checked = internet_result.get("total_sources_checked", 0)
         total_matched_sources = internet_result.get("total_matched_sources", 0)
+        partial = internet_result.get("partial", False)
+        coverage = internet_result.get("coverage", {})
+
+        # 3️ SAVE TO DATABASE
+        new_result = save_internet_result(get_jwt_identity(), filename, content, internet_result)
+
+        HistoryDetector.index_in_background(
+            f"result:{new_result.id}", new_result.user_id, content, file_key=file_key
+        )
+
+        # 4️ RETURN RESPONSE
+        return jsonify({
+            "message": "Internet scan completed",
+            "result_id": new_result.id,
+            "overall_score": overall_score,
+            "plagiarism_score": overall_score,  # alias for frontend consistency
+            "level": new_result.level,
+            "matches": matches[:5],  # return top 5 matches
+            "total_sources_checked": total_sources_checked,
+            "total_matched_sources": total_matched_sources,
+            "partial": partial,  # scan hit its time budget
+            "sources": sources,
+            "coverage": coverage,
+            "reuse": internet_result.get("reuse", {})  # work reused from earlier drafts
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ INTERNET CHECK ERROR: {str(e)}")
+        return jsonify({
+            "error": f"Server error: {str(e)}"
+        }), 500
+
+
+# INTERNET SOURCE DETECTION (SERVER-SENT EVENTS)
+#
+# Same scan as /internet-check, streamed as it runs:
+#   event: plan | queries | source | match | summary | result | error
+# The scan and the final Result save run in a background thread, so the
+# result is persisted even if the client disconnects early.
+
+def sse_event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+@file_bp.route('/internet-check/stream', methods=['POST'])
+@jwt_required()
+def internet_check_stream():
+
+    if 'file' not in request.files:
+        return jsonify({"error": "No file part in the request"}), 400
+
+    file = request.files['file']
+
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    sources = request.form.get("sources", Config.SCAN_SOURCES)
+
+    if sources not in SCAN_SOURCES:
+        return jsonify({"error": "sources must be web, local or both"}), 400
+
+    filename = file.filename
+    file_key, embeddings = upload_embeddings(file)
+    content = read_internet_upload(file)
+
+    if not content.strip():
+        return jsonify({
+            "error": "Could not extract text or file is empty"
+        }), 400
+
+    user_id = get_jwt_identity()
+    app = current_app._get_current_object()
+    events = queue.Queue()
+
+    def run_scan():
+        with app.app_context():
+            try:
+                print(f"\n--- Internet Scanning (stream): {filename} ---")
+
+                internet_result = InternetDetector.detect_internet_plagiarism(
+                    content,
+                    on_event=lambda name, data: events.put((name, data)),
+                    sources=sources,
+                    embeddings=embeddings
+                )
+
+                new_result = save_internet_result(user_id, filename, content, internet_result)
+
+                HistoryDetector.index_in_background(
+                    f"result:{new_result.id}", user_id, content, file_key=file_key
+                )
+
+                events.put(("result", {
+                    "result_id": new_result.id,
+                    "overall_score": new_result.plagiarism_score,
+                    "level": new_result.level
+                }))
+
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ INTERNET CHECK ERROR: {str(e)}")
+                events.put(("error", {"error": f"Server error: {str(e)}"}))
+
+            finally:
+                events.put(None)
+
+    threading.Thread(target=run_scan, daemon=True).start()
+
+    def generate():
+        while True:
+            try:
+                item = events.get(timeout=15)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+
+            if item is None:
+                break
+
+            yield sse_event(*item)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+    
+
+# SUBMISSION HISTORY DETECTION
+#
+# Sentence-level semantic check against every earlier submission from other
+# users (persistent ANN index). The checked document is added to the history
+# afterwards.
+
+@file_bp.route('/corpus-check', methods=['POST'])
+@jwt_required()
+def corpus_check():
+
+    if 'file' not in request.files:
+        return jsonify({"error": "No file part in the request"}), 400
+
+    file = request.files['file']
+
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    try:
+        user_id = get_jwt_identity()
+        filename = file.filename
+        file_key, embeddings = upload_embeddings(file)
+        content = read_internet_upload(file)
+
+        if not content.strip():
+            return jsonify({
+                "error": "Could not extract text or file is empty"
+            }), 400
+
+        history_result = HistoryDetector.detect_history_plagiarism(content, user_id, embeddings)
+
+        overall_score = history_result["overall_score"]
+        matches = history_result["matches"]
 
-        # 3️ DETERMINE LEVEL
-        if overall_score >= 70:
-            level = "High"
-        elif overall_score >= 30:
-            level = "Moderate"
-        elif overall_score > 0:
-            level = "Low"
-        else:
-            level = "Unique"
-
-        # 4️ SAVE TO DATABASE
         new_result = Result(
-            user_id=get_jwt_identity(),
+            user_id=user_id,
             file1_name=filename,
-            file2_name="Web Search",
+            file2_name="Submission History",
             plagiarism_score=overall_score,
             tfidf_score=overall_score,  # placeholder
             jaccard_score=0,
             sequence_score=0,
-            level=level,
-            internet_matches=matches,   #  Save actual matches list
+            level=internet_level(overall_score),
+            internet_matches=matches,
             original_text=content,
             created_at=datetime.utcnow()
         )
@@ -240,28 +471,29 @@ def internet_check():
         db.session.add(new_result)
         db.session.commit()
 
-        # 5️ RETURN RESPONSE
+        HistoryDetector.index_in_background(
+            f"result:{new_result.id}", user_id, content, file_key=file_key
+        )
+
         return jsonify({
-            "message": "Internet scan completed",
+            "message": "History scan completed",
             "result_id": new_result.id,
             "overall_score": overall_score,
-            "plagiarism_score": overall_score,  # alias for frontend consistency
-            "level": level,
-            "matches": matches[:5],  # return top 5 matches
-            "total_sources_checked": total_sources_checked,
-            "total_matched_sources": total_matched_sources
+            "plagiarism_score": overall_score,
+            "level": new_result.level,
+            "matches": matches[:5],
+            "total_sentences": history_result["total_sentences"],
+            "matched_sentences": history_result["matched_sentences"]
         }), 200
 
     except Exception as e:
         db.session.rollback()
-        print(f"❌ INTERNET CHECK ERROR: {str(e)}")
+        print(f"❌ CORPUS CHECK ERROR: {str(e)}")
         return jsonify({
             "error": f"Server error: {str(e)}"
         }), 500
 
 
-    
-
 # GET USER RESULT HISTORY (WITH PAGINATION)
 
 @file_bp.route("/results", methods=["GET"])
@@ -291,6 +523,7 @@ def get_user_results():
             "tfidf_score": float(r.tfidf_score),
             "jaccard_score": float(r.jaccard_score),
             "sequence_score": float(r.sequence_score),
+            "estimated_scores": r.estimated_scores or [],
             "level": r.level,
             "created_at": r.created_at.strftime("%Y-%m-%d %H:%M:%S")
         })
@@ -305,6 +538,131 @@ def get_user_results():
 
 
 
+# STREAMING EXPORT OF RESULT HISTORY
+#
+# GET /results/export?format=csv|jsonl&from=YYYY-MM-DD&to=YYYY-MM-DD
+#                     &level=High,Medium&fields=internet_matches,original_text
+#                     &gzip=1
+#
+# Rows come from a server-side cursor (yield_per) and are written out in
+# small blocks, so memory stays flat however many results match. The heavy
+# columns are only selected when asked for.
+
+EXPORT_FIELDS = [
+    "result_id", "file1_name", "file2_name", "plagiarism_score",
+    "tfidf_score", "jaccard_score", "sequence_score", "level", "created_at"
+]
+EXPORT_OPTIONAL_FIELDS = {"internet_matches", "original_text", "estimated_scores"}
+EXPORT_LEVELS = {"Low", "Medium", "High", "Moderate", "Unique"}
+EXPORT_BATCH = 500
+
+
+def parse_export_date(value):
+    return datetime.strptime(value, "%Y-%m-%d") if value else None
+
+
+@file_bp.route("/results/export", methods=["GET"])
+@jwt_required()
+def export_results():
+    user_id = get_jwt_identity()
+
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in ("csv", "jsonl"):
+        return jsonify({"error": "format must be csv or jsonl"}), 400
+
+    extra = [f for f in request.args.get("fields", "").split(",") if f]
+    unknown = set(extra) - EXPORT_OPTIONAL_FIELDS
+    if unknown:
+        return jsonify({"error": f"Unknown fields: {', '.join(sorted(unknown))}"}), 400
+
+    levels = [l for l in request.args.get("level", "").split(",") if l]
+    if set(levels) - EXPORT_LEVELS:
+        return jsonify({"error": "Unknown level"}), 400
+
+    try:
+        date_from = parse_export_date(request.args.get("from"))
+        date_to = parse_export_date(request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": "Dates must be YYYY-MM-DD"}), 400
+
+    compress = request.args.get("gzip", "false").lower() in ("1", "true", "yes")
+
+    fields = EXPORT_FIELDS + [f for f in sorted(EXPORT_OPTIONAL_FIELDS) if f in extra]
+    columns = [Result.id] + [getattr(Result, f) for f in fields[1:]]
+
+    query = db.session.query(*columns).filter(Result.user_id == user_id)
+
+    if date_from:
+        query = query.filter(Result.created_at >= date_from)
+    if date_to:
+        query = query.filter(Result.created_at < date_to + timedelta(days=1))
+    if levels:
+        query = query.filter(Result.level.in_(levels))
+
+    query = query.order_by(Result.id).yield_per(EXPORT_BATCH)
+
+    def export_row(row):
+        record = dict(zip(fields, row))
+        record["created_at"] = record["created_at"].strftime("%Y-%m-%d %H:%M:%S") if record["created_at"] else None
+        for key in ("plagiarism_score", "tfidf_score", "jaccard_score", "sequence_score"):
+            record[key] = float(record[key])
+        return record
+
+    def text_blocks():
+        buffer = io.StringIO()
+        writer = None
+
+        if export_format == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+
+        for count, row in enumerate(query, 1):
+            record = export_row(row)
+
+            if writer:
+                for key in ("internet_matches", "estimated_scores"):
+                    if key in record:
+                        record[key] = json.dumps(record[key])
+                writer.writerow([record[f] for f in fields])
+            else:
+                buffer.write(json.dumps(record) + "\n")
+
+            if count % EXPORT_BATCH == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    def generate():
+        if not compress:
+            for block in text_blocks():
+                yield block.encode("utf-8")
+            return
+
+        # wbits=31: gzip container, compressed on the fly block by block
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for block in text_blocks():
+            chunk = compressor.compress(block.encode("utf-8"))
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+
+    filename = f"results_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    mimetype = "text/csv" if export_format == "csv" else "application/x-ndjson"
+
+    if compress:
+        filename += ".gz"
+        mimetype = "application/gzip"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+
 # GET SINGLE RESULT
 
 @file_bp.route("/results/<int:result_id>", methods=["GET"])
@@ -328,6 +686,7 @@ def get_single_result(result_id):
         "tfidf_score": float(result.tfidf_score),
         "jaccard_score": float(result.jaccard_score),
         "sequence_score": float(result.sequence_score),
+        "estimated_scores": result.estimated_scores or [],
         "level": result.level,
         "created_at": result.created_at.strftime("%Y-%m-%d %H:%M:%S")
     }
@@ -398,131 +757,7 @@ def generate_report(result_id):
     try:
         file_path = os.path.join(REPORT_FOLDER, f"report_{result_id}.pdf")
 
-        doc = SimpleDocTemplate(file_path, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # HEADER SECTION
-        # -----------------------------------------
-        elements.append(Paragraph("<b>PLAGIARISM DETECTION REPORT</b>", styles["Title"]))
-        elements.append(Spacer(1, 0.3 * inch))
-
-        elements.append(Paragraph(f"<b>User:</b> {user.email}", styles["Normal"]))
-        elements.append(Paragraph(f"<b>File:</b> {result.file1_name}", styles["Normal"]))
-        elements.append(Paragraph(f"<b>Date:</b> {result.created_at.strftime('%Y-%m-%d %H:%M')}", styles["Normal"]))
-        elements.append(Spacer(1, 0.3 * inch))
-
-        # -----------------------------------------
-        # OVERALL SCORE SECTION
-        # -----------------------------------------
-        score = float(result.plagiarism_score)
-
-        if score >= 70:
-            score_color = colors.red
-        elif score >= 30:
-            score_color = colors.orange
-        else:
-            score_color = colors.green
-
-        score_style = ParagraphStyle(
-            'ScoreStyle',
-            fontSize=24,
-            alignment=1,
-            textColor=score_color
-        )
-
-        elements.append(Paragraph(f"<b>{score}% SIMILARITY</b>", score_style))
-        elements.append(Spacer(1, 0.4 * inch))
-
-        # -----------------------------------------
-        # PIE CHART (Original vs Plagiarized)
-        # -----------------------------------------
-        from reportlab.graphics.shapes import Drawing
-        from reportlab.graphics.charts.piecharts import Pie
-
-        drawing = Drawing(400, 200)
-        pie = Pie()
-        pie.x = 150
-        pie.y = 15
-        pie.width = 150
-        pie.height = 150
-
-        pie.data = [score, 100 - score]
-        pie.labels = ['Plagiarized', 'Original']
-
-        pie.slices[0].fillColor = colors.red
-        pie.slices[1].fillColor = colors.green
-
-        drawing.add(pie)
-        elements.append(drawing)
-        elements.append(Spacer(1, 0.5 * inch))
-
-        # -----------------------------------------
-        # MATCHED SOURCES TABLE
-        # -----------------------------------------
-        elements.append(Paragraph("<b>Matched Sources</b>", styles["Heading2"]))
-        elements.append(Spacer(1, 0.2 * inch))
-
-        matches = result.internet_matches or []
-
-        table_data = [["#", "Source URL", "Match %"]]
-
-        for i, match in enumerate(matches[:10], 1):
-            url = match.get("source", "N/A")
-            similarity = match.get("score", 0)
-
-            link = Paragraph(
-                f"<link href='{url}' color='blue'>{url[:60]}...</link>",
-                styles["Normal"]
-            )
-
-            table_data.append([str(i), link, f"{similarity}%"])
-
-        if len(table_data) == 1:
-            table_data.append(["-", "No sources detected", "0%"])
-
-        table = Table(table_data, colWidths=[0.5*inch, 4.0*inch, 1.0*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
-
-        elements.append(table)
-        elements.append(Spacer(1, 0.5 * inch))
-
-        # -----------------------------------------
-        # DOCUMENT ANALYSIS SECTION
-        # -----------------------------------------
-        elements.append(Paragraph("<b>Detailed Document Analysis</b>", styles["Heading2"]))
-        elements.append(Spacer(1, 0.3 * inch))
-
-        original_text = result.original_text or ""
-        safe_text = html.escape(original_text)
-
-        # Highlight plagiarized sentences
-        for match in matches:
-            sentence = match.get("file_text", "")
-            if sentence and len(sentence) > 20:
-                escaped = html.escape(sentence)
-                highlighted = f"<font color='red'><b>{escaped}</b></font>"
-                safe_text = safe_text.replace(escaped, highlighted)
-
-        body_style = ParagraphStyle(
-            'BodyStyle',
-            fontSize=10,
-            leading=14
-        )
-
-        elements.append(Paragraph(safe_text, body_style))
-
-        # -----------------------------------------
-        # PAGE FOOTER (Page Numbers)
-        # -----------------------------------------
-        def add_page_number(canvas, doc):
-            page_num_text = f"Page {doc.page}"
-            canvas.drawRightString(200*mm, 15*mm, page_num_text)
-
-        doc.build(elements, onLaterPages=add_page_number, onFirstPage=add_page_number)
+        build_report(report_payload(result, user.email), file_path)
 
         return send_file(file_path, as_attachment=True)
 
@@ -531,6 +766,59 @@ def generate_report(result_id):
         return jsonify({"error": str(e)}), 500
 
 
+# BULK PDF REPORTS (zip, streamed as each report finishes)
+
+@file_bp.route("/reports/bulk", methods=["POST"])
+@jwt_required()
+def generate_bulk_reports():
+
+    user_id = get_jwt_identity()
+
+    data = request.get_json(silent=True) or {}
+    result_ids = data.get("result_ids")
+
+    if not isinstance(result_ids, list) or not result_ids:
+        return jsonify({"error": "result_ids must be a non-empty list"}), 400
+
+    if not all(isinstance(i, int) for i in result_ids):
+        return jsonify({"error": "result_ids must be integers"}), 400
+
+    result_ids = list(dict.fromkeys(result_ids))
+
+    if len(result_ids) > Config.REPORT_BULK_MAX:
+        return jsonify({"error": f"At most {Config.REPORT_BULK_MAX} reports per request"}), 400
+
+    found = {
+        row.id for row in db.session.query(Result.id)
+        .filter(Result.user_id == user_id, Result.id.in_(result_ids))
+    }
+
+    if not found:
+        return jsonify({"error": "Report not found"}), 404
+
+    missing = [i for i in result_ids if i not in found]
+    user = User.query.filter_by(id=user_id).first()
+
+    # Results are loaded lazily as pool slots free up
+    def payloads():
+        query = Result.query.filter(Result.user_id == user_id, Result.id.in_(found)) \
+            .order_by(Result.id) \
+            .yield_per(50)
+
+        for result in query:
+            yield report_payload(result, user.email)
+
+    archive = stream_report_zip(render_reports(payloads()), missing)
+
+    return Response(
+        stream_with_context(archive),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=reports_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+        }
+    )
+
+
 @file_bp.route("/results/<int:result_id>", methods=["DELETE"])
 @jwt_required()
 def delete_result(result_id):
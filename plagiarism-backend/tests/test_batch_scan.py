@@ -0,0 +1,32 @@
+import os
+import pytest
+from config import Config
+
+batch_scan = pytest.importorskip("utils.batch_scan")
+
+
+def test_workers_share_quota_and_rate_files(monkeypatch):
+    monkeypatch.setattr(Config, "SEARCH_QUOTA_PATH", "search_quota.json")
+    monkeypatch.setattr(Config, "SEARCH_RATE_PATH", "search_rate.json")
+    monkeypatch.setattr(Config, "SEARCH_CONCURRENCY", 4)
+
+    limits = batch_scan.search_limits(8)
+
+    assert limits["SEARCH_QUOTA_PATH"] == os.path.abspath("search_quota.json")
+    assert limits["SEARCH_RATE_PATH"] == os.path.abspath("search_rate.json")
+    assert limits["SEARCH_CONCURRENCY"] == 1
+    assert "SEARCH_RATE_PER_SEC" not in limits
+
+
+def test_limits_without_files_are_split_between_workers(monkeypatch):
+    monkeypatch.setattr(Config, "SEARCH_QUOTA_PATH", "")
+    monkeypatch.setattr(Config, "SEARCH_RATE_PATH", "")
+    monkeypatch.setattr(Config, "SEARCH_DAILY_QUOTA", 100)
+    monkeypatch.setattr(Config, "SEARCH_RATE_PER_SEC", 5.0)
+    monkeypatch.setattr(Config, "SEARCH_BURST", 10)
+
+    limits = batch_scan.search_limits(4)
+
+    assert limits["SEARCH_DAILY_QUOTA"] == 25
+    assert limits["SEARCH_RATE_PER_SEC"] == 1.25
+    assert limits["SEARCH_BURST"] == 2
@@ -0,0 +1,56 @@
+import random
+import pytest
+from utils.candidate_index import CandidateIndex, shingle_hashes
+
+
+WORDS = (
+    "the model was trained on a large corpus of scientific articles and then evaluated "
+    "against several benchmarks covering translation summarisation and question answering"
+).split()
+
+
+def _sentence(rng, words=None):
+    return " ".join(rng.choice(WORDS) for _ in range(words or rng.randint(3, 25)))
+
+
+# Every page sentence scored directly, same ranking as CandidateIndex
+def _brute_force(sentences, text, top_k, threshold):
+    grams = shingle_hashes(text)
+    if not grams:
+        return []
+
+    scored = []
+    for sid, sentence in enumerate(sentences):
+        score = len(grams & shingle_hashes(sentence)) / len(grams)
+        if score >= threshold and score > 0:
+            scored.append((score, sid))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(sid, sentences[sid], score) for score, sid in scored[:top_k]]
+
+
+@pytest.mark.parametrize("threshold", [0.05, 0.2, 0.5, 0.9])
+def test_prefix_filter_matches_brute_force(threshold):
+    rng = random.Random(threshold)
+    page = [_sentence(rng) for _ in range(200)]
+    index = CandidateIndex(page)
+
+    for _ in range(50):
+        query = rng.choice(page) if rng.random() < 0.5 else _sentence(rng)
+        assert index.candidates(query, top_k=10, threshold=threshold) == \
+            _brute_force(page, query, top_k=10, threshold=threshold)
+
+
+def test_exact_sentence_ranks_first():
+    page = ["a completely unrelated sentence about cooking pasta", "the model was trained on a large corpus"]
+    found = CandidateIndex(page).candidates("The model was trained on a large corpus!")
+
+    assert found[0][:2] == (1, page[1])
+    assert found[0][2] == 1.0
+
+
+def test_short_or_unseen_text_has_no_candidates():
+    index = CandidateIndex(["the model was trained on a large corpus"])
+
+    assert index.candidates("two words") == []
+    assert index.candidates("nothing here overlaps with the page at all") == []
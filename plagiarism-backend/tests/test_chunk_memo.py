@@ -0,0 +1,88 @@
+import os
+import time
+import random
+from utils.chunk_memo import ChunkMemo, content_defined_chunks
+
+
+def _document(words=2000, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(500)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_chunks_cover_the_text_within_size_limits():
+    text = _document()
+    chunks = content_defined_chunks(text)
+
+    assert " ".join(chunks).split() == text.split()
+    assert all(len(c.split()) <= 300 for c in chunks)
+    assert all(len(c.split()) >= 30 for c in chunks)
+
+
+def test_edit_only_moves_nearby_boundaries():
+    words = _document().split()
+    before = content_defined_chunks(" ".join(words))
+
+    edited = words[:1000] + ["inserted", "words", "here"] + words[1000:]
+    after = content_defined_chunks(" ".join(edited))
+
+    # Chunks ending before the edit are untouched, the boundaries after it
+    # resynchronise within a few chunks
+    prefix = []
+    for chunk in before:
+        if len(" ".join(prefix + [chunk]).split()) > 1000:
+            break
+        prefix.append(chunk)
+
+    assert after[:len(prefix)] == prefix
+    assert len(set(after) - set(before)) <= 3
+    assert after[-1] == before[-1]
+
+
+def test_key_ignores_case_and_whitespace_but_not_salt():
+    assert ChunkMemo.key("Some  Text\nhere") == ChunkMemo.key("some text here")
+    assert ChunkMemo.key("some text", salt="web") != ChunkMemo.key("some text", salt="local")
+
+
+def test_put_and_get_round_trip(tmp_path):
+    memo = ChunkMemo(str(tmp_path), ttl_days=1)
+    key = ChunkMemo.key("chunk text")
+    entry = {"queries": ["q"], "sources": ["https://example.com"], "matches": []}
+
+    assert memo.get(key) is None
+    memo.put(key, entry)
+    assert memo.get(key) == entry
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    memo = ChunkMemo(str(tmp_path), ttl_days=1)
+    key = ChunkMemo.key("chunk text")
+    memo.put(key, {"queries": [], "sources": [], "matches": []})
+
+    old = time.time() - 2 * 86400
+    os.utime(memo._file(key), (old, old))
+
+    assert memo.get(key) is None
+    assert not os.path.exists(memo._file(key))
+
+
+def test_put_sweeps_expired_and_oversized_entries(tmp_path):
+    memo = ChunkMemo(str(tmp_path), ttl_days=1, max_mb=1)
+    entry = {"queries": [], "sources": [], "matches": ["x" * 300_000]}
+    keys = [ChunkMemo.key(f"chunk {i}") for i in range(5)]
+
+    for i, key in enumerate(keys):
+        memo.put(key, entry)
+        # Oldest first; the first one is past the TTL
+        written = time.time() - (2 * 86400 if i == 0 else 100 - i)
+        os.utime(memo._file(key), (written, written))
+
+    # Sweeps run at most every EVICT_INTERVAL seconds
+    memo.last_eviction = 0
+    memo.put(ChunkMemo.key("latest"), {"queries": [], "sources": [], "matches": []})
+
+    left = [key for key in keys if os.path.exists(memo._file(key))]
+    assert keys[0] not in left
+    assert keys[1] not in left
+    assert left == keys[2:]
+    assert memo.get(ChunkMemo.key("latest")) is not None
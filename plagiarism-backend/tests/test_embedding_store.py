@@ -0,0 +1,21 @@
+import pytest
+
+embedding_store = pytest.importorskip("utils.embedding_store")
+
+
+def test_text_hash_ignores_whitespace_differences():
+    stored = "First sentence here.\nSecond  sentence\tthere.\n"
+    scanned = "First sentence here.\r\nSecond sentence there."
+
+    assert embedding_store.text_hash(stored) == embedding_store.text_hash(scanned)
+    assert embedding_store.text_hash(stored) != embedding_store.text_hash("First sentence here.")
+
+
+def test_stored_splits_match_text_from_either_path(tmp_path):
+    store = embedding_store.EmbeddingStore(str(tmp_path), ttl_days=1, max_mb=64)
+    text = "The first sentence of the upload is here. The second sentence follows it.\n"
+
+    entry = store.put("a" * 64, text)
+
+    assert entry.matches(text.replace("\n", "\r\n"))
+    assert not entry.matches("Completely different text.")
@@ -0,0 +1,25 @@
+import pytest
+from utils import load_test
+
+
+def test_crashed_virtual_users_are_counted_as_errors(monkeypatch):
+    def broken(self, session, rng):
+        raise RuntimeError("driver bug")
+
+    monkeypatch.setitem(load_test.ENDPOINTS, "results", broken)
+
+    driver = load_test.LoadDriver("http://127.0.0.1:9", "token", [("a.txt", "text")], {"results": 1})
+    report = driver.run(users=3, duration=5)
+
+    assert report["failed_users"] == 3
+    assert report["endpoints"]["driver"]["errors"] == 3
+    assert report["endpoints"]["driver"]["statuses"] == {"RuntimeError": 3}
+
+
+def test_request_errors_do_not_stop_virtual_users():
+    driver = load_test.LoadDriver("http://127.0.0.1:9", "token", [("a.txt", "text")], {"results": 1})
+    report = driver.run(users=2, duration=5, max_requests=6)
+
+    assert report["failed_users"] == 0
+    assert report["endpoints"]["results"]["requests"] == 6
+    assert report["endpoints"]["results"]["error_rate"] == pytest.approx(1.0)
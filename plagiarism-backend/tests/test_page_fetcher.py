@@ -0,0 +1,85 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.page_fetcher import PageFetcher
+
+
+ARTICLE = (
+    "<html><body>"
+    "<div class='site-header'>Home About Contact</div>"
+    "<div class='canvas'><p>Photosynthesis converts light into chemical energy in plants.</p></div>"
+    "<div class='comments-disabled article'>"
+    "Chlorophyll absorbs <em>red</em> and <a href='/blue'>blue</a> light, "
+    "<span>reflecting green</span>."
+    "<p>The Calvin cycle fixes carbon dioxide.</p>"
+    "</div>"
+    "<ul class='comment-list'><li>First!</li></ul>"
+    "</body></html>"
+)
+
+
+def test_main_text_keeps_inline_children():
+    text = PageFetcher.main_text(ARTICLE.encode("utf-8"))
+
+    assert "Chlorophyll absorbs red and blue light, reflecting green." in text
+    assert "The Calvin cycle fixes carbon dioxide." in text
+
+
+def test_main_text_matches_whole_boilerplate_tokens():
+    text = PageFetcher.main_text(ARTICLE.encode("utf-8"))
+
+    # "canvas" contains "nav", "comments-disabled" contains "comment"
+    assert "Photosynthesis converts light" in text
+    assert "Chlorophyll" in text
+
+    assert "Home About Contact" not in text
+    assert "First!" not in text
+
+
+def test_nested_blocks_are_not_duplicated():
+    body = b"<html><body><div>Intro text <p>Nested paragraph here.</p> outro text</div></body></html>"
+    text = PageFetcher.main_text(body)
+
+    assert text.count("Nested paragraph here.") == 1
+    assert "Intro text" in text and "outro text" in text
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    pages = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        content_type, body, declared = self.pages[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(declared if declared is not None else len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_rejects_declared_length_over_cap(server):
+    body = b"<html><body><p>" + b"word " * 400 + b"</p></body></html>"
+    _Handler.pages["/big"] = ("text/html", body, None)
+    _Handler.pages["/small"] = ("text/html", body, None)
+
+    assert PageFetcher.fetch(server + "/big", max_bytes=len(body) - 1) == ""
+    assert PageFetcher.fetch(server + "/small", max_bytes=len(body)).startswith("word word")
+
+
+def test_fetch_skips_non_text_types(server):
+    _Handler.pages["/image"] = ("image/png", b"\x89PNG....", None)
+
+    assert PageFetcher.fetch(server + "/image") == ""
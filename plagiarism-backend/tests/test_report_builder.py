@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import zipfile
+import subprocess
+import textwrap
+from utils.report_builder import render_report, stream_report_zip
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _payload(result_id):
+    return {
+        "result_id": result_id,
+        "email": "user@example.com",
+        "file1_name": "essay.txt",
+        "created_at": "2026-01-01 10:00",
+        "score": 42.5,
+        "matches": [{"source": "https://example.com", "score": 80, "file_text": "a copied sentence here"}],
+        "original_text": "Some text with a copied sentence here & more.",
+    }
+
+
+def test_render_report_returns_pdf_bytes():
+    result_id, pdf, error = render_report(_payload(7))
+
+    assert result_id == 7 and error is None
+    assert pdf.startswith(b"%PDF")
+
+
+def test_zip_stream_holds_reports_and_errors():
+    rendered = [render_report(_payload(1)), (2, None, "ValueError: bad")]
+    data = b"".join(stream_report_zip(rendered, missing=[3]))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["report_1.pdf", "errors.txt"]
+        errors = archive.read("errors.txt").decode()
+
+    assert "report_2: ValueError: bad" in errors
+    assert "report_3: not found" in errors
+
+
+def test_pool_workers_skip_guarded_start_up(tmp_path):
+    # Same shape as app.py: start-up code guarded against __mp_main__
+    script = tmp_path / "server.py"
+    script.write_text(textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {ROOT!r})
+        from utils.report_builder import render_reports
+
+        if __name__ != "__mp_main__":
+            print("start-up", flush=True)
+
+        if __name__ == "__main__":
+            from tests.test_report_builder import _payload
+            results = list(render_reports([_payload(i) for i in range(3)]))
+            print(sorted(r[0] for r in results if r[1]), flush=True)
+    """))
+
+    out = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=120, cwd=ROOT)
+
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.split("\n").count("start-up") == 1
+    assert "[0, 1, 2]" in out.stdout
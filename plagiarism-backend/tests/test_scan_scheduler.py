@@ -0,0 +1,71 @@
+import time
+from utils.scan_scheduler import ScanScheduler
+
+
+def test_idle_callback_waits_for_fetches_and_comparisons():
+    scheduler = ScanScheduler(time_budget=10, max_workers=2)
+    order = []
+
+    def fetch(name):
+        time.sleep(0.05)
+        return name
+
+    def compare(name):
+        order.append(f"compare {name}")
+
+    def on_fetched(page):
+        order.append(f"fetch {page}")
+        scheduler.schedule_cpu("comparison", 1, compare, (page,))
+
+    def next_round():
+        order.append("round")
+
+    for name in ("a", "b", "c"):
+        scheduler.schedule_io("fetch", 1, fetch, (name,), on_fetched)
+    scheduler.when_idle("round", next_round)
+
+    scheduler.run()
+
+    assert order[-1] == "round"
+    assert len(order) == 7
+
+
+def test_idle_callback_runs_after_failed_work():
+    scheduler = ScanScheduler(time_budget=10)
+    ran = []
+
+    def broken():
+        raise OSError("offline")
+
+    scheduler.schedule_io("fetch", 1, broken)
+    scheduler.when_idle("round", lambda: ran.append(True))
+    scheduler.run()
+
+    assert ran == [True]
+    assert scheduler.stats()["fetch"]["failed"] == 1
+
+
+def test_idle_callback_can_schedule_more_work():
+    scheduler = ScanScheduler(time_budget=10)
+    rounds = []
+
+    def search_round():
+        rounds.append(len(rounds))
+        if len(rounds) < 3:
+            scheduler.schedule_io("search", 1, lambda: None, (), lambda _: scheduler.when_idle("round", search_round))
+
+    search_round()
+    scheduler.run()
+
+    assert rounds == [0, 1, 2]
+
+
+def test_idle_work_left_at_the_deadline_is_cancelled():
+    scheduler = ScanScheduler(time_budget=0.1)
+
+    scheduler.schedule_io("fetch", 1, time.sleep, (0.3,))
+    scheduler.when_idle("search_round", lambda: None)
+    scheduler.run()
+
+    assert scheduler.timed_out
+    assert scheduler.stats()["search_round"]["cancelled"] == 1
@@ -0,0 +1,65 @@
+import sqlite3
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from sqlalchemy import inspect
+from extensions import db
+from models.user_model import User  # noqa: F401  (results.user_id references users)
+from models.result_model import Result
+from models.schema import upgrade_schema
+
+
+def _app(path):
+    app = flask.Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+    return app
+
+
+def test_adds_columns_missing_from_an_existing_table(tmp_path):
+    path = tmp_path / "app.db"
+
+    # results as created before estimated_scores existed
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE results (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+            "file1_name VARCHAR(255) NOT NULL, file2_name VARCHAR(255) NOT NULL, "
+            "plagiarism_score FLOAT NOT NULL, tfidf_score FLOAT NOT NULL, "
+            "jaccard_score FLOAT NOT NULL, sequence_score FLOAT NOT NULL, "
+            "level VARCHAR(20) NOT NULL, created_at DATETIME, internet_matches JSON, "
+            "original_text TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO results (user_id, file1_name, file2_name, plagiarism_score, "
+            "tfidf_score, jaccard_score, sequence_score, level) "
+            "VALUES (1, 'a.txt', 'b.txt', 10, 10, 10, 10, 'Low')"
+        )
+
+    app = _app(path)
+
+    with app.app_context():
+        upgrade_schema(db)
+        upgrade_schema(db)  # idempotent
+
+        columns = {c["name"] for c in inspect(db.engine).get_columns("results")}
+        assert "estimated_scores" in columns
+
+        assert Result.query.one().estimated_scores is None
+
+        db.session.add(Result(
+            user_id=1, file1_name="c.txt", file2_name="d.txt", plagiarism_score=80,
+            tfidf_score=81, jaccard_score=79, sequence_score=80.5,
+            estimated_scores=["sequence"], level="High"
+        ))
+        db.session.commit()
+
+        assert Result.query.filter_by(file1_name="c.txt").one().estimated_scores == ["sequence"]
+
+
+def test_skips_tables_that_do_not_exist_yet(tmp_path):
+    app = _app(tmp_path / "empty.db")
+
+    with app.app_context():
+        upgrade_schema(db)
+        assert not inspect(db.engine).has_table("results")
@@ -0,0 +1,101 @@
+import random
+from difflib import SequenceMatcher
+import pytest
+
+cascade = pytest.importorskip("utils.score_cascade")
+
+from utils.plagiarism_engine import PlagiarismEngine
+
+
+WORDS = (
+    "researchers measured rainfall across several districts and compared the results with "
+    "satellite estimates while farmers reported changes in harvest timing soil moisture and "
+    "irrigation demand during the long dry season"
+).split()
+
+
+def _text(words, seed):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _edit(text, seed, edits=5):
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(edits):
+        words.insert(rng.randrange(len(words)), "inserted")
+    return " ".join(words)
+
+
+def test_sequence_bounds_contain_and_converge_to_ratio():
+    for seed in range(20):
+        a = _text(300, seed)
+        b = _edit(a, seed + 100, edits=seed)
+        expected = SequenceMatcher(None, a, b).ratio()
+
+        bounds = cascade.SequenceBounds(a, b)
+        low, high = bounds.refine(3)
+
+        assert low <= expected <= high
+        assert bounds.ratio() == pytest.approx(expected)
+
+
+def test_near_duplicate_is_decided_high_early():
+    text1 = _text(1500, 1)
+    text2 = _edit(text1, 2)
+
+    result = cascade.ScoreCascade.score(text1, text2)
+
+    assert result["level"] == "High"
+    assert result["tier"] in ("sketch", "lexical")
+    assert result["score_range"][0] > 70
+
+
+def test_unrelated_texts_are_decided_low_early():
+    text1 = _text(1500, 3)
+    text2 = " ".join(f"token{i}" for i in range(1500))
+
+    result = cascade.ScoreCascade.score(text1, text2)
+
+    assert result["level"] == "Low"
+    assert result["tier"] in ("sketch", "lexical")
+
+
+def test_early_breakdown_flags_estimated_values():
+    text1 = _text(1500, 4)
+    text2 = _edit(text1, 5)
+
+    result = cascade.ScoreCascade.score(text1, text2)
+
+    if result["tier"] == "sketch":
+        assert {"tfidf", "jaccard"} <= set(result["estimated"])
+    elif result["tier"] == "lexical":
+        assert "tfidf" not in result["estimated"] and "jaccard" not in result["estimated"]
+        assert result["tfidf"] == PlagiarismEngine.tfidf_similarity(text1, text2)
+        assert result["jaccard"] == PlagiarismEngine.jaccard_similarity(text1, text2)
+
+    for key in ("tfidf", "jaccard", "sequence"):
+        assert 0.0 <= result[key] <= 1.0
+
+    exact = cascade.ScoreCascade.score(text1, text2, exact=True)
+    assert exact["estimated"] == []
+
+
+def test_early_level_agrees_with_exact_scoring():
+    for seed in range(5):
+        text1 = _text(800, seed)
+        text2 = _edit(text1, seed, edits=seed * 40)
+
+        early = cascade.ScoreCascade.score(text1, text2)
+        exact = cascade.ScoreCascade.score(text1, text2, exact=True)
+
+        assert exact["exact"]
+        assert early["level"] == exact["level"]
+
+        # Lexical and exact tiers use hard bounds
+        if early["tier"] != "sketch":
+            assert early["score_range"][0] <= exact["score"] <= early["score_range"][1]
+
+
+def test_percent_rounds_to_two_places():
+    assert cascade.percent(0.12345) == 12.35
@@ -0,0 +1,64 @@
+import json
+import time
+import multiprocessing
+from utils.search_client import QuotaTracker, TokenBucket
+
+
+def _reserve_many(path, limit, attempts, out):
+    quota = QuotaTracker(limit, path)
+    out.put(sum(quota.reserve(1) for _ in range(attempts)))
+
+
+def test_quota_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "quota.json")
+    out = multiprocessing.Queue()
+
+    workers = [
+        multiprocessing.Process(target=_reserve_many, args=(path, 50, 30, out))
+        for _ in range(4)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    granted = sum(out.get() for _ in workers)
+
+    assert granted == 50
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["used"] == 50
+
+
+def test_quota_release_and_remaining(tmp_path):
+    path = str(tmp_path / "quota.json")
+    first = QuotaTracker(10, path)
+    second = QuotaTracker(10, path)
+
+    assert first.reserve(8) == 8
+    assert second.reserve(5) == 2
+    second.release(2)
+
+    assert first.remaining() == 2
+
+
+def test_unlimited_quota_in_memory():
+    quota = QuotaTracker(0)
+
+    assert quota.reserve(100) == 100
+    assert quota.remaining() is None
+
+
+def test_token_bucket_state_is_shared(tmp_path):
+    path = str(tmp_path / "rate.json")
+    first = TokenBucket(rate=1000, capacity=5, path=path)
+    second = TokenBucket(rate=1000, capacity=5, path=path)
+
+    first.acquire(5)
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["tokens"] < 1
+
+    # The second bucket sees the drained state and has to wait for a refill
+    started = time.monotonic()
+    second.acquire(3)
+    assert time.monotonic() - started >= 0.002
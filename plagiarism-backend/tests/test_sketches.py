@@ -0,0 +1,89 @@
+import io
+import random
+import pytest
+from utils.sketches import MinHash, HashedTF, iter_windows, compare_streams, TFIDF_TOKEN_RE
+
+
+WORDS = (
+    "the student wrote an essay about climate policy and the economic effects of carbon "
+    "taxes on households while the committee reviewed several reports describing energy "
+    "markets prices regulation emissions trading renewable investment public opinion"
+).split()
+
+
+def _text(words, seed):
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(words // 12):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(12))
+        sentences.append(sentence.capitalize() + ".")
+    return " ".join(sentences)
+
+
+def _stream(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_windows_reassemble_the_stream():
+    text = _text(20000, 1) + " naïve café " * 50
+    windows = list(iter_windows(_stream(text), window_chars=1000))
+
+    assert "".join(windows) == text
+    assert max(len(w) for w in windows) <= 2000 + 50
+    assert all(len(w) >= 500 for w in windows[:-1])
+
+
+def test_windows_are_anchored_on_content():
+    text = _text(20000, 2)
+    before = list(iter_windows(_stream(text), window_chars=1000))
+    after = list(iter_windows(_stream("An extra opening paragraph. " * 20 + text), window_chars=1000))
+
+    assert after[-len(before) + 2:] == before[2:]
+
+
+def test_insertion_in_the_middle_keeps_sequence_score():
+    text = _text(40000, 3)
+    middle = len(text) // 2
+    edited = text[:middle] + " " + _text(300, 4) + " " + text[middle:]
+
+    tfidf, jaccard, sequence = compare_streams(_stream(text), _stream(edited))
+
+    assert sequence > 0.9
+    assert tfidf > 0.95
+    assert jaccard > 0.9
+
+
+def test_identical_and_unrelated_streams():
+    text = _text(20000, 5)
+    other = " ".join(f"token{i}" for i in range(20000))
+
+    assert compare_streams(_stream(text), _stream(text))[2] == 1.0
+    assert compare_streams(_stream(text), _stream(other)) == pytest.approx((0.0, 0.0, 0.0), abs=0.05)
+
+
+def test_minhash_estimates_jaccard():
+    first = {f"term{i}" for i in range(0, 3000)}
+    second = {f"term{i}" for i in range(1000, 4000)}
+
+    a, b = MinHash(), MinHash()
+    a.update(first)
+    b.update(second)
+
+    exact = len(first & second) / len(first | second)
+    assert abs(a.jaccard(b) - exact) < 0.1
+
+
+def test_hashed_tf_matches_sklearn_cosine():
+    sklearn = pytest.importorskip("sklearn.feature_extraction.text")
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    text1, text2 = _text(3000, 6).lower(), _text(3000, 7).lower()
+
+    a, b = HashedTF(), HashedTF()
+    a.update(TFIDF_TOKEN_RE.findall(text1))
+    b.update(TFIDF_TOKEN_RE.findall(text2))
+
+    vectors = sklearn.TfidfVectorizer().fit_transform([text1, text2])
+    expected = cosine_similarity(vectors[0], vectors[1])[0][0]
+
+    assert a.cosine(b) == pytest.approx(expected, abs=0.01)
@@ -0,0 +1,50 @@
+import io
+import pytest
+
+text_extractor = pytest.importorskip("utils.text_extractor")
+
+
+@pytest.mark.parametrize("extension", [".txt", ".py"])
+def test_path_and_stream_extract_the_same_text(tmp_path, extension):
+    data = "First line\r\nsecond line\rthird — line\n".encode("utf-8")
+    path = tmp_path / f"upload{extension}"
+    path.write_bytes(data)
+
+    from_path = text_extractor.extract_text(str(path), extension)
+    from_stream = text_extractor.extract_text(io.BytesIO(data), extension)
+
+    assert from_path == from_stream == "First line\nsecond line\nthird — line\n"
+
+
+def test_docx_stream_matches_path(tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "upload.docx"
+
+    document = docx.Document()
+    document.add_paragraph("A paragraph of the essay.")
+    document.add_paragraph("Another paragraph.")
+    document.save(str(path))
+
+    with open(path, "rb") as f:
+        from_stream = text_extractor.extract_text(f, ".docx")
+
+    assert from_stream == text_extractor.extract_text(str(path), ".docx")
+
+
+def test_pdf_stream_matches_path(tmp_path):
+    fitz = pytest.importorskip("fitz")
+    path = tmp_path / "upload.pdf"
+
+    document = fitz.open()
+    for line in ("First page of the essay.", "Second page."):
+        document.new_page().insert_text((72, 72), line)
+    document.save(str(path))
+    document.close()
+
+    with open(path, "rb") as f:
+        from_stream = text_extractor.extract_text(f, ".pdf")
+
+    from_path = text_extractor.extract_text(str(path), ".pdf")
+
+    assert from_stream == from_path
+    assert "First page of the essay." in from_path and "Second page." in from_path
@@ -0,0 +1,107 @@
+import re
+import random
+import pytest
+
+from utils.tokenizer import RegexTokenizer, SAMPLE_TEXTS
+
+word_tokenize = pytest.importorskip("nltk.tokenize").word_tokenize
+
+
+STOP_WORDS = {"the", "a", "it", "s", "t", "not", "can", "we", "re", "me", "at", "or", "and", "so", "do", "in"}
+
+TEXTS = SAMPLE_TEXTS + [
+    "Cannot CANNOT cannot. Gimme, lemme, gotta, wanna -- you're gonna love it.",
+    "Ünïcödé wörds: straße, ΣΊΣΥΦΟΣ, naïveté, 東京タワー, Ǆemal and ﬁnance.",
+    "tabs\tand\nnewlines\r\nand\x00nul bytes",
+    "under_scores and digits 12abc 3_4 stay whole",
+]
+
+
+# The pipeline RegexTokenizer replaced. \W+ has already removed every
+# sentence boundary, so Punkt has nothing to split (preserve_line skips it
+# and needs no downloaded data).
+def nltk_pipeline(text, stop_words=()):
+    tokens = word_tokenize(re.sub(r'\W+', ' ', text.lower()), preserve_line=True)
+    return [t for t in tokens if t not in stop_words]
+
+
+def _random_texts(count=50, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [
+        "cannot", "gonna", "Wanna", "can't", "won't", "café", "über", "e-mail",
+        "x_y", "3.14", "the", "It's", "résumé", "ΣΊΣΥΦΟΣ", "--", "'quoted'", "\n",
+    ]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randrange(1, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("text", TEXTS + _random_texts())
+def test_tokens_match_nltk(text):
+    tokenizer = RegexTokenizer(STOP_WORDS)
+
+    assert tokenizer.tokenize(text) == nltk_pipeline(text)
+    assert tokenizer.content_tokens(text) == nltk_pipeline(text, STOP_WORDS)
+
+
+def test_batch_matches_nltk_per_text():
+    tokenizer = RegexTokenizer(STOP_WORDS)
+    texts = TEXTS + _random_texts(seed=1)
+
+    assert tokenizer.tokenize_batch(texts) == [nltk_pipeline(t) for t in texts]
+    assert tokenizer.tokenize_batch(texts, drop_stopwords=True) == [nltk_pipeline(t, STOP_WORDS) for t in texts]
+
+
+def test_tfidf_words_match_sklearn_default_analyzer():
+    sklearn_text = pytest.importorskip("sklearn.feature_extraction.text")
+    analyzer = sklearn_text.TfidfVectorizer().build_analyzer()
+    tokenizer = RegexTokenizer()
+
+    for text in TEXTS + _random_texts(seed=2):
+        assert tokenizer.words(text, min_len=2) == analyzer(text)
+
+
+# Scores computed the way PlagiarismEngine did before the tokenizer was
+# pluggable
+
+def _old_tfidf(text1, text2):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    if not text1.strip() or not text2.strip():
+        return 0.0
+    try:
+        tfidf = TfidfVectorizer().fit_transform([text1, text2])
+        return float(cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0])
+    except ValueError:
+        return 0.0
+
+
+def _old_jaccard(text1, text2, stop_words):
+    tokens1 = set(nltk_pipeline(text1, stop_words))
+    tokens2 = set(nltk_pipeline(text2, stop_words))
+    if not tokens1 or not tokens2:
+        return 0.0
+    return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
+
+def _old_ngram(text1, text2, n=3):
+    def get_ngrams(text):
+        tokens = re.findall(r'\w+', text.lower())
+        return set(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    ngrams1, ngrams2 = get_ngrams(text1), get_ngrams(text2)
+    if not ngrams1 or not ngrams2:
+        return 0.0
+    return len(ngrams1 & ngrams2) / len(ngrams1)
+
+
+def test_scores_are_unchanged():
+    engine = pytest.importorskip("utils.plagiarism_engine")
+    PlagiarismEngine = engine.PlagiarismEngine
+
+    texts = TEXTS + _random_texts(count=20, seed=3)
+    pairs = list(zip(texts, texts[1:])) + [(t, t) for t in texts[:5]]
+
+    for text1, text2 in pairs:
+        assert PlagiarismEngine.tfidf_similarity(text1, text2) == pytest.approx(_old_tfidf(text1, text2))
+        assert PlagiarismEngine.jaccard_similarity(text1, text2) == _old_jaccard(text1, text2, engine.STOP_WORDS)
+        assert PlagiarismEngine.ngram_similarity(text1, text2) == _old_ngram(text1, text2)
@@ -0,0 +1,126 @@
+import multiprocessing
+import numpy as np
+from config import Config
+from utils.vector_index import SentenceIndex
+
+
+def _vectors(n, seed):
+    rng = np.random.default_rng(seed)
+    v = rng.normal(size=(n, SentenceIndex.DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _add_document(path, owner, seed):
+    SentenceIndex(path).add(owner, seed, [f"{owner} sentence {i}" for i in range(20)], _vectors(20, seed))
+
+
+def test_search_finds_added_sentences(tmp_path):
+    index = SentenceIndex(str(tmp_path))
+    vectors = _vectors(10, 1)
+    index.add("result:1", 1, [f"s{i}" for i in range(10)], vectors)
+
+    found = index.search(vectors[3:4], k=1)
+
+    assert found[0][0][0] == 3
+    assert index.describe(found[0][0][0]) == {"owner": "result:1", "text": "s3"}
+    assert index.search(vectors[3:4], k=1, exclude_user=1) == [[]]
+
+
+def test_same_document_is_indexed_once_per_user(tmp_path):
+    index = SentenceIndex(str(tmp_path))
+    sentences = [f"s{i}" for i in range(5)]
+
+    assert index.add("file:1", 1, sentences, _vectors(5, 1), content="abc") == 5
+    assert index.add("result:7", 1, sentences, _vectors(5, 1), content="abc") == 0
+    assert SentenceIndex(str(tmp_path)).has_content(1, "abc")
+
+    # Another user's copy is still history for everyone else
+    assert index.add("result:8", 2, sentences, _vectors(5, 1), content="abc") == 5
+
+    index.delete_owner("file:1")
+    assert not index.has_content(1, "abc")
+    assert index.add("result:9", 1, sentences, _vectors(5, 1), content="abc") == 5
+
+    index.compact()
+    assert index.has_content(1, "abc")
+    assert len(index.owners) == 10
+
+
+def test_other_instances_see_adds_deletes_and_compaction(tmp_path):
+    writer = SentenceIndex(str(tmp_path))
+    reader = SentenceIndex(str(tmp_path))
+
+    first, second = _vectors(5, 1), _vectors(5, 2)
+    writer.add("result:1", 1, [f"a{i}" for i in range(5)], first)
+    writer.add("result:2", 2, [f"b{i}" for i in range(5)], second)
+
+    row, _ = reader.search(second[4:5], k=1)[0][0]
+    assert reader.describe(row)["text"] == "b4"
+
+    writer.delete_owner("result:1")
+    assert len(reader.search(first[0:1], k=10)[0]) == 5
+    assert len(reader) == 5
+
+    writer.compact()
+    row, _ = reader.search(second[4:5], k=1)[0][0]
+    assert row == 4
+    assert reader.describe(row)["text"] == "b4"
+    assert len(reader.owners) == 5
+
+
+def test_concurrent_writers_keep_rows_and_vectors_aligned(tmp_path):
+    path = str(tmp_path)
+    workers = [
+        multiprocessing.Process(target=_add_document, args=(path, f"result:{i}", i))
+        for i in range(4)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    index = SentenceIndex(path)
+    assert len(index) == 80
+
+    for seed in range(4):
+        vectors = _vectors(20, seed)
+        found = index.search(vectors, k=1)
+        texts = [index.describe(hits[0][0])["text"] for hits in found]
+        assert texts == [f"result:{seed} sentence {i}" for i in range(20)]
+
+
+def test_compact_after_deletes_is_seen_by_stale_instance(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SENTENCE_INDEX_COMPACT_RATIO", 0.3)
+    path = str(tmp_path)
+
+    for i in range(3):
+        _add_document(path, f"result:{i}", i)
+
+    stale = SentenceIndex(path)
+    writer = SentenceIndex(path)
+    writer.delete_owner("result:0")
+    writer.delete_owner("result:1")
+
+    # Tombstones passed the ratio, so the files were rewritten
+    assert len(writer.owners) == 20
+
+    vectors = _vectors(20, 2)
+    found = stale.search(vectors[7:8], k=1)
+    assert stale.describe(found[0][0][0])["text"] == "result:2 sentence 7"
+
+
+def test_ivf_training_is_picked_up_by_other_instances(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SENTENCE_INDEX_TRAIN_MIN", 50)
+    path = str(tmp_path)
+    reader = SentenceIndex(path)
+
+    for i in range(4):
+        _add_document(path, f"result:{i}", i)
+
+    vectors = _vectors(20, 3)
+    found = reader.search(vectors[:5], k=1, nprobe=64)
+
+    assert reader.centroids is not None
+    assert [reader.describe(hits[0][0])["text"] for hits in found] == [
+        f"result:3 sentence {i}" for i in range(5)
+    ]
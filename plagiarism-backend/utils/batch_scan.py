@@ -0,0 +1,505 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from config import Config
+from utils.text_extractor import extract_text
+
+
+# Offline batch scanner
+#
+# Runs the same checks as /check, /internet-check and /corpus-check over a
+# directory or manifest without HTTP, JWT or ORM overhead per file:
+#
+#   python -m utils.batch_scan pairwise <dir|manifest> -o out.jsonl
+#   python -m utils.batch_scan web      <dir|manifest> -o out.jsonl [--sources both]
+#   python -m utils.batch_scan corpus   <dir|manifest> -o out.jsonl --user-id 1
+#   python -m utils.batch_scan import   out.jsonl --user-id 1
+#
+# A manifest is a text file with one path per line; for pairwise, a line may
+# hold two tab-separated paths to compare just that pair (otherwise every
+# pair of listed files is compared). Work is spread over a process pool; the
+# engine and semantic model are imported once per worker process, never in
+# the parent. Each result is appended to the JSONL output as soon as it is
+# done, keyed by a task id derived from the mode, paths, sizes and mtimes,
+# so rerunning the same command after an interruption skips finished tasks.
+# --save-db (or the import command) bulk-inserts the records into results.
+
+MODES = ("pairwise", "web", "corpus")
+
+ALLOWED_EXTENSIONS = {
+    ".txt", ".pdf", ".docx",
+    ".py", ".java", ".c", ".cpp", ".js"
+}
+STREAMABLE_EXTENSIONS = {".txt", ".py", ".java", ".c", ".cpp", ".js"}
+
+FILE2_NAMES = {"web": "Web Search", "corpus": "Submission History"}
+
+
+# Inputs and task ids
+
+def list_inputs(source):
+    if os.path.isdir(source):
+        paths = []
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() in ALLOWED_EXTENSIONS:
+                    paths.append([os.path.join(root, name)])
+        return sorted(paths)
+
+    with open(source, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+
+    return [line.split("\t") for line in lines if line and not line.startswith("#")]
+
+
+def build_tasks(mode, source):
+    entries = list_inputs(source)
+
+    if mode != "pairwise":
+        return [(mode, entry[0]) for entry in entries]
+
+    pairs = [tuple(entry[:2]) for entry in entries if len(entry) >= 2]
+    singles = [entry[0] for entry in entries if len(entry) == 1]
+
+    pairs.extend(itertools.combinations(singles, 2))
+
+    return [(mode,) + pair for pair in pairs]
+
+
+def task_id(task):
+    parts = [task[0]]
+
+    for path in task[1:]:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{int(stat.st_mtime)}")
+        except OSError:
+            parts.append(os.path.abspath(path))
+
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+# Search limits for a pool of `workers` processes. The quota and rate files
+# are made absolute so every worker updates the same ones; whatever has no
+# file to share is split between the workers instead.
+
+def search_limits(workers):
+    limits = {"SEARCH_CONCURRENCY": max(1, Config.SEARCH_CONCURRENCY // workers)}
+
+    if Config.SEARCH_QUOTA_PATH:
+        limits["SEARCH_QUOTA_PATH"] = os.path.abspath(Config.SEARCH_QUOTA_PATH)
+    elif Config.SEARCH_DAILY_QUOTA:
+        limits["SEARCH_DAILY_QUOTA"] = max(1, Config.SEARCH_DAILY_QUOTA // workers)
+
+    if Config.SEARCH_RATE_PATH:
+        limits["SEARCH_RATE_PATH"] = os.path.abspath(Config.SEARCH_RATE_PATH)
+    else:
+        limits["SEARCH_RATE_PER_SEC"] = Config.SEARCH_RATE_PER_SEC / workers
+        limits["SEARCH_BURST"] = max(1, Config.SEARCH_BURST // workers)
+
+    return limits
+
+
+# Worker side (one engine / model per process)
+
+_worker = {}
+
+
+def init_worker(options):
+    # Before anything builds the process-wide SearchClient
+    for name, value in options.get("search_limits", {}).items():
+        setattr(Config, name, value)
+
+    from utils.score_cascade import ScoreCascade, check_level, percent
+    from utils.sketches import compare_streams
+    from utils.plagiarism_engine import STOP_WORDS
+    from utils.internet_detector import InternetDetector, internet_level
+    from utils.history_detector import HistoryDetector
+    from utils.http_replay import install
+
+    install()
+
+    _worker.update(
+        options=options,
+        cascade=ScoreCascade,
+        check_level=check_level,
+        percent=percent,
+        internet_level=internet_level,
+        compare_streams=compare_streams,
+        stop_words=STOP_WORDS,
+        internet=InternetDetector,
+        history=HistoryDetector,
+    )
+
+
+@lru_cache(maxsize=64)
+def _read_text(path, mtime):
+    return extract_text(path, os.path.splitext(path)[1].lower())
+
+
+def read_text(path):
+    return _read_text(path, os.path.getmtime(path))
+
+
+def scan_pairwise(path1, path2):
+    options = _worker["options"]
+    largest = max(os.path.getsize(path1), os.path.getsize(path2))
+    streamable = all(
+        os.path.splitext(p)[1].lower() in STREAMABLE_EXTENSIONS
+        for p in (path1, path2)
+    )
+
+    if streamable and largest > Config.LARGE_DOC_THRESHOLD:
+        with open(path1, "rb") as f1, open(path2, "rb") as f2:
+            tfidf, jaccard, sequence = _worker["compare_streams"](
+                f1, f2, stop_words=_worker["stop_words"]
+            )
+
+        score = round(((0.4 * tfidf) + (0.3 * jaccard) + (0.3 * sequence)) * 100, 2)
+
+        return {
+            "score": score,
+            "level": _worker["check_level"](score),
+            "breakdown": {
+                "tfidf": round(tfidf * 100, 2),
+                "jaccard": round(jaccard * 100, 2),
+                "sequence": round(sequence * 100, 2),
+            },
+            "mode": "large",
+            "decided_by": "sketch",
+        }
+
+    cascade = _worker["cascade"].score(read_text(path1), read_text(path2), exact=options["exact"])
+
+    return {
+        "score": float(cascade["score"]),
+        "level": cascade["level"],
+        "breakdown": {
+            "tfidf": _worker["percent"](cascade["tfidf"]),
+            "jaccard": _worker["percent"](cascade["jaccard"]),
+            "sequence": _worker["percent"](cascade["sequence"]),
+        },
+        "estimated": cascade["estimated"],
+        "mode": "standard",
+        "decided_by": cascade["tier"],
+        "score_range": cascade["score_range"],
+    }
+
+
+def scan_web(path):
+    options = _worker["options"]
+    result = _worker["internet"].detect_internet_plagiarism(
+        read_text(path),
+        time_budget=options["time_budget"],
+        sources=options["sources"]
+    )
+    score = result.get("overall_score", 0)
+
+    return {
+        "score": score,
+        "level": _worker["internet_level"](score),
+        "matches": result.get("matches", []),
+        "partial": result.get("partial", False),
+        "queries_issued": result.get("queries_issued", 0),
+        "total_sources_checked": result.get("total_sources_checked", 0),
+    }
+
+
+def scan_corpus(path):
+    options = _worker["options"]
+    result = _worker["history"].detect_history_plagiarism(read_text(path), options["user_id"])
+    return {
+        "score": result["overall_score"],
+        "level": _worker["internet_level"](result["overall_score"]),
+        "matches": result["matches"],
+        "total_sentences": result["total_sentences"],
+        "matched_sentences": result["matched_sentences"],
+    }
+
+
+SCANNERS = {
+    "pairwise": scan_pairwise,
+    "web": scan_web,
+    "corpus": scan_corpus,
+}
+
+
+def run_task(task):
+    started = time.perf_counter()
+    record = {"mode": task[0], "files": list(task[1:])}
+
+    try:
+        record.update(SCANNERS[task[0]](*task[1:]))
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["seconds"] = round(time.perf_counter() - started, 3)
+
+    return record
+
+
+# JSONL output (append-only, resumable)
+
+def read_records(path):
+    if not os.path.exists(path):
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Line cut short by an interruption
+                continue
+
+
+def completed_ids(path, retry_errors=True):
+    return {
+        record["id"]
+        for record in read_records(path)
+        if "id" in record and (record.get("status") == "ok" or not retry_errors)
+    }
+
+
+def open_output(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # Terminate a partial last line so the next record starts cleanly
+    partial = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            partial = f.read(1) != b"\n"
+
+    out = open(path, "a", encoding="utf-8")
+    if partial:
+        out.write("\n")
+
+    return out
+
+
+def run_batch(mode, source, output, workers=None, options=None, retry_errors=True, progress=True):
+    tasks = build_tasks(mode, source)
+    done = completed_ids(output, retry_errors)
+
+    pending = []
+    for task in tasks:
+        tid = task_id(task)
+        if tid not in done:
+            pending.append((tid, task))
+
+    workers = workers or os.cpu_count() or 1
+    options = dict(options or {})
+
+    if mode == "web":
+        options.setdefault("search_limits", search_limits(workers))
+
+    summary = {
+        "tasks": len(tasks),
+        "skipped": len(tasks) - len(pending),
+        "ok": 0,
+        "errors": 0,
+        "ids": [],
+    }
+
+    if progress:
+        print(f"🗂 {len(tasks)} {mode} tasks, {summary['skipped']} already done, {workers} workers")
+
+    if not pending:
+        return summary
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+
+    with open_output(output) as out, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(options,)
+    ) as pool:
+
+        queue = iter(pending)
+        in_flight = {}
+
+        # Bounded submission keeps memory flat on huge manifests
+        def fill():
+            while len(in_flight) < workers * 2:
+                item = next(queue, None)
+                if item is None:
+                    return
+                tid, task = item
+                in_flight[pool.submit(run_task, task)] = tid
+
+        fill()
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                tid = in_flight.pop(future)
+                record = future.result()
+                record["id"] = tid
+
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+                if record["status"] == "ok":
+                    summary["ok"] += 1
+                    summary["ids"].append(tid)
+                else:
+                    summary["errors"] += 1
+                    print(f"❌ {record['files']}: {record['error']}")
+
+            fill()
+
+            if progress:
+                handled = summary["ok"] + summary["errors"]
+                rate = handled / max(time.perf_counter() - started, 1e-9)
+                print(f"\r  {handled}/{len(pending)} done ({rate:.1f}/s)", end="", flush=True)
+
+    if progress:
+        print()
+
+    return summary
+
+
+# Bulk insert into the results table
+
+def result_row(record, user_id):
+    files = record["files"]
+    score = float(record["score"])
+
+    if record["mode"] == "pairwise":
+        breakdown = record["breakdown"]
+        return {
+            "user_id": user_id,
+            "file1_name": os.path.basename(files[0]),
+            "file2_name": os.path.basename(files[1]),
+            "plagiarism_score": score,
+            "tfidf_score": float(breakdown["tfidf"]),
+            "jaccard_score": float(breakdown["jaccard"]),
+            "sequence_score": float(breakdown["sequence"]),
+            "estimated_scores": record.get("estimated") or None,
+            "level": record["level"],
+        }
+
+    return {
+        "user_id": user_id,
+        "file1_name": os.path.basename(files[0]),
+        "file2_name": FILE2_NAMES[record["mode"]],
+        "plagiarism_score": score,
+        "tfidf_score": score,  # placeholder, as in the routes
+        "jaccard_score": 0,
+        "sequence_score": 0,
+        "level": record["level"],
+        "internet_matches": record["matches"],
+        "original_text": read_text(files[0]) if os.path.exists(files[0]) else None,
+    }
+
+
+def save_results(output, user_id, ids=None, batch_size=500):
+    from flask import Flask
+    from extensions import db
+    from models.result_model import Result
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+
+    wanted = set(ids) if ids is not None else None
+    saved = 0
+
+    with app.app_context():
+        rows = []
+
+        for record in read_records(output):
+            if record.get("status") != "ok":
+                continue
+            if wanted is not None and record.get("id") not in wanted:
+                continue
+
+            rows.append(result_row(record, user_id))
+
+            if len(rows) >= batch_size:
+                db.session.bulk_insert_mappings(Result, rows)
+                db.session.commit()
+                saved += len(rows)
+                rows = []
+
+        if rows:
+            db.session.bulk_insert_mappings(Result, rows)
+            db.session.commit()
+            saved += len(rows)
+
+    print(f"💾 Inserted {saved} results for user {user_id}")
+
+    return saved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.batch_scan")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for mode in MODES:
+        p = sub.add_parser(mode)
+        p.add_argument("source", help="directory or manifest file")
+        p.add_argument("-o", "--output", required=True, help="JSONL results file (appended)")
+        p.add_argument("-w", "--workers", type=int, default=None)
+        p.add_argument("--user-id", type=int, default=None)
+        p.add_argument("--save-db", action="store_true", help="bulk-insert new results")
+        p.add_argument("--skip-errors", action="store_true", help="do not retry failed tasks")
+
+        if mode == "pairwise":
+            p.add_argument("--exact", action="store_true", help="disable early-exit scoring")
+        if mode == "web":
+            p.add_argument("--sources", choices=("web", "local", "both"), default=None)
+            p.add_argument("--time-budget", type=float, default=None)
+
+    p = sub.add_parser("import")
+    p.add_argument("output", help="JSONL results file")
+    p.add_argument("--user-id", type=int, required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        save_results(args.output, args.user_id)
+        return 0
+
+    if (args.command == "corpus" or args.save_db) and args.user_id is None:
+        parser.error(f"--user-id is required for {'corpus' if args.command == 'corpus' else '--save-db'}")
+
+    options = {
+        "user_id": args.user_id,
+        "exact": getattr(args, "exact", False),
+        "sources": getattr(args, "sources", None),
+        "time_budget": getattr(args, "time_budget", None),
+    }
+
+    summary = run_batch(
+        args.command,
+        args.source,
+        args.output,
+        workers=args.workers,
+        options=options,
+        retry_errors=not args.skip_errors
+    )
+
+    print(f"✅ {summary['ok']} ok, {summary['errors']} failed, {summary['skipped']} skipped")
+
+    if args.save_db and summary["ids"]:
+        save_results(args.output, args.user_id, ids=summary["ids"])
+
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import re
+import math
+from collections import defaultdict
+
+
+# Word trigram shingles hashed to ints (same tokens as ngram_similarity)
+
+def shingle_hashes(text, n=3):
+    tokens = re.findall(r'\w+', text.lower())
+    return {hash(tuple(tokens[i:i + n])) for i in range(len(tokens) - n + 1)}
+
+
+# Inverted index of trigram shingles over all sentences of one page.
+#
+# Candidate generation follows the AllPairs / PPJoin prefix filter:
+# ngram_similarity(fs, ps) = |A & B| / |A|, so a page sentence can only reach
+# the threshold t if it shares at least ceil(t * |A|) shingles with the file
+# sentence. Ordering A's shingles rarest-first, any such sentence must contain
+# one of the first |A| - ceil(t * |A|) + 1 of them, so only that prefix is
+# probed. Sentences shorter than the required overlap are dropped by the
+# length filter before verification.
+
+class CandidateIndex:
+
+    def __init__(self, sentences, n=3):
+        self.n = n
+        self.sentences = sentences
+        self.shingles = [shingle_hashes(s, n) for s in sentences]
+        self.postings = defaultdict(list)
+
+        for sid, grams in enumerate(self.shingles):
+            for g in grams:
+                self.postings[g].append(sid)
+
+    # Top-k page sentences by ngram similarity (>= threshold)
+    def candidates(self, text, top_k=10, threshold=0.05):
+        grams = shingle_hashes(text, self.n)
+
+        if not grams:
+            return []
+
+        required = max(1, math.ceil(threshold * len(grams)))
+
+        # Guard against float rounding pushing the bound one too high
+        while required > 1 and (required - 1) / len(grams) >= threshold:
+            required -= 1
+
+        # Rarest shingles first; shingles absent from the page cannot match
+        ordered = sorted(
+            (g for g in grams if g in self.postings),
+            key=lambda g: len(self.postings[g])
+        )
+
+        prefix_len = len(ordered) - required + 1
+        seen = set()
+
+        for g in ordered[:prefix_len]:
+            seen.update(self.postings[g])
+
+        scored = []
+
+        for sid in seen:
+            page_grams = self.shingles[sid]
+
+            if len(page_grams) < required:
+                continue
+
+            overlap = len(grams & page_grams)
+
+            if overlap < required:
+                continue
+
+            scored.append((overlap / len(grams), sid))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        return [
+            (sid, self.sentences[sid], score)
+            for score, sid in scored[:top_k]
+        ]
@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+from config import Config
+
+
+# Content-defined chunking + per-chunk scan memo
+#
+# Chunk boundaries are chosen from the words themselves (rolling hash over a
+# small window of word checksums) rather than fixed word offsets, so editing
+# a paragraph only moves the boundaries next to the edit. Each chunk is keyed
+# by a hash of its text, and the queries, sources and matches found for it
+# are stored on disk; resubmitted drafts reuse them and only scan chunks
+# whose text changed. Entries older than CHUNK_MEMO_TTL_DAYS are swept
+# periodically from put(), and the oldest ones go first once the memo
+# exceeds CHUNK_MEMO_MAX_MB.
+
+MEMO_VERSION = 1
+EVICT_INTERVAL = 300
+
+
+def content_defined_chunks(text, avg_words=150, min_words=60, max_words=300, window=4):
+    words = text.split()
+    chunks = []
+    start = 0
+    checksums = []
+
+    for i, word in enumerate(words):
+        checksums.append(zlib.crc32(word.lower().encode("utf-8")))
+        rolling = sum(checksums[-window:]) & 0xFFFFFFFF
+        length = i - start + 1
+
+        at_boundary = length >= min_words and rolling % avg_words == 0
+
+        if at_boundary or length >= max_words:
+            chunks.append(" ".join(words[start:i + 1]))
+            start = i + 1
+
+    if start < len(words):
+        tail = " ".join(words[start:])
+
+        # Fold a short tail into the previous chunk
+        if chunks and len(words) - start < min_words // 2:
+            chunks[-1] = chunks[-1] + " " + tail
+        else:
+            chunks.append(tail)
+
+    return chunks
+
+
+class ChunkMemo:
+
+    def __init__(self, path=None, ttl_days=None, max_mb=None):
+        self.path = path or Config.CHUNK_MEMO_DIR
+        self.ttl = (ttl_days if ttl_days is not None else Config.CHUNK_MEMO_TTL_DAYS) * 86400
+        self.max_bytes = (max_mb if max_mb is not None else Config.CHUNK_MEMO_MAX_MB) * 1024 * 1024
+        self.lock = threading.Lock()
+        self.last_eviction = 0
+
+    @staticmethod
+    def key(chunk, salt=""):
+        normalised = " ".join(chunk.lower().split())
+        return hashlib.sha256(f"{MEMO_VERSION}|{salt}|{normalised}".encode("utf-8")).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._file(key)
+
+        try:
+            if self.ttl and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+    # entry = {"queries": [...], "sources": [...], "matches": [...]}
+    def put(self, key, entry):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("⚠ Could not write chunk memo:", e)
+
+        self.maybe_evict()
+
+    # ---------------------------------------------------------------
+    # Eviction
+    # ---------------------------------------------------------------
+
+    # (written, size, path) of every entry
+    def entries(self):
+        found = []
+
+        if not os.path.isdir(self.path):
+            return found
+
+        for shard in os.listdir(self.path):
+            shard_path = os.path.join(self.path, shard)
+            if not os.path.isdir(shard_path):
+                continue
+
+            for name in os.listdir(shard_path):
+                if not name.endswith(".json"):
+                    continue
+
+                path = os.path.join(shard_path, name)
+
+                try:
+                    found.append((os.path.getmtime(path), os.path.getsize(path), path))
+                except OSError:
+                    continue
+
+        return found
+
+    def evict(self):
+        entries = sorted(self.entries())
+        now = time.time()
+        removed = 0
+
+        def remove(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        if self.ttl:
+            while entries and now - entries[0][0] > self.ttl:
+                remove(entries.pop(0)[2])
+                removed += 1
+
+        total = sum(size for _, size, _ in entries)
+
+        while entries and self.max_bytes and total > self.max_bytes:
+            _, size, path = entries.pop(0)
+            remove(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"🧹 Evicted {removed} chunk memo entries")
+
+        return removed
+
+    def maybe_evict(self):
+        with self.lock:
+            if time.time() - self.last_eviction < EVICT_INTERVAL:
+                return
+            self.last_eviction = time.time()
+
+        self.evict()
+
+
+_memo = None
+_memo_lock = threading.Lock()
+
+
+def get_chunk_memo():
+    global _memo
+
+    with _memo_lock:
+        if _memo is None:
+            _memo = ChunkMemo()
+        return _memo
@@ -0,0 +1,272 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import numpy as np
+from config import Config
+from utils.plagiarism_engine import PlagiarismEngine
+from utils.chunk_memo import content_defined_chunks
+
+
+# Precomputed sentence splits and embeddings per uploaded file
+#
+# Uploads are split and embedded in the background, so later scans of the
+# same file start with no model work on the submitted side:
+#
+#   <EMBEDDING_STORE_DIR>/<key[:2]>/<key>.f32    float32 rows, memory-mapped
+#   <EMBEDDING_STORE_DIR>/<key[:2]>/<key>.json   units (text per row), splits
+#
+# key is the SHA-256 of the uploaded file's bytes; splits are reused when
+# the scanned text matches the stored text up to whitespace. Rows cover the document's
+# sentences, its content-defined chunks and the sentences of each chunk (the
+# units InternetDetector and HistoryDetector embed). Lookups are by unit
+# text, so a scan whose text extraction differs slightly still reuses every
+# sentence that matches and only encodes the rest. Entries unused for
+# EMBEDDING_STORE_TTL_DAYS are evicted, and the least recently used ones go
+# first once the store exceeds EMBEDDING_STORE_MAX_MB.
+
+STORE_VERSION = 2
+EVICT_INTERVAL = 300
+
+
+# Hash of the text with whitespace runs collapsed (line endings, page breaks
+# and trailing blanks differ between extraction paths)
+def text_hash(text):
+    normalised = " ".join(text.split())
+    return hashlib.sha256(normalised.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class DocumentEmbeddings:
+
+    def __init__(self, meta, vectors):
+        self.meta = meta
+        self.vectors = vectors
+        self.rows = {unit: row for row, unit in enumerate(meta["units"])}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def sentences(self):
+        return self.meta["sentences"]
+
+    @property
+    def chunks(self):
+        return self.meta["chunks"]
+
+    @property
+    def chunk_sentences(self):
+        return self.meta["chunk_sentences"]
+
+    # Splits are only reused for the text they were made from
+    def matches(self, text):
+        return self.meta["text_hash"] == text_hash(text)
+
+    # Drop-in for PlagiarismEngine.encode_sentences: stored rows where known,
+    # one model call for the rest
+    def encode_sentences(self, sentences):
+        if not self.rows:
+            with self.lock:
+                self.stats["misses"] += len(sentences)
+            return PlagiarismEngine.encode_sentences(sentences)
+
+        rows = [self.rows.get(s) for s in sentences]
+        missing = [i for i, row in enumerate(rows) if row is None]
+
+        with self.lock:
+            self.stats["hits"] += len(rows) - len(missing)
+            self.stats["misses"] += len(missing)
+
+        out = np.empty((len(sentences), self.vectors.shape[1]), dtype=np.float32)
+
+        known = [i for i, row in enumerate(rows) if row is not None]
+        if known:
+            out[known] = self.vectors[[rows[i] for i in known]]
+
+        if missing:
+            out[missing] = PlagiarismEngine.encode_sentences([sentences[i] for i in missing])
+
+        return out
+
+
+class EmbeddingStore:
+
+    def __init__(self, path=None, ttl_days=None, max_mb=None):
+        self.path = path or Config.EMBEDDING_STORE_DIR
+        self.ttl = (ttl_days if ttl_days is not None else Config.EMBEDDING_STORE_TTL_DAYS) * 86400
+        self.max_bytes = (max_mb if max_mb is not None else Config.EMBEDDING_STORE_MAX_MB) * 1024 * 1024
+        self.lock = threading.Lock()
+        self.last_eviction = 0
+
+    # Key of a file on disk or an upload stream (position is restored)
+    @staticmethod
+    def key(source):
+        digest = hashlib.sha256()
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        else:
+            position = source.tell()
+            source.seek(0)
+            for block in iter(lambda: source.read(1 << 20), b""):
+                digest.update(block)
+            source.seek(position)
+
+        return digest.hexdigest()
+
+    def _files(self, key):
+        base = os.path.join(self.path, key[:2], key)
+        return f"{base}.json", f"{base}.f32"
+
+    def get(self, key):
+        if not key:
+            return None
+
+        meta_path, vectors_path = self._files(key)
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+
+            if meta.get("version") != STORE_VERSION:
+                return None
+
+            shape = (len(meta["units"]), meta["dim"])
+            vectors = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=shape) \
+                if shape[0] else np.zeros((0, meta["dim"]), dtype=np.float32)
+
+            # Last use drives eviction
+            now = time.time()
+            os.utime(meta_path, (now, now))
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return DocumentEmbeddings(meta, vectors)
+
+    def put(self, key, text):
+        sentences = [s.strip() for s in PlagiarismEngine.split_into_sentences(text) if s.strip()]
+        chunks = content_defined_chunks(text)
+        chunk_sentences = [PlagiarismEngine.split_into_sentences(chunk) for chunk in chunks]
+
+        units = list(dict.fromkeys(
+            sentences + chunks + [s for group in chunk_sentences for s in group]
+        ))
+
+        vectors = np.asarray(PlagiarismEngine.encode_sentences(units), dtype=np.float32) \
+            if units else np.zeros((0, 0), dtype=np.float32)
+
+        meta = {
+            "version": STORE_VERSION,
+            "text_hash": text_hash(text),
+            "dim": int(vectors.shape[1]) if units else 0,
+            "units": units,
+            "sentences": sentences,
+            "chunks": chunks,
+            "chunk_sentences": chunk_sentences,
+            "created": time.time(),
+        }
+
+        meta_path, vectors_path = self._files(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        # Vectors first; the metadata file marks the entry complete
+        vectors.tofile(vectors_path + suffix)
+        os.replace(vectors_path + suffix, vectors_path)
+
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+        print(f"🧮 Precomputed {len(units)} embeddings for {key[:12]}")
+
+        self.maybe_evict()
+
+        return self.get(key)
+
+    # Stored entry for key, computing it if missing
+    def precompute(self, key, text):
+        return self.get(key) or self.put(key, text)
+
+    def entries(self):
+        found = []
+
+        if not os.path.isdir(self.path):
+            return found
+
+        for shard in os.listdir(self.path):
+            shard_path = os.path.join(self.path, shard)
+            if not os.path.isdir(shard_path):
+                continue
+
+            for name in os.listdir(shard_path):
+                if not name.endswith(".json"):
+                    continue
+
+                key = name[:-5]
+                meta_path, vectors_path = self._files(key)
+
+                try:
+                    used = os.path.getmtime(meta_path)
+                    size = os.path.getsize(meta_path) + os.path.getsize(vectors_path)
+                except OSError:
+                    continue
+
+                found.append((used, size, key))
+
+        return found
+
+    def remove(self, key):
+        for path in self._files(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # Expire old entries, then trim least recently used down to the size cap
+    def evict(self):
+        entries = sorted(self.entries())
+        now = time.time()
+        removed = 0
+
+        if self.ttl:
+            while entries and now - entries[0][0] > self.ttl:
+                self.remove(entries.pop(0)[2])
+                removed += 1
+
+        total = sum(size for _, size, _ in entries)
+
+        while entries and self.max_bytes and total > self.max_bytes:
+            _, size, key = entries.pop(0)
+            self.remove(key)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"🧹 Evicted {removed} precomputed embedding entries")
+
+        return removed
+
+    def maybe_evict(self):
+        with self.lock:
+            if time.time() - self.last_eviction < EVICT_INTERVAL:
+                return
+            self.last_eviction = time.time()
+
+        self.evict()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_store():
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+        return _store
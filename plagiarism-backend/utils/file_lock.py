@@ -0,0 +1,52 @@
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Advisory lock shared by every process (gunicorn workers, batch_scan pool)
+# and every thread that opens the same path. flock() locks belong to the
+# open file description, so two threads in one process exclude each other
+# too. On Windows the first byte of the file is locked with msvcrt instead
+# (locks are per handle, same behaviour); shared locks are exclusive there.
+
+def _acquire(f, shared):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        return
+
+    f.seek(0)
+    while True:
+        try:
+            # LK_LOCK itself retries for ~10 seconds before giving up
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _release(f):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return
+
+    f.seek(0)
+    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a+") as f:
+        _acquire(f, shared)
+        try:
+            yield
+        finally:
+            _release(f)
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.plagiarism_engine import PlagiarismEngine
+from utils.vector_index import get_sentence_index
+from utils.embedding_store import get_embedding_store, text_hash
+
+
+# Background writer so indexing never blocks a request
+_indexer = ThreadPoolExecutor(max_workers=1)
+
+
+class HistoryDetector:
+
+    MIN_WORDS = 5
+
+    # embeddings: precomputed DocumentEmbeddings for this text, if any
+    @staticmethod
+    def sentences(text, embeddings=None):
+        if embeddings is not None and embeddings.matches(text):
+            split = embeddings.sentences
+        else:
+            split = PlagiarismEngine.split_into_sentences(text)
+
+        return [
+            s.strip()
+            for s in split
+            if len(s.split()) >= HistoryDetector.MIN_WORDS
+        ]
+
+    # Add a submission's sentences to the history index, unless the same
+    # user's identical document (re-check, re-upload) is already in it
+    @staticmethod
+    def index_document(owner, user_id, text, embeddings=None):
+        index = get_sentence_index()
+        content = text_hash(text)
+
+        if index.has_content(user_id, content):
+            print(f"📚 {owner} already indexed, skipped")
+            return 0
+
+        sentences = HistoryDetector.sentences(text, embeddings)
+
+        if not sentences:
+            return 0
+
+        vectors = (embeddings or PlagiarismEngine).encode_sentences(sentences)
+        added = index.add(owner, user_id, sentences, vectors, content=content)
+
+        print(f"📚 Indexed {added} sentences for {owner}")
+
+        return added
+
+    # file_key: EmbeddingStore key of the upload; its splits and embeddings
+    # are precomputed first (or reused) and shared with the index
+    @staticmethod
+    def index_in_background(owner, user_id, text, file_key=None):
+        def run():
+            try:
+                embeddings = get_embedding_store().precompute(file_key, text) if file_key else None
+                HistoryDetector.index_document(owner, user_id, text, embeddings)
+            except Exception as e:
+                print(f"❌ History indexing failed for {owner}:", e)
+
+        _indexer.submit(run)
+
+    # Semantic check of a document against every other user's submissions
+    @staticmethod
+    def detect_history_plagiarism(text, user_id, embeddings=None):
+        sentences = HistoryDetector.sentences(text, embeddings)
+
+        if not sentences:
+            return {
+                "overall_score": 0,
+                "matches": [],
+                "total_sentences": 0,
+                "matched_sentences": 0
+            }
+
+        index = get_sentence_index()
+        vectors = (embeddings or PlagiarismEngine).encode_sentences(sentences)
+
+        matches = []
+
+        # Row ids are only valid until the index reloads, so describe them
+        # under the same lock as the search
+        with index.lock:
+            neighbours = index.search(vectors, k=1, exclude_user=user_id)
+
+            for sentence, found in zip(sentences, neighbours):
+                if not found:
+                    continue
+
+                row, similarity = found[0]
+                score = round(max(0, similarity) * 100, 2)
+
+                if score < Config.HISTORY_MATCH_THRESHOLD:
+                    continue
+
+                matched = index.describe(row)
+
+                matches.append({
+                    "source": matched["owner"],
+                    "file_text": sentence,
+                    "matched_text": matched["text"],
+                    "score": score
+                })
+
+        if matches:
+            overall_score = round(
+                sum(m["score"] for m in matches) / len(matches),
+                2
+            )
+        else:
+            overall_score = 0
+
+        return {
+            "overall_score": overall_score,
+            "matches": matches,
+            "total_sentences": len(sentences),
+            "matched_sentences": len(matches)
+        }
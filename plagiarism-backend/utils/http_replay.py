@@ -0,0 +1,234 @@
+import io
+import os
+import json
+import math
+import time
+import base64
+import random
+import hashlib
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+from config import Config
+
+
+# Record / replay layer for outbound HTTP (search API + page fetches)
+#
+#   HTTP_REPLAY_MODE=record   forward to the network, save every response
+#   HTTP_REPLAY_MODE=replay   answer from the cassette only (misses -> 404)
+#   HTTP_REPLAY_MODE=live     go to the network, only apply the profile
+#   HTTP_REPLAY_PROFILE=...   latency / failure profile applied on top
+#
+# A cassette is a directory of JSON files, one per (method, url, body),
+# sharded by hash prefix. The adapter is mounted on the shared sessions of
+# SearchClient and PageFetcher, so InternetDetector runs unchanged against
+# recorded traffic, with injected latency and failures for load tests.
+
+# Latency is lognormal from (p50, p95) in ms; failures are drawn per request
+PROFILES = {
+    "none": {"latency_ms": None, "fail_rate": 0.0},
+    "lan": {"latency_ms": (5, 20), "fail_rate": 0.0},
+    "typical": {"latency_ms": (250, 900), "fail_rate": 0.01},
+    "degraded": {"latency_ms": (800, 4000), "fail_rate": 0.08},
+    "outage": {"latency_ms": (2000, 8000), "fail_rate": 0.5},
+}
+
+# Failure kinds and their relative weights
+FAILURES = [
+    ("503", 0.4),
+    ("429", 0.3),
+    ("timeout", 0.2),
+    ("connection", 0.1),
+]
+
+DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+class Cassette:
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def key(method, url, body):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256()
+        digest.update(method.upper().encode("utf-8") + b" " + url.encode("utf-8") + b"\n")
+        digest.update(body or b"")
+        return digest.hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        entry["body"] = base64.b64decode(entry["body"])
+        return entry
+
+    def put(self, key, entry):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = dict(entry, body=base64.b64encode(entry["body"]).decode("ascii"))
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+
+class ReplayAdapter(HTTPAdapter):
+
+    def __init__(self, mode, cassette, profile="none", seed=None):
+        super().__init__()
+
+        if mode not in ("record", "replay", "live"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+
+        if isinstance(profile, str):
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown replay profile: {profile}")
+            profile = PROFILES[profile]
+
+        self.mode = mode
+        self.cassette = cassette
+        self.profile = profile
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "recorded": 0, "injected_failures": 0}
+
+    def _count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _draw(self):
+        with self.lock:
+            latency = None
+            if self.profile.get("latency_ms"):
+                p50, p95 = self.profile["latency_ms"]
+                sigma = math.log(max(p95, p50) / p50) / 1.645 if p50 else 0
+                latency = self.random.lognormvariate(math.log(p50), sigma) / 1000 if p50 else 0
+
+            failure = None
+            if self.random.random() < self.profile.get("fail_rate", 0):
+                kinds, weights = zip(*FAILURES)
+                failure = self.random.choices(kinds, weights)[0]
+
+        return latency, failure
+
+    @staticmethod
+    def _response(request, entry, adapter):
+        raw = HTTPResponse(
+            body=io.BytesIO(entry["body"]),
+            headers=entry.get("headers", {}),
+            status=entry["status"],
+            reason=entry.get("reason"),
+            preload_content=False,
+        )
+        return adapter.build_response(request, raw)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self._count("requests")
+        latency, failure = self._draw()
+
+        if latency:
+            if isinstance(timeout, tuple):
+                limit = timeout[-1]
+            else:
+                limit = timeout
+            if limit and latency > limit:
+                time.sleep(limit)
+                failure = "timeout"
+            else:
+                time.sleep(latency)
+
+        if failure:
+            self._count("injected_failures")
+
+            if failure == "timeout":
+                raise requests.Timeout(f"Injected timeout for {request.url}", request=request)
+            if failure == "connection":
+                raise requests.ConnectionError(f"Injected connection error for {request.url}", request=request)
+
+            return self._response(request, {
+                "status": int(failure),
+                "headers": {"Retry-After": "1"} if failure == "429" else {},
+                "body": b"",
+            }, self)
+
+        if self.mode == "live":
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        key = Cassette.key(request.method, request.url, request.body)
+        entry = self.cassette.get(key)
+
+        if entry is not None:
+            self._count("hits")
+            return self._response(request, entry, self)
+
+        if self.mode == "replay":
+            self._count("misses")
+            return self._response(request, {"status": 404, "reason": "Not Recorded", "body": b""}, self)
+
+        # Record: fetch fully (decoded), store, then answer from the entry
+        live = super().send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "status": live.status_code,
+            "reason": live.reason,
+            "headers": {k: v for k, v in live.headers.items() if k.lower() not in DROP_HEADERS},
+            "body": live.content,
+        }
+
+        try:
+            self.cassette.put(key, entry)
+            self._count("recorded")
+        except OSError as e:
+            print("⚠ Could not record response:", e)
+
+        return self._response(request, entry, self)
+
+
+_adapter = None
+
+
+# Mount the adapter on the search and page-fetch sessions
+
+def install(mode=None, cassette_dir=None, profile=None, seed=None):
+    global _adapter
+
+    from utils.search_client import get_search_client
+    from utils.page_fetcher import PageFetcher
+
+    mode = mode or Config.HTTP_REPLAY_MODE
+
+    if not mode:
+        return None
+
+    _adapter = ReplayAdapter(
+        mode,
+        Cassette(cassette_dir or Config.HTTP_REPLAY_DIR),
+        profile or Config.HTTP_REPLAY_PROFILE,
+        seed=seed
+    )
+
+    for session in (get_search_client().session, PageFetcher.session):
+        session.mount("http://", _adapter)
+        session.mount("https://", _adapter)
+
+    print(f"📼 HTTP replay: mode={mode}, profile={profile or Config.HTTP_REPLAY_PROFILE}")
+
+    return _adapter
+
+
+def replay_stats():
+    return dict(_adapter.stats) if _adapter else None
@@ -1,95 +1,161 @@
-import requests
-import re
-from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer
-from utils.plagiarism_engine import PlagiarismEngine
+import math
+from collections import Counter
+from utils.plagiarism_engine import PlagiarismEngine, semantic_model
+from utils.semantic_backend import similarity_percent
+from utils.candidate_index import CandidateIndex
+from utils.query_planner import QueryPlanner
+from utils.search_client import get_search_client
+from utils.page_fetcher import PageFetcher
+from utils.scan_scheduler import ScanScheduler
+from utils.local_corpus import get_local_corpus
+from utils.chunk_memo import ChunkMemo, get_chunk_memo, content_defined_chunks
 from config import Config   
 
 
+def internet_level(overall_score):
+    if overall_score >= 70:
+        return "High"
+    elif overall_score >= 30:
+        return "Moderate"
+    elif overall_score > 0:
+        return "Low"
+    return "Unique"
+
+
 class InternetDetector:
 
     # ✅ LOAD API KEY FROM CONFIG
     
     SERPER_API_KEY = Config.SERPER_API_KEY
-    SERPER_URL = "https://google.serper.dev/search"
+    SERPER_URL = Config.SERPER_URL
 
-    model = SentenceTransformer("all-MiniLM-L6-v2")
-
-    # Google Search using Serper
-    
-    @staticmethod
-    def search_web(query, num_results=5):
+    # Page sentences sent to semantic scoring per file sentence
+    CANDIDATE_TOP_K = Config.CANDIDATE_TOP_K
 
-        if not InternetDetector.SERPER_API_KEY:
-            print("❌ SERPER API KEY NOT FOUND")
-            return []
+    # Shared with PlagiarismEngine so the backend is only loaded once
+    model = semantic_model
 
-        headers = {
-            "X-API-KEY": InternetDetector.SERPER_API_KEY,
-            "Content-Type": "application/json",
-        }
+    # Google Search using Serper (batched, rate limited, retried)
 
-        payload = {
-            "q": query,
-            "num": num_results
-        }
+    @staticmethod
+    def search_web(query, num_results=5):
+        return get_search_client().search(query, num_results)
 
-        try:
-            response = requests.post(
-                InternetDetector.SERPER_URL,
-                headers=headers,
-                json=payload,
-                timeout=10
-            )
+    @staticmethod
+    def search_many(queries, num_results=5):
+        return get_search_client().search_many(queries, num_results)
+
+    # Search the selected backends: "web" (Serper), "local" (BM25 reference
+    # corpus) or "both". Web hits are URLs; local hits are dicts that already
+    # carry the passage text. Returns (found, sent): sent holds the queries a
+    # backend actually answered (web queries refused by the quota or lost to
+    # errors are not in it).
+    @staticmethod
+    def search_sources(queries, sources="web"):
+        found = {q: [] for q in queries}
+        sent = set()
 
-            print("🔍 Search Status Code:", response.status_code)
+        if sources in ("local", "both"):
+            corpus = get_local_corpus()
+            for q in queries:
+                found[q].extend(corpus.search(q, k=Config.LOCAL_SEARCH_RESULTS))
+            sent.update(queries)
 
-            if response.status_code != 200:
-                print("❌ Search Failed:", response.text)
-                return []
+        if sources in ("web", "both"):
+            for q, urls in InternetDetector.search_many(queries).items():
+                found[q].extend(urls)
+                sent.add(q)
 
-            data = response.json()
+        return found, sent
 
-            links = []
+    # Extract main-content text from webpage (streamed, size capped)
+    @staticmethod
+    def extract_text_from_url(url):
+        return PageFetcher.fetch(url)
+
+    # Sentence-level matching against one page
+    #
+    # A trigram inverted index over the whole page picks the top-k lexical
+    # candidates per file sentence; only those are scored semantically, in a
+    # single batched model call. encoder supplies precomputed file-side
+    # embeddings when available.
+    @staticmethod
+    def match_sentences(file_sentences, page_sentences, url, encoder=None):
 
-            if "organic" in data:
-                for item in data["organic"]:
-                    if "link" in item:
-                        links.append(item["link"])
+        index = CandidateIndex(page_sentences)
 
-            print("✅ Found URLs:", len(links))
+        candidates = {
+            fi: index.candidates(fs, top_k=InternetDetector.CANDIDATE_TOP_K)
+            for fi, fs in enumerate(file_sentences)
+        }
 
-            return links
+        page_ids = sorted({sid for found in candidates.values() for sid, _, _ in found})
 
-        except Exception as e:
-            print("❌ Search error:", e)
+        if not page_ids:
             return []
 
-    # Extract clean text from webpage
-    @staticmethod
-    def extract_text_from_url(url):
-        try:
-            response = requests.get(url, timeout=8)
+        embeddings = (encoder or PlagiarismEngine).encode_sentences(
+            file_sentences + [page_sentences[sid] for sid in page_ids]
+        )
+        page_rows = {sid: len(file_sentences) + row for row, sid in enumerate(page_ids)}
+
+        matches = []
 
-            if response.status_code != 200:
-                return ""
+        for fi, fs in enumerate(file_sentences):
+            best_score = 0
+            best_match = ""
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            for sid, ps, ngram_score in candidates[fi]:
+                semantic_score = similarity_percent(
+                    embeddings[fi],
+                    embeddings[page_rows[sid]]
+                )
 
-            for script in soup(["script", "style", "noscript"]):
-                script.extract()
+                combined = (ngram_score * 100 * 0.3) + (semantic_score * 0.7)
 
-            text = soup.get_text(separator=" ")
-            text = re.sub(r"\s+", " ", text)
+                if combined > best_score:
+                    best_score = combined
+                    best_match = ps
 
-            return text.lower()
+            if best_score >= 45:
+                matches.append({
+                    "source": url,
+                    "file_text": fs,
+                    "matched_text": best_match,
+                    "score": round(best_score, 2)
+                })
 
-        except Exception:
-            return ""
+        return matches
 
     # Main Internet Plagiarism Detection
+    #
+    # Runs under a ScanScheduler with a total time budget: each search round
+    # starts once the previous round's work has drained, page fetches are ranked by query distinctiveness and search rank,
+    # sentence comparisons by the quick semantic score. If the budget runs out
+    # the matches found so far are returned with partial=True and coverage
+    # statistics.
+    #
+    # Chunks come from content-defined chunking and are memoised by hash, so a
+    # resubmitted draft reuses the queries, sources and matches of unchanged
+    # chunks and only scans the changed ones (reported under "reuse").
+    #
+    # on_event(name, data), when given, is called as stages complete:
+    # "plan", "queries", "source", "match" and finally "summary".
+    #
+    # embeddings (utils.embedding_store.DocumentEmbeddings), when the upload
+    # was precomputed, supplies the chunk / sentence splits and the file-side
+    # embeddings.
     @staticmethod
-    def detect_internet_plagiarism(file_text):
+    def detect_internet_plagiarism(file_text, time_budget=None, on_event=None, sources=None, embeddings=None):
+
+        sources = sources or Config.SCAN_SOURCES
+
+        def emit(name, data):
+            if on_event:
+                try:
+                    on_event(name, data)
+                except Exception as e:
+                    print("⚠ Scan event handler failed:", e)
 
         if not file_text or len(file_text.strip()) < 50:
             return {
@@ -99,71 +165,197 @@ class InternetDetector:
                 "total_matched_sources": 0
             }
 
+        scheduler = ScanScheduler(
+            time_budget or Config.SCAN_TIME_BUDGET,
+            max_workers=Config.SCAN_FETCH_CONCURRENCY
+        )
+
         matches = []
-        checked_sources = 0
+        checked_sources = [0]
+        matched_sentences = set()
+        compared = set()
+
+        precomputed = embeddings is not None and embeddings.matches(file_text)
+        chunks = embeddings.chunks if precomputed else content_defined_chunks(file_text)
+
+        # Reuse results of chunks already scanned in an earlier submission
+        memo = get_chunk_memo()
+        keys = [ChunkMemo.key(chunk, salt=sources) for chunk in chunks]
+        reuse = {"chunks_total": len(chunks), "chunks_reused": 0, "matches_reused": 0, "queries_saved": 0}
+        changed = []
+
+        for ci, key in enumerate(keys):
+            entry = memo.get(key) if Config.CHUNK_MEMO_ENABLED else None
+
+            if entry is None:
+                changed.append(ci)
+                continue
+
+            matches.extend(entry["matches"])
+            matched_sentences.update(m["file_text"] for m in entry["matches"])
+            reuse["chunks_reused"] += 1
+            reuse["matches_reused"] += len(entry["matches"])
+            reuse["queries_saved"] += len(entry["queries"])
+
+        # Query budget shrinks with the share of the document that changed
+        budget = Config.SEARCH_QUERY_BUDGET
+        if chunks and len(changed) < len(chunks):
+            budget = math.ceil(budget * len(changed) / len(chunks)) if changed else 0
+
+        # Most distinctive sentences across the changed chunks
+        changed_set = set(changed)
+        plan = QueryPlanner.plan(
+            [chunk if ci in changed_set else "" for ci, chunk in enumerate(chunks)],
+            budget
+        ) if budget else []
+        pending = list(plan)
+        queries_submitted = [0]
+        queries_issued = [0]
+
+        # Planned queries per chunk not yet searched (or skipped as matched)
+        unresolved = Counter(p["chunk_index"] for p in plan)
+
+        # Per-chunk record for the memo
+        chunk_queries = {ci: [] for ci in changed}
+        chunk_sources = {ci: set() for ci in changed}
+        chunk_matches = {ci: [] for ci in changed}
+
+        print(f"\n Starting Web Scan ({len(chunks)} chunks, {len(plan)} planned queries)")
+
+        emit("plan", {
+            "chunks": len(chunks),
+            "planned_queries": min(len(plan), budget)
+        })
+
+        def compare(planned, url, page_text):
+            ci = planned["chunk_index"]
+
+            if precomputed:
+                file_sentences = embeddings.chunk_sentences[ci]
+            else:
+                file_sentences = PlagiarismEngine.split_into_sentences(chunks[ci])
+
+            page_sentences = PlagiarismEngine.split_into_sentences(page_text)
+
+            page_matches = InternetDetector.match_sentences(
+                file_sentences, page_sentences, url, encoder=embeddings
+            )
+            matches.extend(page_matches)
+            matched_sentences.update(m["file_text"] for m in page_matches)
+            chunk_matches[planned["chunk_index"]].extend(page_matches)
+
+            for match in page_matches:
+                emit("match", match)
+
+        def on_fetched(planned, url):
+            def callback(page_text):
+                checked_sources[0] += 1
 
-        chunks = PlagiarismEngine.split_into_chunks(file_text)
+                usable = bool(page_text) and len(page_text) >= 200
+                emit("source", {"url": url, "usable": usable, "checked": checked_sources[0]})
 
-        print(f"\n Starting Web Scan ({len(chunks)} chunks)")
+                if not usable:
+                    return
 
-        # Limit chunks for speed (can increase later)
-        
-        for chunk in chunks[:3]:
+                quick_semantic = PlagiarismEngine.semantic_similarity(
+                    chunks[planned["chunk_index"]],
+                    page_text[:2000],
+                    encoder=embeddings
+                )
 
-            search_query = chunk[:200]
+                print("Quick semantic score:", quick_semantic)
 
-            urls = InternetDetector.search_web(search_query)
+                if quick_semantic < 35:
+                    return
 
-            if not urls:
-                print("⚠ No URLs returned from search")
+                scheduler.schedule_cpu(
+                    "comparison", quick_semantic, compare, (planned, url, page_text)
+                )
 
-            for url in urls:
-                print("🔎 Checking:", url)
+            return callback
 
-                page_text = InternetDetector.extract_text_from_url(url)
-                checked_sources += 1
+        def on_searched(batch):
+            def callback(result):
+                found, sent = result
 
-                if not page_text or len(page_text) < 200:
-                    continue
+                queries_issued[0] += len(sent)
 
-                quick_semantic = PlagiarismEngine.semantic_similarity(
-                    chunk,
-                    page_text[:2000]
-                )
+                for planned in batch:
+                    if planned["query"] in sent:
+                        chunk_queries[planned["chunk_index"]].append(planned["query"])
+                        unresolved[planned["chunk_index"]] -= 1
 
-                print("Quick semantic score:", quick_semantic)
+                    urls = found.get(planned["query"], [])
 
-                if quick_semantic < 35:
-                    continue
+                    if not urls:
+                        print("⚠ No URLs returned from search")
 
-                file_sentences = PlagiarismEngine.split_into_sentences(chunk)
-                page_sentences = PlagiarismEngine.split_into_sentences(page_text)
+                    for rank, hit in enumerate(urls, 1):
 
-                for fs in file_sentences:
-                    best_score = 0
-                    best_match = ""
+                        url = hit["source"] if isinstance(hit, dict) else hit
 
-                    for ps in page_sentences[:100]:
-                        ngram_score = PlagiarismEngine.ngram_similarity(fs, ps)
+                        # Another query for the same chunk already hit this page
+                        if (planned["chunk_index"], url) in compared:
+                            continue
+                        compared.add((planned["chunk_index"], url))
+                        chunk_sources[planned["chunk_index"]].add(url)
 
-                        if ngram_score < 0.05:
+                        # Local corpus passage, nothing to fetch
+                        if isinstance(hit, dict):
+                            on_fetched(planned, url)(hit["text"].lower())
                             continue
 
-                        semantic_score = PlagiarismEngine.semantic_similarity(fs, ps)
+                        print("🔎 Queued:", url)
 
-                        combined = (ngram_score * 100 * 0.3) + (semantic_score * 0.7)
+                        scheduler.schedule_io(
+                            "fetch",
+                            planned["score"] / rank,
+                            InternetDetector.extract_text_from_url,
+                            (url,),
+                            on_fetched(planned, url)
+                        )
 
-                        if combined > best_score:
-                            best_score = combined
-                            best_match = ps
+                # Next round once this round's fetches and comparisons are done,
+                # so it can skip the sentences they matched
+                scheduler.when_idle("search_round", schedule_search_round)
 
-                    if best_score >= 45:
-                        matches.append({
-                            "source": url,
-                            "file_text": fs,
-                            "matched_text": best_match,
-                            "score": round(best_score, 2)
-                        })
+            return callback
+
+        def schedule_search_round():
+            # Next round of unmatched sentences, submitted as one batch
+            round_size = min(Config.SEARCH_BATCH_SIZE, budget - queries_submitted[0])
+            batch = []
+
+            while pending and len(batch) < round_size:
+                planned = pending.pop(0)
+
+                # Sentence already found in an earlier source
+                if planned["sentence"] in matched_sentences:
+                    unresolved[planned["chunk_index"]] -= 1
+                    continue
+
+                batch.append(planned)
+
+            if not batch:
+                return
+
+            queries_submitted[0] += len(batch)
+
+            emit("queries", {
+                "queries": [p["query"] for p in batch],
+                "submitted": queries_submitted[0]
+            })
+
+            scheduler.schedule_io(
+                "search",
+                float("inf"),
+                InternetDetector.search_sources,
+                ([p["query"] for p in batch], sources),
+                on_searched(batch)
+            )
+
+        schedule_search_round()
+        scheduler.run()
 
         if matches:
             overall_score = round(
@@ -173,11 +365,62 @@ class InternetDetector:
         else:
             overall_score = 0
 
+        work = scheduler.stats()
+        # Out of time with work dropped, or with budgeted queries never sent
+        unsent = bool(pending) and queries_submitted[0] < budget
+        partial = scheduler.timed_out and (
+            any(w["cancelled"] for w in work.values()) or unsent
+        )
+
+        if partial:
+            print(f"⏱ Scan budget reached after {scheduler.elapsed()}s, returning partial result")
+
+        # Memoise changed chunks that were fully covered: every planned query
+        # answered (or skipped because its sentence already matched), or no
+        # sentence worth querying at all. Chunks left unsearched by the
+        # budget, a refused or failed search, or a partial scan are not.
+        if Config.CHUNK_MEMO_ENABLED and not partial:
+            planned_chunks = set(unresolved)
+            unplanned = set(changed) - planned_chunks
+            eligible = {
+                c["chunk_index"]
+                for c in QueryPlanner.candidates(
+                    [chunk if ci in unplanned else "" for ci, chunk in enumerate(chunks)]
+                )
+            } if unplanned else set()
+
+            for ci in changed:
+                if unresolved[ci] == 0 and ci not in eligible:
+                    memo.put(keys[ci], {
+                        "queries": chunk_queries[ci],
+                        "sources": sorted(chunk_sources[ci]),
+                        "matches": chunk_matches[ci]
+                    })
+
         print("\n Final Internet Plagiarism:", overall_score, "%")
 
-        return {
+        # File-side embeddings served from the precomputed store
+        reuse["embeddings_reused"] = embeddings.stats["hits"] if embeddings else 0
+
+        result = {
             "overall_score": overall_score,
             "matches": matches,
-            "total_sources_checked": checked_sources,
-            "total_matched_sources": len(set(m["source"] for m in matches))
+            "total_sources_checked": checked_sources[0],
+            "total_matched_sources": len(set(m["source"] for m in matches)),
+            "queries_issued": queries_issued[0],
+            "partial": partial,
+            "sources": sources,
+            "coverage": {
+                "elapsed_seconds": scheduler.elapsed(),
+                "planned_queries": min(len(plan), budget),
+                "chunks": len(chunks),
+                "work": work
+            },
+            "reuse": reuse
         }
+
+        emit("summary", {
+            k: v for k, v in result.items() if k != "matches"
+        })
+
+        return result
@@ -0,0 +1,328 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+
+
+# Concurrent load driver for the HTTP API
+#
+#   python -m utils.load_test --base-url http://127.0.0.1:5000/api \
+#       --users 16 --duration 120 --mix upload=2,check=4,internet-check=1,results=4,report=1
+#
+# Each virtual user loops over a weighted mix of /upload, /check,
+# /internet-check, /results and /report calls for --duration seconds (or
+# until --requests calls have been made in total) and the run reports
+# throughput, p50/p95/p99 latency and error rate per endpoint. Pair it with
+# HTTP_REPLAY_MODE=replay on the server (utils.http_replay) so web checks
+# run against recorded search/page traffic with a chosen latency and
+# failure profile instead of the live providers.
+
+DEFAULT_MIX = "upload=2,check=4,internet-check=1,results=4,report=1"
+
+WORDS = (
+    "plagiarism detection compares documents using lexical and semantic "
+    "similarity measures such as tfidf jaccard sequence matching and sentence "
+    "embeddings students submit essays reports and source code which are "
+    "checked against each other and against sources found on the web"
+).split()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_mix(mix):
+    weights = {}
+
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+
+        weights[name] = float(weight or 1)
+
+    return weights
+
+
+def synthetic_document(rng, words=400):
+    sentences = []
+    for _ in range(max(1, words // 12)):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(12))
+        sentences.append(sentence.capitalize() + ".")
+    return " ".join(sentences)
+
+
+class LoadStats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.total = 0
+
+    def record(self, endpoint, seconds, status, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+            self.total += 1
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def summary(self, elapsed):
+        report = {}
+
+        with self.lock:
+            for endpoint, values in sorted(self.latencies.items()):
+                values = sorted(values)
+                count = len(values)
+
+                report[endpoint] = {
+                    "requests": count,
+                    "errors": self.errors[endpoint],
+                    "error_rate": round(self.errors[endpoint] / count, 4) if count else 0,
+                    "throughput_rps": round(count / elapsed, 2) if elapsed else 0,
+                    "p50_ms": round(percentile(values, 50) * 1000, 1),
+                    "p95_ms": round(percentile(values, 95) * 1000, 1),
+                    "p99_ms": round(percentile(values, 99) * 1000, 1),
+                    "max_ms": round(values[-1] * 1000, 1) if values else 0,
+                    "statuses": dict(self.statuses[endpoint]),
+                }
+
+        return report
+
+
+class LoadDriver:
+
+    def __init__(self, base_url, token, documents, mix, seed=None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.documents = documents
+        self.mix = mix
+        self.seed = seed
+        self.stats = LoadStats()
+        self.result_ids = []
+        self.lock = threading.Lock()
+
+    def _document(self, rng):
+        name, text = rng.choice(self.documents)
+        return name, text.encode("utf-8")
+
+    def _remember(self, response):
+        try:
+            result_id = response.json().get("result_id")
+        except ValueError:
+            return
+        if result_id:
+            with self.lock:
+                self.result_ids.append(result_id)
+
+    # One call per endpoint; returns the response (or raises)
+
+    def upload(self, session, rng):
+        name, data = self._document(rng)
+        return session.post(f"{self.base_url}/files/upload", files={"file": (name, data)}, timeout=120)
+
+    def check(self, session, rng):
+        name1, data1 = self._document(rng)
+        name2, data2 = self._document(rng)
+        response = session.post(
+            f"{self.base_url}/files/check",
+            files={"file1": (name1, data1), "file2": (name2, data2)},
+            timeout=120
+        )
+        self._remember(response)
+        return response
+
+    def internet_check(self, session, rng):
+        name, data = self._document(rng)
+        response = session.post(f"{self.base_url}/files/internet-check", files={"file": (name, data)}, timeout=300)
+        self._remember(response)
+        return response
+
+    def results(self, session, rng):
+        page = rng.randint(1, 3)
+        return session.get(f"{self.base_url}/files/results", params={"page": page}, timeout=60)
+
+    def report(self, session, rng):
+        with self.lock:
+            result_id = rng.choice(self.result_ids) if self.result_ids else None
+
+        if result_id is None:
+            return self.check(session, rng), "check"
+
+        return session.get(f"{self.base_url}/files/report/{result_id}", timeout=120)
+
+    def virtual_user(self, index, deadline, budget):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        names = list(self.mix)
+        weights = [self.mix[n] for n in names]
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        while time.monotonic() < deadline and budget():
+            endpoint = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            status = "exception"
+
+            try:
+                response = ENDPOINTS[endpoint](self, session, rng)
+
+                # /report falls back to /check until a result exists
+                if isinstance(response, tuple):
+                    response, endpoint = response
+
+                status = response.status_code
+                ok = response.status_code < 400
+                response.close()
+            except requests.RequestException:
+                ok = False
+
+            self.stats.record(endpoint, time.perf_counter() - started, status, ok)
+
+    def run(self, users, duration, max_requests=None):
+        deadline = time.monotonic() + duration
+        issued = [0]
+        issued_lock = threading.Lock()
+
+        def budget():
+            if not max_requests:
+                return True
+            with issued_lock:
+                if issued[0] >= max_requests:
+                    return False
+                issued[0] += 1
+                return True
+
+        started = time.perf_counter()
+        failed_users = 0
+
+        with ThreadPoolExecutor(max_workers=users) as pool:
+            futures = [pool.submit(self.virtual_user, i, deadline, budget) for i in range(users)]
+
+            # A virtual user that crashed stopped sending load; count it as an
+            # error rather than letting the run look clean
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed_users += 1
+                    print(f"❌ Virtual user failed: {type(e).__name__}: {e}")
+                    self.stats.record("driver", 0.0, type(e).__name__, False)
+
+        elapsed = time.perf_counter() - started
+
+        return {
+            "users": users,
+            "elapsed_seconds": round(elapsed, 2),
+            "failed_users": failed_users,
+            "total_requests": self.stats.total,
+            "throughput_rps": round(self.stats.total / elapsed, 2) if elapsed else 0,
+            "endpoints": self.stats.summary(elapsed),
+        }
+
+
+ENDPOINTS = {
+    "upload": LoadDriver.upload,
+    "check": LoadDriver.check,
+    "internet-check": LoadDriver.internet_check,
+    "results": LoadDriver.results,
+    "report": LoadDriver.report,
+}
+
+
+def login(base_url, email, password):
+    base_url = base_url.rstrip("/")
+    credentials = {"email": email, "password": password}
+
+    # Register on first use; "already exists" is fine
+    requests.post(f"{base_url}/auth/register", json=credentials, timeout=30)
+
+    response = requests.post(f"{base_url}/auth/login", json=credentials, timeout=30)
+    response.raise_for_status()
+
+    return response.json()["access_token"]
+
+
+def load_documents(path, count, seed):
+    if path:
+        documents = []
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(".txt"):
+                with open(os.path.join(path, name), "r", encoding="utf-8", errors="ignore") as f:
+                    documents.append((name, f.read()))
+        if documents:
+            return documents
+
+    rng = random.Random(seed)
+    return [(f"load_{i}.txt", synthetic_document(rng)) for i in range(count)]
+
+
+def print_report(report):
+    print(f"\n{report['total_requests']} requests in {report['elapsed_seconds']}s "
+          f"with {report['users']} users ({report['throughput_rps']} req/s)\n")
+
+    header = f"{'endpoint':<16}{'reqs':>7}{'err%':>8}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<16}{row['requests']:>7}{row['error_rate'] * 100:>7.1f}%"
+            f"{row['throughput_rps']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+        )
+
+    if report["failed_users"]:
+        print(f"\n⚠ {report['failed_users']} of {report['users']} virtual users crashed (counted under 'driver')")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.load_test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000/api")
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many calls")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--documents", default=None, help="directory of .txt files to upload")
+    parser.add_argument("--synthetic", type=int, default=20, help="synthetic documents when no directory")
+    parser.add_argument("--email", default="loadtest@example.com")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    token = login(args.base_url, args.email, args.password)
+    documents = load_documents(args.documents, args.synthetic, args.seed)
+
+    driver = LoadDriver(args.base_url, token, documents, mix, seed=args.seed)
+    report = driver.run(args.users, args.duration, args.requests)
+
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if report["failed_users"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
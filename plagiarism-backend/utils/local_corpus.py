@@ -0,0 +1,355 @@
+import os
+import re
+import sys
+import json
+import math
+import shutil
+import threading
+from collections import Counter, defaultdict
+import numpy as np
+from config import Config
+
+
+# Offline reference corpus with BM25 ranking
+#
+# Reference documents (past theses, course material, ...) are split into
+# passages and indexed on disk. Each call to add_documents() writes a new
+# immutable segment, so additions are incremental:
+#
+#   <LOCAL_CORPUS_DIR>/manifest.json          segment list
+#   <LOCAL_CORPUS_DIR>/seg_00001/
+#       passages.jsonl + offsets.npy          passage text, random access
+#       lengths.npy                           passage lengths (tokens)
+#       lexicon.json                          term -> [df, start, count]
+#       postings_ids.npy, postings_tf.npy     postings, memory-mapped
+#
+# Search hits carry the passage text, so no page fetch is needed.
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+# Fixed-size word windows with overlap so matches across a boundary survive
+
+def split_passages(text, size=120, overlap=30):
+    words = text.split()
+    passages = []
+    step = max(1, size - overlap)
+
+    for i in range(0, len(words), step):
+        window = words[i:i + size]
+        if len(window) >= 20 or (i == 0 and window):
+            passages.append(" ".join(window))
+        if i + size >= len(words):
+            break
+
+    return passages
+
+
+class Segment:
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        with open(os.path.join(path, "lexicon.json"), "r", encoding="utf-8") as f:
+            self.lexicon = json.load(f)
+
+        self.lengths = np.load(os.path.join(path, "lengths.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+        self.postings_ids = np.load(os.path.join(path, "postings_ids.npy"), mmap_mode="r")
+        self.postings_tf = np.load(os.path.join(path, "postings_tf.npy"), mmap_mode="r")
+
+    @property
+    def size(self):
+        return int(self.meta["passages"])
+
+    def df(self, term):
+        entry = self.lexicon.get(term)
+        return entry[0] if entry else 0
+
+    def postings(self, term):
+        entry = self.lexicon.get(term)
+        if not entry:
+            return None, None
+        _, start, count = entry
+        return self.postings_ids[start:start + count], self.postings_tf[start:start + count]
+
+    def passage(self, pid):
+        with open(os.path.join(self.path, "passages.jsonl"), "rb") as f:
+            f.seek(int(self.offsets[pid]))
+            return json.loads(f.readline())
+
+    @staticmethod
+    def write(path, passages):
+        os.makedirs(path, exist_ok=True)
+
+        offsets = []
+        lengths = []
+        postings = defaultdict(list)
+
+        with open(os.path.join(path, "passages.jsonl"), "wb") as f:
+            for pid, passage in enumerate(passages):
+                offsets.append(f.tell())
+                f.write((json.dumps(passage) + "\n").encode("utf-8"))
+
+                counts = Counter(tokenize(passage["text"]))
+                lengths.append(sum(counts.values()))
+
+                for term, tf in counts.items():
+                    postings[term].append((pid, tf))
+
+        lexicon = {}
+        ids = []
+        tfs = []
+
+        for term in sorted(postings):
+            entries = postings[term]
+            lexicon[term] = [len(entries), len(ids), len(entries)]
+            ids.extend(pid for pid, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+
+        np.save(os.path.join(path, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+        np.save(os.path.join(path, "lengths.npy"), np.asarray(lengths, dtype=np.int32))
+        np.save(os.path.join(path, "postings_ids.npy"), np.asarray(ids, dtype=np.int32))
+        np.save(os.path.join(path, "postings_tf.npy"), np.asarray(tfs, dtype=np.int32))
+
+        with open(os.path.join(path, "lexicon.json"), "w", encoding="utf-8") as f:
+            json.dump(lexicon, f)
+
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"passages": len(passages), "total_length": int(sum(lengths))}, f)
+
+
+class LocalCorpus:
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, path=None):
+        self.path = path or Config.LOCAL_CORPUS_DIR
+        self.lock = threading.Lock()
+        self.segments = []
+        self._manifest_mtime = None
+        self.reload()
+
+    def _manifest_path(self):
+        return os.path.join(self.path, "manifest.json")
+
+    def _read_manifest(self):
+        if not os.path.exists(self._manifest_path()):
+            return {"segments": [], "next_segment": 1}
+        with open(self._manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._manifest_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._manifest_path())
+
+    def reload(self):
+        manifest = self._read_manifest()
+        self.segments = [
+            Segment(os.path.join(self.path, name))
+            for name in manifest["segments"]
+        ]
+        self._manifest_mtime = self._mtime()
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self._manifest_path())
+        except OSError:
+            return None
+
+    # Pick up segments written by another process (e.g. the CLI)
+    def refresh(self):
+        if self._mtime() != self._manifest_mtime:
+            with self.lock:
+                self.reload()
+
+    def stats(self):
+        passages = sum(s.size for s in self.segments)
+        total_length = sum(s.meta["total_length"] for s in self.segments)
+        return {
+            "segments": len(self.segments),
+            "passages": passages,
+            "avg_length": (total_length / passages) if passages else 0.0,
+        }
+
+    # Index documents as a new segment: docs = [{"doc_id", "title", "text"}]
+    def add_documents(self, docs):
+        passages = []
+
+        for doc in docs:
+            for i, text in enumerate(split_passages(doc["text"])):
+                if not TOKEN_RE.search(text):
+                    continue
+                passages.append({
+                    "doc_id": doc["doc_id"],
+                    "title": doc.get("title") or doc["doc_id"],
+                    "passage": i,
+                    "text": text,
+                })
+
+        if not passages:
+            return 0
+
+        with self.lock:
+            manifest = self._read_manifest()
+            name = f"seg_{manifest['next_segment']:05d}"
+
+            Segment.write(os.path.join(self.path, name), passages)
+
+            manifest["segments"].append(name)
+            manifest["next_segment"] += 1
+            self._write_manifest(manifest)
+            self.reload()
+
+        return len(passages)
+
+    # Merge all segments into one (drops per-segment overhead)
+    def compact(self):
+        with self.lock:
+            manifest = self._read_manifest()
+            if len(manifest["segments"]) <= 1:
+                return
+
+            passages = []
+            for segment in self.segments:
+                passages.extend(segment.passage(pid) for pid in range(segment.size))
+
+            name = f"seg_{manifest['next_segment']:05d}"
+            Segment.write(os.path.join(self.path, name), passages)
+
+            old = manifest["segments"]
+            manifest["segments"] = [name]
+            manifest["next_segment"] += 1
+            self._write_manifest(manifest)
+            self.reload()
+
+            for segment_name in old:
+                shutil.rmtree(os.path.join(self.path, segment_name), ignore_errors=True)
+
+    # BM25 top-k passages for a query
+    def search(self, query, k=5):
+        self.refresh()
+
+        segments = self.segments
+        terms = set(tokenize(query))
+
+        if not segments or not terms:
+            return []
+
+        stats = self.stats()
+        n = stats["passages"]
+        avgdl = stats["avg_length"] or 1.0
+
+        idf = {}
+        for term in terms:
+            df = sum(s.df(term) for s in segments)
+            if df:
+                idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+        hits = []
+
+        for si, segment in enumerate(segments):
+            scores = None
+            norm = self.K1 * (1 - self.B + self.B * np.asarray(segment.lengths, dtype=np.float32) / avgdl)
+
+            for term, weight in idf.items():
+                ids, tfs = segment.postings(term)
+                if ids is None:
+                    continue
+
+                if scores is None:
+                    scores = np.zeros(segment.size, dtype=np.float32)
+
+                tf = np.asarray(tfs, dtype=np.float32)
+                scores[ids] += weight * tf * (self.K1 + 1) / (tf + norm[ids])
+
+            if scores is None:
+                continue
+
+            top = min(k, int(np.count_nonzero(scores)))
+            if not top:
+                continue
+
+            best = np.argpartition(-scores, top - 1)[:top]
+            hits.extend((float(scores[pid]), si, int(pid)) for pid in best)
+
+        hits.sort(key=lambda h: -h[0])
+
+        results = []
+        for score, si, pid in hits[:k]:
+            passage = segments[si].passage(pid)
+            results.append({
+                "source": f"local:{passage['doc_id']}#{passage['passage']}",
+                "title": passage["title"],
+                "text": passage["text"],
+                "score": round(score, 4),
+            })
+
+        return results
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def get_local_corpus():
+    global _corpus
+
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = LocalCorpus()
+        return _corpus
+
+
+# Command line
+#
+#   python -m utils.local_corpus add <file or directory> ...
+#   python -m utils.local_corpus search "query text"
+#   python -m utils.local_corpus compact | stats
+
+if __name__ == "__main__":
+    from utils.text_extractor import extract_text
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    corpus = LocalCorpus()
+
+    if command == "add":
+        docs = []
+
+        for target in sys.argv[2:]:
+            paths = [target]
+            if os.path.isdir(target):
+                paths = [
+                    os.path.join(root, name)
+                    for root, _, names in os.walk(target)
+                    for name in sorted(names)
+                ]
+
+            for path in paths:
+                text = extract_text(path, os.path.splitext(path)[1].lower())
+                if text.strip():
+                    docs.append({"doc_id": os.path.relpath(path), "title": os.path.basename(path), "text": text})
+
+        print("Indexed passages:", corpus.add_documents(docs), "from", len(docs), "documents")
+
+    elif command == "search":
+        for hit in corpus.search(" ".join(sys.argv[2:])):
+            print(hit["score"], hit["source"], hit["text"][:120])
+
+    elif command == "compact":
+        corpus.compact()
+        print(corpus.stats())
+
+    else:
+        print(corpus.stats())
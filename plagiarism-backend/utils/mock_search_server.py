@@ -0,0 +1,112 @@
+import json
+import random
+import argparse
+import threading
+from urllib.parse import quote, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Local stand-in for the Serper API
+#
+#   python -m utils.mock_search_server --port 8765 --fail-rate 0.2
+#   SERPER_URL=http://127.0.0.1:8765/search SERPER_API_KEY=test python app.py
+#
+# POST /search accepts a single query object or a list of them (batch) and
+# returns organic results that point back at /page/<query>, which serves an
+# HTML page containing the query text so the whole scan pipeline can run
+# offline. Failures (503 / 429) are injected at --fail-rate.
+
+class MockSearchHandler(BaseHTTPRequestHandler):
+
+    fail_rate = 0.0
+    results_per_query = 3
+    stats = {"requests": 0, "queries": 0, "failures": 0}
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _result(self, query, num):
+        host = f"http://{self.headers.get('Host', 'localhost')}"
+        count = min(num, self.results_per_query)
+
+        return {
+            "searchParameters": {"q": query, "num": num},
+            "organic": [
+                {
+                    "title": f"Mock result {i + 1}",
+                    "link": f"{host}/page/{quote(query)}?rank={i + 1}",
+                    "position": i + 1,
+                }
+                for i in range(count)
+            ],
+        }
+
+    def do_POST(self):
+        if self.path.split("?")[0] != "/search":
+            return self._send(404, json.dumps({"error": "not found"}))
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        batch = payload if isinstance(payload, list) else [payload]
+
+        with self.lock:
+            self.stats["requests"] += 1
+
+            if random.random() < self.fail_rate:
+                self.stats["failures"] += 1
+                status = random.choice([429, 503])
+                return self._send(status, json.dumps({"error": "injected failure"}), headers={"Retry-After": "0"})
+
+            self.stats["queries"] += len(batch)
+
+        results = [self._result(item.get("q", ""), int(item.get("num", 5))) for item in batch]
+        body = results if isinstance(payload, list) else results[0]
+
+        self._send(200, json.dumps(body))
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+
+        if path == "/stats":
+            return self._send(200, json.dumps(self.stats))
+
+        if path.startswith("/page/"):
+            text = unquote(path[len("/page/"):])
+            filler = " ".join(["This page discusses the topic in some detail."] * 10)
+            html = (
+                "<html><head><title>Mock page</title></head><body>"
+                "<nav>Home | About | Contact</nav>"
+                f"<article><p>{filler}</p><p>{text}.</p><p>{filler}</p></article>"
+                "<footer>Copyright mock</footer></body></html>"
+            )
+            return self._send(200, html, content_type="text/html; charset=utf-8")
+
+        self._send(404, json.dumps({"error": "not found"}))
+
+
+def serve(port=8765, fail_rate=0.0):
+    MockSearchHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockSearchHandler)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Serper search server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.fail_rate)
+    print(f"Mock search server on http://127.0.0.1:{args.port}/search")
+    server.serve_forever()
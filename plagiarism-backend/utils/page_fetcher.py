@@ -0,0 +1,153 @@
+import re
+import requests
+import lxml.html
+from lxml import etree
+from config import Config
+
+
+# Page ingest for web sources
+#
+# Bodies are streamed and cut off at PAGE_MAX_BYTES, non-text content types
+# are rejected from the response headers before any body is read, and HTML
+# is parsed with lxml (libxml2). Navigation, footers and other boilerplate
+# are dropped and the main content block is kept.
+
+class PageFetcher:
+
+    TEXT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+    # Elements that never hold main content
+    BOILERPLATE_TAGS = [
+        "script", "style", "noscript", "template", "svg", "iframe",
+        "nav", "header", "footer", "aside", "form", "button", "select",
+    ]
+
+    CONTENT_TAGS = {"html", "body", "main", "article"}
+
+    # Whole class / id / role tokens such as "nav", "site-header",
+    # "comment-list"; a token like "canvas" or "comments-disabled" is not one
+    BOILERPLATE_HINTS = re.compile(
+        r"^(?:(?:site|main|page|global|top|bottom)[-_])?"
+        r"(?:nav|navbar|navigation|menu|footer|header|sidebar|cookies?|banner|breadcrumbs?"
+        r"|share|sharing|social|comments?|advert|ads|promo|related)"
+        r"(?:[-_](?:bar|menu|links|list|area|wrapper|container|widget|section|box))?$",
+        re.I
+    )
+
+    # Tokens that mark an element as content even next to a boilerplate token
+    CONTENT_HINTS = {"article", "content", "main", "post", "entry", "story"}
+
+    BLOCK_TAGS = {"p", "li", "td", "pre", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6", "div", "section", "article"}
+
+    session = requests.Session()
+
+    @staticmethod
+    def fetch(url, max_bytes=None, timeout=8):
+        max_bytes = max_bytes or Config.PAGE_MAX_BYTES
+
+        try:
+            with PageFetcher.session.get(url, timeout=timeout, stream=True) as response:
+
+                if response.status_code != 200:
+                    return ""
+
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+
+                if content_type and content_type not in PageFetcher.TEXT_TYPES:
+                    print("⏭ Skipping non-text source:", content_type)
+                    return ""
+
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    print("⏭ Skipping oversized source:", declared, "bytes")
+                    return ""
+
+                body = bytearray()
+                for block in response.iter_content(chunk_size=16384):
+                    body.extend(block)
+                    if len(body) >= max_bytes:
+                        del body[max_bytes:]
+                        break
+
+                # Only trust a declared charset; otherwise let lxml sniff <meta>
+                declared_charset = "charset=" in response.headers.get("Content-Type", "").lower()
+                encoding = response.encoding if declared_charset else None
+
+            if content_type == "text/plain":
+                text = bytes(body).decode(encoding or "utf-8", errors="ignore")
+            else:
+                text = PageFetcher.main_text(bytes(body), encoding)
+
+            return re.sub(r"\s+", " ", text).strip().lower()
+
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _is_boilerplate(element):
+        if element.tag in PageFetcher.CONTENT_TAGS:
+            return False
+        tokens = " ".join([element.get("id") or "", element.get("class") or "", element.get("role") or ""]).lower().split()
+
+        if any(t in PageFetcher.CONTENT_HINTS for t in tokens):
+            return False
+
+        return any(PageFetcher.BOILERPLATE_HINTS.match(t) for t in tokens)
+
+    # Text of an element including inline children (<a>, <em>, <span>, ...);
+    # nested block elements are skipped, they are visited as blocks themselves
+    @staticmethod
+    def _own_text(element):
+        parts = [element.text or ""]
+
+        for child in element:
+            if isinstance(child.tag, str):
+                if child.tag in PageFetcher.BLOCK_TAGS:
+                    parts.append(" ")
+                else:
+                    parts.append(PageFetcher._own_text(child))
+            parts.append(child.tail or "")
+
+        return "".join(parts)
+
+    # Main-content text from an HTML document
+    @staticmethod
+    def main_text(body, encoding=None):
+        if not body.strip():
+            return ""
+
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True)
+        root = lxml.html.document_fromstring(body, parser=parser)
+
+        etree.strip_elements(root, *PageFetcher.BOILERPLATE_TAGS, with_tail=False)
+
+        for element in list(root.iter(etree.Element)):
+            if element.getparent() is not None and PageFetcher._is_boilerplate(element):
+                element.drop_tree()
+
+        # Prefer an explicit main-content container
+        candidates = root.xpath("//main | //article | //*[@role='main']")
+        container = max(candidates, key=lambda e: len(e.text_content())) if candidates else root
+
+        # Keep text blocks that are not mostly links (menus, tag clouds)
+        blocks = []
+
+        for element in container.iter(*PageFetcher.BLOCK_TAGS):
+            is_leaf = not any(child.tag in PageFetcher.BLOCK_TAGS for child in element)
+
+            own = " ".join(PageFetcher._own_text(element).split())
+
+            if not own:
+                continue
+
+            if is_leaf and len(own) < 200:
+                link_text = sum(len(a.text_content()) for a in element.iter("a"))
+                if link_text > 0.5 * len(own):
+                    continue
+
+            blocks.append(own)
+
+        if not blocks:
+            return container.text_content()
+
+        return " ".join(blocks)
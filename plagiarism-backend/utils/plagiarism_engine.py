@@ -1,12 +1,14 @@
-import re
 import nltk
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from difflib import SequenceMatcher
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
-from sentence_transformers import SentenceTransformer, util
 from collections import Counter
+from functools import partial
+from config import Config
+from utils.semantic_backend import load_semantic_model, encode, similarity_percent
+from utils.tokenizer import get_tokenizer
 
 # Download required NLTK data
 nltk.download('punkt')
@@ -14,8 +16,11 @@ nltk.download('stopwords')
 
 STOP_WORDS = set(stopwords.words('english'))
 
-# Load semantic model once
-semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Shared word tokenizer (regex by default, NLTK kept for comparison)
+TOKENIZER = get_tokenizer(Config.TOKENIZER, STOP_WORDS)
+
+# Load semantic model once (backend selected per deployment)
+semantic_model = load_semantic_model(Config.SEMANTIC_BACKEND)
 
 
 class PlagiarismEngine:
@@ -23,11 +28,7 @@ class PlagiarismEngine:
     # Text Preprocessing
     @staticmethod
     def preprocess(text):
-        text = text.lower()
-        text = re.sub(r'\W+', ' ', text)
-        tokens = word_tokenize(text)
-        tokens = [word for word in tokens if word not in STOP_WORDS]
-        return tokens
+        return TOKENIZER.content_tokens(text)
 
     # Split into chunks (for internet search)
     @staticmethod
@@ -56,7 +57,11 @@ class PlagiarismEngine:
             return 0.0
 
         try:
-            vectorizer = TfidfVectorizer()
+            vectorizer = TfidfVectorizer(
+                tokenizer=partial(TOKENIZER.words, min_len=2),
+                lowercase=False,
+                token_pattern=None
+            )
             tfidf = vectorizer.fit_transform([text1, text2])
             score = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
             return float(score)
@@ -67,8 +72,7 @@ class PlagiarismEngine:
     
     @staticmethod
     def jaccard_similarity(text1, text2):
-        tokens1 = set(PlagiarismEngine.preprocess(text1))
-        tokens2 = set(PlagiarismEngine.preprocess(text2))
+        tokens1, tokens2 = map(set, TOKENIZER.tokenize_batch([text1, text2], drop_stopwords=True))
 
         if not tokens1 or not tokens2:
             return 0.0
@@ -101,7 +105,7 @@ class PlagiarismEngine:
     def ngram_similarity(text1, text2, n=3):
 
         def get_ngrams(text):
-            tokens = re.findall(r'\w+', text.lower())
+            tokens = TOKENIZER.words(text)
             return set(tuple(tokens[i:i+n]) for i in range(len(tokens)-n+1))
 
         ngrams1 = get_ngrams(text1)
@@ -113,15 +117,15 @@ class PlagiarismEngine:
         return len(ngrams1 & ngrams2) / len(ngrams1)
 
     # Semantic Similarity (Paraphrase Detection)
+    # encoder: anything with encode_sentences (e.g. precomputed embeddings)
     @staticmethod
-    def semantic_similarity(text1, text2):
+    def semantic_similarity(text1, text2, encoder=None):
 
-        embeddings = semantic_model.encode(
-            [text1, text2],
-            convert_to_tensor=True,
-            show_progress_bar=False
-        )
+        embeddings = (encoder or PlagiarismEngine).encode_sentences([text1, text2])
 
-        score = util.cos_sim(embeddings[0], embeddings[1]).item()
+        return similarity_percent(embeddings[0], embeddings[1])
 
-        return round(max(0, score) * 100, 2)
+    # Batch sentence embeddings (normalised, one model call)
+    @staticmethod
+    def encode_sentences(sentences):
+        return encode(semantic_model, sentences)
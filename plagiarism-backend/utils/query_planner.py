@@ -0,0 +1,145 @@
+import re
+import json
+import math
+from collections import Counter
+from config import Config
+from utils.plagiarism_engine import PlagiarismEngine, STOP_WORDS
+
+
+# Search query planning
+#
+# Instead of sending the opening of the first few chunks, every sentence of
+# the document is scored by how distinctive it is:
+#
+#   score = mean IDF of content words * (1 - stopword density)
+#
+# IDF comes from a corpus table (QUERY_IDF_PATH, JSON term -> idf) when one is
+# configured, otherwise from the document's own sentences. The planner then
+# greedily picks the best sentences, spreading queries across chunks and
+# dropping near-duplicates of queries already chosen.
+
+class QueryPlanner:
+
+    MIN_WORDS = 6
+    MAX_QUERY_WORDS = 32       # search engines ignore words past this
+    MAX_QUERY_CHARS = 200
+    DUPLICATE_THRESHOLD = 0.8  # word Jaccard above which queries are merged
+    CHUNK_PENALTY = 0.5        # score multiplier per query already in a chunk
+
+    _corpus_idf = None
+
+    @staticmethod
+    def corpus_idf():
+        if QueryPlanner._corpus_idf is None:
+            QueryPlanner._corpus_idf = {}
+
+            if Config.QUERY_IDF_PATH:
+                try:
+                    with open(Config.QUERY_IDF_PATH, "r", encoding="utf-8") as f:
+                        QueryPlanner._corpus_idf = json.load(f)
+                except Exception as e:
+                    print("⚠ Could not load query IDF table:", e)
+
+        return QueryPlanner._corpus_idf
+
+    @staticmethod
+    def words(text):
+        return re.findall(r'\w+', text.lower())
+
+    # Rank every candidate sentence of the document
+    @staticmethod
+    def candidates(chunks):
+        sentences = []
+
+        for chunk_index, chunk in enumerate(chunks):
+            for sentence in PlagiarismEngine.split_into_sentences(chunk):
+                words = QueryPlanner.words(sentence)
+                if len(words) >= QueryPlanner.MIN_WORDS:
+                    sentences.append((chunk_index, sentence, words))
+
+        if not sentences:
+            return []
+
+        idf = QueryPlanner.corpus_idf()
+
+        # Fall back to document-level IDF over sentences
+        doc_freq = Counter()
+        for _, _, words in sentences:
+            doc_freq.update(set(words))
+
+        total = len(sentences)
+        default_idf = math.log((1 + total) / 1) + 1
+
+        ranked = []
+
+        for chunk_index, sentence, words in sentences:
+            content = [w for w in words if w not in STOP_WORDS]
+
+            if not content:
+                continue
+
+            if idf:
+                rarity = sum(idf.get(w, default_idf) for w in content) / len(content)
+            else:
+                rarity = sum(
+                    math.log((1 + total) / (1 + doc_freq[w])) + 1 for w in content
+                ) / len(content)
+
+            stopword_density = 1 - len(content) / len(words)
+
+            ranked.append({
+                "chunk_index": chunk_index,
+                "sentence": sentence,
+                "query": QueryPlanner.to_query(sentence),
+                "score": rarity * (1 - stopword_density),
+                "words": set(words),
+            })
+
+        ranked.sort(key=lambda c: -c["score"])
+
+        return ranked
+
+    @staticmethod
+    def to_query(sentence):
+        words = sentence.split()[:QueryPlanner.MAX_QUERY_WORDS]
+        return " ".join(words)[:QueryPlanner.MAX_QUERY_CHARS]
+
+    @staticmethod
+    def is_duplicate(candidate, chosen):
+        for other in chosen:
+            union = candidate["words"] | other["words"]
+            if union and len(candidate["words"] & other["words"]) / len(union) >= QueryPlanner.DUPLICATE_THRESHOLD:
+                return True
+        return False
+
+    # Ordered query plan: most distinctive first, spread across chunks,
+    # near-duplicates removed. Callers spend their budget from the front.
+    @staticmethod
+    def plan(chunks, budget=None):
+        budget = budget or Config.SEARCH_QUERY_BUDGET
+
+        remaining = QueryPlanner.candidates(chunks)
+        chosen = []
+        per_chunk = Counter()
+
+        # Plan a little past the budget so skipped (already matched)
+        # sentences can be replaced without re-planning
+        limit = budget * 2
+
+        while remaining and len(chosen) < limit:
+            best = max(
+                remaining,
+                key=lambda c: c["score"] * (QueryPlanner.CHUNK_PENALTY ** per_chunk[c["chunk_index"]])
+            )
+            remaining.remove(best)
+
+            if QueryPlanner.is_duplicate(best, chosen):
+                continue
+
+            chosen.append(best)
+            per_chunk[best["chunk_index"]] += 1
+
+        for c in chosen:
+            c.pop("words", None)
+
+        return chosen
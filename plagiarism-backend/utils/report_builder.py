@@ -0,0 +1,266 @@
+import io
+import html
+import zipfile
+import multiprocessing
+import threading
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import inch, mm
+from reportlab.lib.pagesizes import A4
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.piecharts import Pie
+from config import Config
+
+
+# PDF similarity reports
+#
+# build_report() renders one report from a plain dict (report_payload), so
+# the same code serves /report/<id> in the web worker and bulk exports in a
+# process pool. Stylesheets and table styles are built once per process and
+# reused; bulk renders stream back into a zip as each PDF finishes, with at
+# most REPORT_MAX_IN_FLIGHT reports queued or held in memory at a time.
+
+SOURCES_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+
+@lru_cache(maxsize=1)
+def report_styles():
+    styles = getSampleStyleSheet()
+
+    score_styles = {
+        color: ParagraphStyle('ScoreStyle', fontSize=24, alignment=1, textColor=color)
+        for color in (colors.red, colors.orange, colors.green)
+    }
+
+    body_style = ParagraphStyle('BodyStyle', fontSize=10, leading=14)
+
+    return styles, score_styles, body_style
+
+
+def score_color(score):
+    if score >= 70:
+        return colors.red
+    elif score >= 30:
+        return colors.orange
+    return colors.green
+
+
+def pie_chart(score):
+    drawing = Drawing(400, 200)
+    pie = Pie()
+    pie.x = 150
+    pie.y = 15
+    pie.width = 150
+    pie.height = 150
+
+    pie.data = [score, 100 - score]
+    pie.labels = ['Plagiarized', 'Original']
+
+    pie.slices[0].fillColor = colors.red
+    pie.slices[1].fillColor = colors.green
+
+    drawing.add(pie)
+    return drawing
+
+
+def add_page_number(canvas, doc):
+    page_num_text = f"Page {doc.page}"
+    canvas.drawRightString(200*mm, 15*mm, page_num_text)
+
+
+# Everything a report needs, as picklable plain data
+def report_payload(result, email):
+    return {
+        "result_id": result.id,
+        "email": email,
+        "file1_name": result.file1_name,
+        "created_at": result.created_at.strftime('%Y-%m-%d %H:%M'),
+        "score": float(result.plagiarism_score),
+        "matches": result.internet_matches or [],
+        "original_text": result.original_text or "",
+    }
+
+
+# Render a report to a path or a binary file object
+def build_report(payload, output):
+    styles, score_styles, body_style = report_styles()
+
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    elements = []
+
+    # HEADER SECTION
+    # -----------------------------------------
+    elements.append(Paragraph("<b>PLAGIARISM DETECTION REPORT</b>", styles["Title"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    elements.append(Paragraph(f"<b>User:</b> {payload['email']}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>File:</b> {payload['file1_name']}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Date:</b> {payload['created_at']}", styles["Normal"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    # -----------------------------------------
+    # OVERALL SCORE SECTION
+    # -----------------------------------------
+    score = payload["score"]
+
+    elements.append(Paragraph(f"<b>{score}% SIMILARITY</b>", score_styles[score_color(score)]))
+    elements.append(Spacer(1, 0.4 * inch))
+
+    # -----------------------------------------
+    # PIE CHART (Original vs Plagiarized)
+    # -----------------------------------------
+    elements.append(pie_chart(score))
+    elements.append(Spacer(1, 0.5 * inch))
+
+    # -----------------------------------------
+    # MATCHED SOURCES TABLE
+    # -----------------------------------------
+    elements.append(Paragraph("<b>Matched Sources</b>", styles["Heading2"]))
+    elements.append(Spacer(1, 0.2 * inch))
+
+    matches = payload["matches"]
+
+    table_data = [["#", "Source URL", "Match %"]]
+
+    for i, match in enumerate(matches[:10], 1):
+        url = match.get("source", "N/A")
+        similarity = match.get("score", 0)
+
+        link = Paragraph(
+            f"<link href='{url}' color='blue'>{url[:60]}...</link>",
+            styles["Normal"]
+        )
+
+        table_data.append([str(i), link, f"{similarity}%"])
+
+    if len(table_data) == 1:
+        table_data.append(["-", "No sources detected", "0%"])
+
+    table = Table(table_data, colWidths=[0.5*inch, 4.0*inch, 1.0*inch])
+    table.setStyle(SOURCES_TABLE_STYLE)
+
+    elements.append(table)
+    elements.append(Spacer(1, 0.5 * inch))
+
+    # -----------------------------------------
+    # DOCUMENT ANALYSIS SECTION
+    # -----------------------------------------
+    elements.append(Paragraph("<b>Detailed Document Analysis</b>", styles["Heading2"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    safe_text = html.escape(payload["original_text"])
+
+    # Highlight plagiarized sentences
+    for match in matches:
+        sentence = match.get("file_text", "")
+        if sentence and len(sentence) > 20:
+            escaped = html.escape(sentence)
+            highlighted = f"<font color='red'><b>{escaped}</b></font>"
+            safe_text = safe_text.replace(escaped, highlighted)
+
+    elements.append(Paragraph(safe_text, body_style))
+
+    doc.build(elements, onLaterPages=add_page_number, onFirstPage=add_page_number)
+
+
+# Pool task: (result_id, pdf bytes, error)
+def render_report(payload):
+    try:
+        buffer = io.BytesIO()
+        build_report(payload, buffer)
+        return payload["result_id"], buffer.getvalue(), None
+    except Exception as e:
+        return payload["result_id"], None, f"{type(e).__name__}: {e}"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# One long-lived pool per web process (spawned, so no forked DB/model state).
+# Spawned workers re-run the main script as __mp_main__; app.py only builds
+# the app outside __mp_main__, so a worker imports little beyond this module.
+def get_report_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.REPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=report_styles
+            )
+        return _pool
+
+
+# Render payloads in the pool, yielding results as they finish
+def render_reports(payloads, max_in_flight=None):
+    pool = get_report_pool()
+    max_in_flight = max_in_flight or Config.REPORT_MAX_IN_FLIGHT
+
+    payloads = iter(payloads)
+    in_flight = set()
+
+    def fill():
+        while len(in_flight) < max_in_flight:
+            payload = next(payloads, None)
+            if payload is None:
+                return
+            in_flight.add(pool.submit(render_report, payload))
+
+    fill()
+
+    while in_flight:
+        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+        for future in finished:
+            in_flight.discard(future)
+            yield future.result()
+
+        fill()
+
+
+# Write-only sink that zipfile can stream into; drained after every entry
+class _ZipSink:
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+# Zip bytes for (result_id, pdf, error) items, one entry per finished report
+def stream_report_zip(rendered, missing=()):
+    sink = _ZipSink()
+    errors = [f"report_{rid}: not found" for rid in missing]
+
+    # PDFs are already compressed, store them as-is
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for result_id, pdf, error in rendered:
+            if error:
+                errors.append(f"report_{result_id}: {error}")
+                continue
+
+            archive.writestr(f"report_{result_id}.pdf", pdf)
+            yield sink.drain()
+
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n")
+
+    yield sink.drain()
@@ -0,0 +1,165 @@
+import time
+import heapq
+import itertools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+# Deadline-aware work scheduler for a single web scan
+#
+# Work items carry an expected value (priority). Network work (searches,
+# page fetches) runs on a thread pool, highest value first; CPU work
+# (sentence comparisons) runs on the calling thread, also highest value
+# first. Callbacks run on the calling thread and may schedule more work.
+# Idle callbacks (when_idle) run once all queued and in-flight work has
+# drained, so a follow-up stage never competes with the one before it.
+# When the time budget runs out, queued work is dropped, in-flight futures
+# are cancelled/abandoned and run() returns so the caller can report a
+# partial result together with stats().
+
+class ScanScheduler:
+
+    def __init__(self, time_budget, max_workers=6):
+        self.started = time.monotonic()
+        self.deadline = self.started + time_budget
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+
+        self._order = itertools.count()
+        self._io_queue = []
+        self._cpu_queue = []
+        self._in_flight = {}
+        self._idle = []
+
+        self.scheduled = Counter()
+        self.completed = Counter()
+        self.failed = Counter()
+        self.cancelled = Counter()
+        self.timed_out = False
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    def elapsed(self):
+        return round(time.monotonic() - self.started, 2)
+
+    # Network-bound work, callback(result) runs on the scheduler thread
+    def schedule_io(self, kind, priority, fn, args=(), callback=None):
+        self.scheduled[kind] += 1
+        heapq.heappush(self._io_queue, (-priority, next(self._order), kind, fn, args, callback))
+
+    # CPU-bound work, run inline in priority order
+    def schedule_cpu(self, kind, priority, fn, args=()):
+        self.scheduled[kind] += 1
+        heapq.heappush(self._cpu_queue, (-priority, next(self._order), kind, fn, args, None))
+
+    # Runs on the scheduler thread once no other work is queued or in flight
+    def when_idle(self, kind, fn):
+        self.scheduled[kind] += 1
+        self._idle.append((kind, fn))
+
+    def _fill_pool(self):
+        while self._io_queue and len(self._in_flight) < self.max_workers:
+            _, _, kind, fn, args, callback = heapq.heappop(self._io_queue)
+            future = self.pool.submit(fn, *args)
+            self._in_flight[future] = (kind, callback)
+
+    def _collect(self, futures):
+        for future in futures:
+            kind, callback = self._in_flight.pop(future)
+
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠ Scan {kind} failed:", e)
+                self.failed[kind] += 1
+                continue
+
+            self.completed[kind] += 1
+
+            if callback:
+                try:
+                    callback(result)
+                except Exception as e:
+                    print(f"⚠ Scan {kind} callback failed:", e)
+
+    def _wait_any(self, timeout):
+        if not self._in_flight:
+            return []
+
+        done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        return done
+
+    def run(self):
+        try:
+            while True:
+                if self.expired():
+                    self.timed_out = True
+                    break
+
+                self._fill_pool()
+
+                # Finished network work first, it may unlock better comparisons
+                self._collect(self._wait_any(0))
+
+                if self._cpu_queue:
+                    _, _, kind, fn, args, _ = heapq.heappop(self._cpu_queue)
+                    try:
+                        fn(*args)
+                        self.completed[kind] += 1
+                    except Exception as e:
+                        print(f"⚠ Scan {kind} failed:", e)
+                        self.failed[kind] += 1
+                    continue
+
+                if not self._in_flight and not self._io_queue:
+                    if not self._idle:
+                        break
+
+                    kind, fn = self._idle.pop(0)
+                    try:
+                        fn()
+                        self.completed[kind] += 1
+                    except Exception as e:
+                        print(f"⚠ Scan {kind} failed:", e)
+                        self.failed[kind] += 1
+                    continue
+
+                self._collect(self._wait_any(self.remaining()))
+        finally:
+            self._shutdown()
+
+    def _shutdown(self):
+        for entry in self._io_queue + self._cpu_queue:
+            self.cancelled[entry[2]] += 1
+
+        for kind, _ in self._idle:
+            self.cancelled[kind] += 1
+
+        for future, (kind, _) in self._in_flight.items():
+            future.cancel()
+            self.cancelled[kind] += 1
+
+        self._io_queue = []
+        self._cpu_queue = []
+        self._in_flight = {}
+        self._idle = []
+
+        # Do not wait for abandoned requests; they finish on their own timeouts
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        kinds = set(self.scheduled)
+
+        return {
+            kind: {
+                "scheduled": self.scheduled[kind],
+                "completed": self.completed[kind],
+                "failed": self.failed[kind],
+                "cancelled": self.cancelled[kind],
+            }
+            for kind in sorted(kinds)
+        }
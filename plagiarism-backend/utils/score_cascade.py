@@ -0,0 +1,191 @@
+import math
+from difflib import SequenceMatcher
+from config import Config
+from utils.plagiarism_engine import PlagiarismEngine, STOP_WORDS
+from utils.sketches import DocumentSketch, NUM_PERM
+
+
+WEIGHTS = (0.4, 0.3, 0.3)  # tfidf, jaccard, sequence
+
+# find_longest_match calls spent on the sequence bounds per tier
+SKETCH_STEPS = 8
+LEXICAL_STEPS = 64
+
+
+def check_level(percentage_score):
+    if percentage_score <= 30:
+        return "Low"
+    elif percentage_score <= 70:
+        return "Medium"
+    return "High"
+
+
+# Metric as a stored percentage
+def percent(value):
+    return float(round(value * 100, 2))
+
+
+# Anytime bounds on SequenceMatcher.ratio()
+#
+# Replays the divide-and-conquer of get_matching_blocks() one
+# find_longest_match call at a time. Blocks found so far are matched in the
+# final result (lower bound); every unresolved gap can add at most its
+# shorter side (upper bound). Run to completion it equals ratio() exactly.
+
+class SequenceBounds:
+
+    def __init__(self, text1, text2):
+        self.matcher = SequenceMatcher(None, text1, text2)
+        self.total = len(text1) + len(text2)
+        self.matched = 0
+        self.gaps = [(0, len(text1), 0, len(text2))]
+
+    def refine(self, steps=None):
+        while self.gaps and (steps is None or steps > 0):
+            alo, ahi, blo, bhi = self.gaps.pop()
+            i, j, k = self.matcher.find_longest_match(alo, ahi, blo, bhi)
+
+            if k:
+                self.matched += k
+                if alo < i and blo < j:
+                    self.gaps.append((alo, i, blo, j))
+                if i + k < ahi and j + k < bhi:
+                    self.gaps.append((i + k, ahi, j + k, bhi))
+
+            if steps is not None:
+                steps -= 1
+
+        return self.bounds()
+
+    def bounds(self):
+        if not self.total:
+            return 1.0, 1.0
+
+        pending = sum(min(ahi - alo, bhi - blo) for alo, ahi, blo, bhi in self.gaps)
+        return 2.0 * self.matched / self.total, 2.0 * (self.matched + pending) / self.total
+
+    def ratio(self):
+        return self.refine()[0]
+
+
+# Early-exit scoring for pairwise /check
+#
+# Tiers, cheapest first; each one bounds every metric and stops as soon as
+# the whole [low, high] range of the final score falls in a single level:
+#
+#   identical  equal texts                                   exact
+#   sketch     MinHash Jaccard +- 3 sigma, hashed TF-IDF cosine +- margin,
+#              sequence bounds after SKETCH_STEPS matching-block steps
+#              (upper bound also capped by real_quick_ratio)
+#   lexical    exact TF-IDF and Jaccard, sequence bounds after
+#              LEXICAL_STEPS more steps (capped by quick_ratio)
+#   exact      SequenceMatcher run to completion (what /check always did)
+#
+# The sketch bounds are probabilistic (3 sigma / hashing margin), the others
+# are hard bounds. When a tier settles the level before "exact", the reported
+# score is the middle of the range and exact=False; metrics that tier did
+# not measure exactly are the middle of their own bounds and are listed in
+# "estimated".
+# exact=True (or CASCADE_ENABLED=0) always computes every metric.
+
+class ScoreCascade:
+
+    @staticmethod
+    def _range(tfidf, jaccard, sequence):
+        low = sum(w * b[0] for w, b in zip(WEIGHTS, (tfidf, jaccard, sequence)))
+        high = sum(w * b[1] for w, b in zip(WEIGHTS, (tfidf, jaccard, sequence)))
+        return round(low * 100, 2), round(high * 100, 2)
+
+    @staticmethod
+    def _clip(bound):
+        return max(0.0, bound[0]), min(1.0, bound[1])
+
+    @staticmethod
+    def _decided(tier, tfidf, jaccard, sequence):
+        low, high = ScoreCascade._range(tfidf, jaccard, sequence)
+
+        if check_level(low) != check_level(high):
+            return None
+
+        bounds = {"tfidf": tfidf, "jaccard": jaccard, "sequence": sequence}
+
+        return {
+            **{name: (b[0] + b[1]) / 2 for name, b in bounds.items()},
+            "estimated": [name for name, b in bounds.items() if b[0] != b[1]],
+            "score": round((low + high) / 2, 2),
+            "score_range": [low, high],
+            "level": check_level(low),
+            "tier": tier,
+            "exact": False,
+        }
+
+    @staticmethod
+    def _exact(tier, tfidf, jaccard, sequence):
+        score = round(((WEIGHTS[0] * tfidf) + (WEIGHTS[1] * jaccard) + (WEIGHTS[2] * sequence)) * 100, 2)
+
+        return {
+            "tfidf": tfidf,
+            "jaccard": jaccard,
+            "sequence": sequence,
+            "estimated": [],
+            "score": score,
+            "score_range": [score, score],
+            "level": check_level(score),
+            "tier": tier,
+            "exact": True,
+        }
+
+    @staticmethod
+    def score(text1, text2, exact=False):
+
+        # Tier 0: identical content
+        if text1.strip() and text1 == text2:
+            tfidf = PlagiarismEngine.tfidf_similarity(text1, text2)
+            jaccard = PlagiarismEngine.jaccard_similarity(text1, text2)
+            return ScoreCascade._exact("identical", tfidf, jaccard, 1.0)
+
+        if not exact and Config.CASCADE_ENABLED:
+            bounds = SequenceBounds(text1, text2)
+            low, high = bounds.refine(SKETCH_STEPS)
+            sequence = (low, min(high, bounds.matcher.real_quick_ratio()))
+
+            # Tier 1: sketches + first matching blocks
+            sketch1 = DocumentSketch(STOP_WORDS)
+            sketch2 = DocumentSketch(STOP_WORDS)
+            sketch1.update(text1)
+            sketch2.update(text2)
+
+            jaccard_est = sketch1.minhash.jaccard(sketch2.minhash)
+            spread = 3 * math.sqrt(max(jaccard_est * (1 - jaccard_est), 1 / NUM_PERM) / NUM_PERM)
+            jaccard = ScoreCascade._clip((jaccard_est - spread, jaccard_est + spread))
+
+            tfidf_est = sketch1.tf.cosine(sketch2.tf)
+            margin = Config.CASCADE_TFIDF_MARGIN
+            tfidf = ScoreCascade._clip((tfidf_est - margin, tfidf_est + margin))
+
+            decided = ScoreCascade._decided("sketch", tfidf, jaccard, sequence)
+            if decided:
+                return decided
+
+            # Tier 2: exact lexical metrics, tighter sequence bounds
+            low, high = bounds.refine(LEXICAL_STEPS)
+            sequence = (low, min(high, bounds.matcher.quick_ratio()))
+            tfidf_score = PlagiarismEngine.tfidf_similarity(text1, text2)
+            jaccard_score = PlagiarismEngine.jaccard_similarity(text1, text2)
+
+            decided = ScoreCascade._decided(
+                "lexical",
+                (tfidf_score, tfidf_score),
+                (jaccard_score, jaccard_score),
+                sequence
+            )
+            if decided:
+                return decided
+
+            return ScoreCascade._exact("exact", tfidf_score, jaccard_score, bounds.ratio())
+
+        tfidf_score = PlagiarismEngine.tfidf_similarity(text1, text2)
+        jaccard_score = PlagiarismEngine.jaccard_similarity(text1, text2)
+        sequence_score = PlagiarismEngine.sequence_similarity(text1, text2)
+
+        return ScoreCascade._exact("exact", tfidf_score, jaccard_score, sequence_score)
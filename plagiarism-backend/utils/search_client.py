@@ -0,0 +1,310 @@
+import os
+import json
+import time
+import random
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import Config
+from utils.file_lock import file_lock
+
+
+# Token bucket for search calls. With a state file the bucket is shared by
+# every process (gunicorn workers, batch_scan pool) under a file lock;
+# without one it only covers the current process.
+
+class TokenBucket:
+
+    def __init__(self, rate, capacity, path=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.path = path
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return float(state["tokens"]), float(state["updated"])
+        except (OSError, ValueError, KeyError):
+            return self.capacity, time.time()
+
+    def _write(self, tokens, updated):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"tokens": tokens, "updated": updated}, f)
+        except OSError as e:
+            print("⚠ Could not write search rate file:", e)
+
+    # Take tokens if available; otherwise return the seconds to wait
+    def _take(self, tokens):
+        now = time.time()
+
+        if self.path:
+            self.tokens, self.updated = self._read()
+
+        self.tokens = min(
+            self.capacity,
+            self.tokens + max(0.0, now - self.updated) * self.rate
+        )
+        self.updated = now
+
+        wait = 0.0
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+        else:
+            wait = (tokens - self.tokens) / self.rate
+
+        if self.path:
+            self._write(self.tokens, self.updated)
+
+        return wait
+
+    def acquire(self, tokens=1):
+        tokens = min(tokens, self.capacity)
+
+        while True:
+            with self.lock:
+                if self.path:
+                    with file_lock(self.path + ".lock"):
+                        wait = self._take(tokens)
+                else:
+                    wait = self._take(tokens)
+
+            if not wait:
+                return
+
+            time.sleep(wait)
+
+
+# Daily query quota. The count lives in the quota file and every change is
+# a locked read-modify-write, so all processes draw from one daily total.
+
+class QuotaTracker:
+
+    def __init__(self, daily_limit, path=None):
+        self.daily_limit = daily_limit
+        self.path = path
+        self.lock = threading.Lock()
+        self.day = date.today().isoformat()
+        self.used = 0
+
+    def _load(self):
+        self.day = date.today().isoformat()
+        self.used = 0
+
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("day") == self.day:
+                self.used = int(data.get("used", 0))
+        except Exception as e:
+            print("⚠ Could not read search quota file:", e)
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"day": self.day, "used": self.used}, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print("⚠ Could not write search quota file:", e)
+
+    def _roll_over(self):
+        today = date.today().isoformat()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+
+    # Run update(self) on the current shared count and persist the result
+    def _update(self, update):
+        with self.lock:
+            if not self.path:
+                self._roll_over()
+                return update()
+
+            with file_lock(self.path + ".lock"):
+                self._load()
+                result = update()
+                self._save()
+                return result
+
+    # Reserve up to `count` queries, returns how many were granted
+    def reserve(self, count):
+        def update():
+            granted = count
+            if self.daily_limit:
+                granted = max(0, min(count, self.daily_limit - self.used))
+            self.used += granted
+            return granted
+
+        return self._update(update)
+
+    # Give back queries that were reserved but never answered
+    def release(self, count):
+        def update():
+            self.used = max(0, self.used - count)
+
+        self._update(update)
+
+    def remaining(self):
+        if not self.daily_limit:
+            return None
+        return self._update(lambda: max(0, self.daily_limit - self.used))
+
+
+class SearchError(Exception):
+    pass
+
+
+# Serper search client
+#
+# Queries are sent in batches (Serper accepts a JSON list of queries in one
+# request), batches run concurrently under the token bucket, transient
+# failures are retried with jittered exponential backoff, and every query
+# counts against the daily quota. Point SERPER_URL at utils.mock_search_server
+# to exercise it locally.
+
+class SearchClient:
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, api_key=None, url=None):
+        self.api_key = api_key if api_key is not None else Config.SERPER_API_KEY
+        self.url = url or Config.SERPER_URL
+        self.session = requests.Session()
+        self.bucket = TokenBucket(Config.SEARCH_RATE_PER_SEC, Config.SEARCH_BURST, Config.SEARCH_RATE_PATH)
+        self.quota = QuotaTracker(Config.SEARCH_DAILY_QUOTA, Config.SEARCH_QUOTA_PATH)
+
+    def _post(self, payload, cost):
+        headers = {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json",
+        }
+
+        last_error = None
+
+        for attempt in range(Config.SEARCH_MAX_RETRIES + 1):
+            self.bucket.acquire(cost)
+
+            try:
+                response = self.session.post(
+                    self.url,
+                    headers=headers,
+                    json=payload,
+                    timeout=10
+                )
+
+                print("🔍 Search Status Code:", response.status_code)
+
+                if response.status_code == 200:
+                    return response.json()
+
+                if response.status_code not in self.RETRY_STATUS:
+                    raise SearchError(f"Search failed ({response.status_code}): {response.text[:200]}")
+
+                last_error = SearchError(f"Search returned {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
+
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                retry_after = None
+
+            if attempt == Config.SEARCH_MAX_RETRIES:
+                break
+
+            # Full jitter backoff, honouring Retry-After when the server sends it
+            delay = random.uniform(0, min(30, Config.SEARCH_BACKOFF_BASE * (2 ** attempt)))
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+
+            print(f"⚠ Search retry {attempt + 1} in {delay:.2f}s:", last_error)
+            time.sleep(delay)
+
+        raise SearchError(str(last_error))
+
+    @staticmethod
+    def _links(result):
+        links = []
+
+        for item in (result or {}).get("organic", []):
+            if "link" in item:
+                links.append(item["link"])
+
+        return links
+
+    def _search_batch(self, queries, num_results):
+        granted = self.quota.reserve(len(queries))
+
+        if granted < len(queries):
+            print(f"⚠ Daily search quota exhausted, skipping {len(queries) - granted} queries")
+
+        queries = queries[:granted]
+
+        if not queries:
+            return {}
+
+        payload = [{"q": q, "num": num_results} for q in queries]
+
+        try:
+            data = self._post(payload, len(queries))
+        except Exception as e:
+            print("❌ Search error:", e)
+            self.quota.release(len(queries))
+            return {}
+
+        if isinstance(data, dict):
+            data = [data]
+
+        return {
+            q: self._links(result)
+            for q, result in zip(queries, data)
+        }
+
+    # Search many queries at once, returns {query: [links]}
+    def search_many(self, queries, num_results=5):
+        if not self.api_key:
+            print("❌ SERPER API KEY NOT FOUND")
+            return {}
+
+        queries = list(dict.fromkeys(queries))
+        size = max(1, Config.SEARCH_BATCH_SIZE)
+        batches = [queries[i:i + size] for i in range(0, len(queries), size)]
+
+        results = {}
+
+        if not batches:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(len(batches), Config.SEARCH_CONCURRENCY)) as pool:
+            for found in pool.map(lambda b: self._search_batch(b, num_results), batches):
+                results.update(found)
+
+        print("✅ Found URLs:", sum(len(v) for v in results.values()))
+
+        return results
+
+    def search(self, query, num_results=5):
+        return self.search_many([query], num_results).get(query, [])
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# Process-wide client so the rate limit and quota are shared
+
+def get_search_client():
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = SearchClient()
+        return _client
@@ -0,0 +1,156 @@
+import sys
+import time
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Supported inference backends
+#   torch       -> full precision PyTorch (default, reference scores)
+#   torch-int8  -> PyTorch with int8 dynamic quantization of Linear layers
+#   onnx        -> ONNX Runtime, fp32 export of the same model
+#   onnx-int8   -> ONNX Runtime, int8 quantized export shipped with the model
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+# Reference sentence pairs used for the accuracy parity check
+REFERENCE_PAIRS = [
+    ("The cat sat on the mat.", "A cat was sitting on the mat."),
+    ("Machine learning models need large amounts of data.",
+     "Training ML systems requires a lot of data."),
+    ("Photosynthesis converts light energy into chemical energy.",
+     "Plants turn sunlight into chemical energy through photosynthesis."),
+    ("The stock market fell sharply on Monday.",
+     "Share prices dropped steeply at the start of the week."),
+    ("Python is a popular programming language.",
+     "The weather in London is often rainy."),
+    ("She plays the violin in the city orchestra.",
+     "Quantum computers use qubits instead of bits."),
+    ("Plagiarism is presenting someone else's work as your own.",
+     "Copying another person's work and claiming it as yours is plagiarism."),
+    ("The French Revolution began in 1789.",
+     "In 1789 the revolution in France started."),
+    ("Water boils at 100 degrees Celsius at sea level.",
+     "At sea level, the boiling point of water is 100 C."),
+    ("The library closes at eight in the evening.",
+     "Neural networks are loosely inspired by the brain."),
+]
+
+
+# Load the semantic model for the selected backend
+
+def load_semantic_model(backend="torch"):
+    backend = (backend or "torch").lower()
+
+    if backend not in BACKENDS:
+        print(f"⚠ Unknown semantic backend '{backend}', falling back to torch")
+        backend = "torch"
+
+    if backend == "torch":
+        return SentenceTransformer(MODEL_NAME, device="cpu")
+
+    if backend == "torch-int8":
+        import torch
+
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+
+    if backend == "onnx":
+        return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx")
+
+    return SentenceTransformer(
+        MODEL_NAME,
+        device="cpu",
+        backend="onnx",
+        model_kwargs={"file_name": ONNX_INT8_FILE}
+    )
+
+
+# Encode sentences into L2-normalised float32 embeddings
+
+def encode(model, sentences, batch_size=64):
+    if not sentences:
+        return np.zeros((0, 384), dtype=np.float32)
+
+    embeddings = model.encode(
+        list(sentences),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+# Cosine similarity between two normalised vectors as a 0-100 score
+
+def similarity_percent(vec1, vec2):
+    score = float(np.dot(vec1, vec2))
+    return round(max(0, score) * 100, 2)
+
+
+# Accuracy parity + throughput comparison against the torch reference
+#
+#   python -m utils.semantic_backend [backend ...]
+
+def compare_backends(backends=BACKENDS, pairs=REFERENCE_PAIRS, rounds=20):
+    left = [a for a, _ in pairs]
+    right = [b for _, b in pairs]
+    sentences = left + right
+
+    report = {}
+    reference = None
+
+    for backend in ["torch"] + [b for b in backends if b != "torch"]:
+        model = load_semantic_model(backend)
+
+        # Warm up once so lazy initialisation does not skew timings
+        encode(model, sentences)
+
+        latencies = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            encode(model, left[:1] + right[:1], batch_size=2)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            vectors = encode(model, sentences)
+        elapsed = time.perf_counter() - start
+
+        half = len(pairs)
+        scores = [
+            similarity_percent(vectors[i], vectors[half + i])
+            for i in range(half)
+        ]
+
+        if reference is None:
+            reference = scores
+
+        diffs = [abs(s - r) for s, r in zip(scores, reference)]
+        latencies.sort()
+
+        report[backend] = {
+            "max_abs_diff": round(max(diffs), 2),
+            "mean_abs_diff": round(sum(diffs) / len(diffs), 2),
+            "sentences_per_sec": round(len(sentences) * rounds / elapsed, 1),
+            "pair_latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 2),
+            "pair_latency_ms_max": round(latencies[-1] * 1000, 2),
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or BACKENDS
+
+    for name, stats in compare_backends(selected).items():
+        print(f"{name:12s}", stats)
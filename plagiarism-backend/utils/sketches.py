@@ -0,0 +1,259 @@
+import re
+import zlib
+import codecs
+from collections import Counter, deque
+from difflib import SequenceMatcher
+import numpy as np
+
+
+# Streaming sketches for large-document /check
+#
+# Each upload is read as a stream of text windows; nothing holds a whole
+# document. Per document we keep
+#
+#   MinHash       NUM_PERM uint64 minima of the (stopword-free) token set,
+#                 estimates the Jaccard score
+#   HashedTF      TF_BUCKETS float32 term counts (hashing trick), gives the
+#                 TF-IDF cosine with the same smooth IDF sklearn uses for two
+#                 documents
+#
+# and the sequence score is the SequenceMatcher ratio summed over aligned
+# window pairs (2 * matched chars / total chars).
+#
+# Window boundaries are content-defined (rolling hash of word checksums, as
+# in utils.chunk_memo), so an insertion only changes the window it lands in
+# and both streams fall back onto the same boundaries after it. Windows are
+# then paired with their best match (word-trigram containment) within the
+# next LOOKAHEAD windows of the other stream, rather than by position.
+#
+# Peak memory, independent of input size (defaults):
+#   2 x HashedTF                      2 x 1 MiB
+#   2 x MinHash                       2 x 2 KiB
+#   MinHash batch (NUM_PERM x 2048)   4 MiB
+#   2 x LOOKAHEAD text windows        ~ 2 x 4 x 2 x WINDOW_CHARS (max size)
+#   SequenceMatcher on one pair       ~ 2 x WINDOW_CHARS x small constant
+# i.e. well under 16 MiB for the sketch state on top of the request itself.
+
+WINDOW_CHARS = 8192
+TF_BUCKETS = 1 << 18
+NUM_PERM = 256
+HASH_BATCH = 2048
+LOOKAHEAD = 4
+MIN_OVERLAP = 0.1          # trigram containment below which windows don't pair
+
+TOKEN_RE = re.compile(r'\w+')
+TFIDF_TOKEN_RE = re.compile(r'\b\w\w+\b')
+WORD_RE = re.compile(r'\S+\s*|\s+')
+
+_rng = np.random.default_rng(2024)
+_PERM_A = (_rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1))
+_PERM_B = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+_MAX = np.iinfo(np.uint64).max
+
+
+def _token_hashes(tokens):
+    return np.fromiter((hash(t) & 0xFFFFFFFFFFFFFFFF for t in tokens), dtype=np.uint64, count=len(tokens))
+
+
+class MinHash:
+
+    def __init__(self):
+        self.minima = np.full(NUM_PERM, _MAX, dtype=np.uint64)
+        self.empty = True
+
+    def update(self, tokens):
+        tokens = list(set(tokens))
+
+        for i in range(0, len(tokens), HASH_BATCH):
+            hashes = _token_hashes(tokens[i:i + HASH_BATCH])
+            # One affine map a * x + b (mod 2^64) per permutation; a is odd,
+            # so each map is a bijection of uint64. Overflow wraps by design
+            with np.errstate(over="ignore"):
+                permuted = _PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]
+            np.minimum(self.minima, permuted.min(axis=1), out=self.minima)
+            self.empty = False
+
+    def jaccard(self, other):
+        if self.empty or other.empty:
+            return 0.0
+        return float(np.mean(self.minima == other.minima))
+
+
+class HashedTF:
+
+    def __init__(self):
+        self.counts = np.zeros(TF_BUCKETS, dtype=np.float32)
+
+    def update(self, tokens):
+        if not tokens:
+            return
+        buckets = Counter(hash(t) % TF_BUCKETS for t in tokens)
+        idx = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+        val = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+        self.counts[idx] += val
+
+    # Cosine of TF-IDF vectors, smooth idf over the two documents
+    def cosine(self, other):
+        a, b = self.counts, other.counts
+        df = (a > 0).astype(np.float32) + (b > 0).astype(np.float32)
+        idf = np.log(3.0 / (1.0 + df)) + 1.0
+
+        wa = a * idf
+        wb = b * idf
+        norm = float(np.linalg.norm(wa)) * float(np.linalg.norm(wb))
+
+        if norm == 0:
+            return 0.0
+
+        return float(np.dot(wa, wb) / norm)
+
+
+# Decoded text windows from a binary stream, never splitting a word
+#
+# A window ends after the first word, past window_chars / 2, where the
+# rolling sum of the last `window` word checksums hits the boundary pattern;
+# windows are capped at 2 x window_chars. Boundaries depend only on nearby
+# words, so the same text is windowed the same way wherever it sits.
+
+def iter_windows(stream, window_chars=WINDOW_CHARS, window=4):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    min_chars, max_chars = window_chars // 2, window_chars * 2
+    divisor = max(1, window_chars // 12)   # ~6 chars per word -> ~window_chars
+
+    checksums = deque(maxlen=window)
+    parts = []
+    size = 0
+    carry = ""
+
+    while True:
+        block = stream.read(window_chars)
+        final = not block
+        text = carry + decoder.decode(block or b"", final=final)
+
+        # Hold back a trailing partial word for the next block
+        cut = len(text)
+        if not final:
+            while cut > 0 and not text[cut - 1].isspace():
+                cut -= 1
+            if cut == 0 and len(text) < max_chars:
+                carry = text
+                continue
+            cut = cut or len(text)
+
+        carry = text[cut:]
+
+        for piece in WORD_RE.findall(text[:cut]):
+            parts.append(piece)
+            size += len(piece)
+
+            word = piece.strip()
+            if not word:
+                continue
+
+            checksums.append(zlib.crc32(word.lower().encode("utf-8")))
+
+            if size >= max_chars or (size >= min_chars and sum(checksums) % divisor == 0):
+                yield "".join(parts)
+                parts = []
+                size = 0
+
+        if final:
+            if parts:
+                yield "".join(parts)
+            return
+
+
+class DocumentSketch:
+
+    def __init__(self, stop_words=()):
+        self.stop_words = stop_words
+        self.minhash = MinHash()
+        self.tf = HashedTF()
+        self.chars = 0
+
+    def update(self, window):
+        lowered = window.lower()
+        self.chars += len(window)
+        self.minhash.update(t for t in TOKEN_RE.findall(lowered) if t not in self.stop_words)
+        self.tf.update(TFIDF_TOKEN_RE.findall(lowered))
+
+
+# Word-trigram hashes of a window, for pairing windows across documents
+
+def _shingles(window):
+    words = TOKEN_RE.findall(window.lower())
+    return {hash(tuple(words[i:i + 3])) for i in range(max(1, len(words) - 2))}
+
+
+def _containment(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+# Scores for two streams with bounded memory: (tfidf, jaccard, sequence)
+
+def compare_streams(stream1, stream2, stop_words=(), window_chars=WINDOW_CHARS):
+    sketch1 = DocumentSketch(stop_words)
+    sketch2 = DocumentSketch(stop_words)
+    matched = 0
+
+    windows1 = iter_windows(stream1, window_chars)
+    windows2 = iter_windows(stream2, window_chars)
+    ahead1 = deque()
+    ahead2 = deque()
+
+    def fill(ahead, windows, sketch):
+        while len(ahead) < LOOKAHEAD:
+            w = next(windows, None)
+            if w is None:
+                return
+            sketch.update(w)
+            ahead.append((w, _shingles(w)))
+
+    while True:
+        fill(ahead1, windows1, sketch1)
+        fill(ahead2, windows2, sketch2)
+
+        if not ahead1 or not ahead2:
+            break
+
+        # Best partner of either front window; nearer pairs win ties
+        pairs = [(0, j) for j in range(len(ahead2))] + [(i, 0) for i in range(1, len(ahead1))]
+        i, j = max(pairs, key=lambda p: (_containment(ahead1[p[0]][1], ahead2[p[1]][1]), -sum(p)))
+
+        # Both fronts were replaced: nothing nearby to pair them with
+        if _containment(ahead1[i][1], ahead2[j][1]) < MIN_OVERLAP:
+            ahead1.popleft()
+            ahead2.popleft()
+            continue
+
+        # Windows skipped over were inserted in one document only
+        for _ in range(i):
+            ahead1.popleft()
+        for _ in range(j):
+            ahead2.popleft()
+
+        w1 = ahead1.popleft()[0]
+        w2 = ahead2.popleft()[0]
+
+        if w1 == w2:
+            matched += len(w1)
+        else:
+            blocks = SequenceMatcher(None, w1, w2).get_matching_blocks()
+            matched += sum(b.size for b in blocks)
+
+    # Whatever is left only feeds the sketches
+    for w in windows1:
+        sketch1.update(w)
+    for w in windows2:
+        sketch2.update(w)
+
+    total = sketch1.chars + sketch2.chars
+    sequence = (2.0 * matched / total) if total else 1.0
+
+    return (
+        sketch1.tf.cosine(sketch2.tf),
+        sketch1.minhash.jaccard(sketch2.minhash),
+        sequence,
+    )
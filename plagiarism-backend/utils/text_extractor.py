@@ -1,18 +1,37 @@
 import os
-from PyPDF2 import PdfReader
+import fitz  # PyMuPDF
 from docx import Document
 
+# file_path may also be a binary file object (an upload stream), so stored
+# uploads, uploads scanned straight from the request and batch scans all
+# extract the same way (PDFs with PyMuPDF)
+
+def read_plain(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+
+    # Same newline handling as text-mode open()
+    text = source.read().decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def extract_text(file_path, extension):
     text = ""
 
     if extension == ".txt":
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+        text = read_plain(file_path)
 
     elif extension == ".pdf":
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            text += page.extract_text() or ""
+        if isinstance(file_path, (str, os.PathLike)):
+            doc = fitz.open(file_path)
+        else:
+            doc = fitz.open(stream=file_path.read(), filetype="pdf")
+
+        for page in doc:
+            text += page.get_text()
+
+        doc.close()
 
     elif extension == ".docx":
         doc = Document(file_path)
@@ -20,7 +39,6 @@ def extract_text(file_path, extension):
             text += para.text + "\n"
 
     elif extension in [".py", ".java", ".c", ".cpp", ".js"]:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+        text = read_plain(file_path)
 
     return text
@@ -0,0 +1,171 @@
+import re
+import sys
+
+
+# Word tokenizers
+#
+# RegexTokenizer is a single compiled pass: lowercase + \w+ runs, which is
+# what re.sub(r'\W+', ' ') followed by NLTK word_tokenize produced, minus the
+# cost of Punkt and the Treebank rules. The only Treebank rule that can still
+# fire on such text is the split of a few fused words (cannot -> can not,
+# gonna -> gon na, ...), reproduced here so the outputs stay identical.
+# NltkTokenizer keeps the old pipeline for comparison.
+#
+#   python -m utils.tokenizer [file ...]     parity check against NLTK
+
+TOKEN_RE = re.compile(r'\w+')
+BATCH_RE = re.compile(r'\w+|\x00')
+SEPARATOR = "\x00"
+
+FUSED_WORDS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+
+class RegexTokenizer:
+
+    def __init__(self, stop_words=(), intern=False):
+        self.stop_words = frozenset(stop_words)
+        self.intern = intern
+        self.vocabulary = {}
+
+    def _finish(self, tokens, min_len=1, drop_stopwords=False, fused=True):
+        if fused and FUSED_WORDS.keys() & set(tokens):
+            split = []
+            for t in tokens:
+                split.extend(FUSED_WORDS.get(t, (t,)))
+            tokens = split
+
+        if min_len > 1:
+            tokens = [t for t in tokens if len(t) >= min_len]
+
+        if drop_stopwords:
+            stop_words = self.stop_words
+            tokens = [t for t in tokens if t not in stop_words]
+
+        if self.intern:
+            tokens = list(map(sys.intern, tokens))
+
+        return tokens
+
+    def tokenize(self, text, min_len=1):
+        return self._finish(TOKEN_RE.findall(text.lower()), min_len)
+
+    # Plain \w+ runs without the Treebank splits (n-grams, TF-IDF)
+    def words(self, text, min_len=1):
+        return self._finish(TOKEN_RE.findall(text.lower()), min_len, fused=False)
+
+    # Tokens without stopwords (Jaccard / preprocess)
+    def content_tokens(self, text):
+        return self._finish(TOKEN_RE.findall(text.lower()), drop_stopwords=True)
+
+    # Many texts in one regex pass; returns one token list per text
+    def tokenize_batch(self, texts, min_len=1, drop_stopwords=False):
+        texts = list(texts)
+        if not texts:
+            return []
+
+        joined = SEPARATOR.join(t.replace(SEPARATOR, " ") for t in texts).lower()
+
+        groups = [[]]
+        for token in BATCH_RE.findall(joined):
+            if token == SEPARATOR:
+                groups.append([])
+            else:
+                groups[-1].append(token)
+
+        return [self._finish(g, min_len, drop_stopwords) for g in groups]
+
+    # Integer token ids from a growing vocabulary (batch jobs, not requests)
+    def ids(self, tokens):
+        vocabulary = self.vocabulary
+        return [vocabulary.setdefault(t, len(vocabulary)) for t in tokens]
+
+
+class NltkTokenizer(RegexTokenizer):
+
+    def _words(self, text):
+        from nltk.tokenize import word_tokenize
+
+        return word_tokenize(re.sub(r'\W+', ' ', text.lower()))
+
+    def tokenize(self, text, min_len=1):
+        return [t for t in self._words(text) if len(t) >= min_len]
+
+    def content_tokens(self, text):
+        return [t for t in self._words(text) if t not in self.stop_words]
+
+    def tokenize_batch(self, texts, min_len=1, drop_stopwords=False):
+        if drop_stopwords:
+            return [self.content_tokens(t) for t in texts]
+        return [self.tokenize(t, min_len) for t in texts]
+
+
+TOKENIZERS = {
+    "regex": RegexTokenizer,
+    "nltk": NltkTokenizer,
+}
+
+
+def get_tokenizer(name="regex", stop_words=(), intern=False):
+    cls = TOKENIZERS.get((name or "regex").lower())
+
+    if cls is None:
+        print(f"⚠ Unknown tokenizer '{name}', falling back to regex")
+        cls = RegexTokenizer
+
+    return cls(stop_words, intern=intern)
+
+
+# Compare the regex tokenizer with the NLTK pipeline on the given texts
+
+def parity_check(texts, stop_words=()):
+    fast = RegexTokenizer(stop_words)
+    reference = NltkTokenizer(stop_words)
+    mismatches = []
+
+    batch = fast.tokenize_batch(texts)
+
+    for i, text in enumerate(texts):
+        expected = reference.content_tokens(text)
+        got = fast.content_tokens(text)
+
+        if got != expected or batch[i] != fast.tokenize(text):
+            mismatches.append((i, expected[:20], got[:20]))
+
+    return mismatches
+
+
+SAMPLE_TEXTS = [
+    "The quick brown fox jumps over the lazy dog.",
+    "I cannot believe it's not butter -- we're gonna need a bigger boat!",
+    "E-mail me at john_doe@example.com, or call (555) 123-4567.",
+    "Naïve café owners' résumés aren't always up-to-date.",
+    "def tokenize(text): return re.findall(r'\\w+', text.lower())",
+    "",
+    "   ",
+    "Numbers like 3.14159 and 1,000,000 appear in texts; so do 'quotes'.",
+]
+
+
+if __name__ == "__main__":
+    from nltk.corpus import stopwords
+
+    texts = SAMPLE_TEXTS
+    if len(sys.argv) > 1:
+        texts = []
+        for path in sys.argv[1:]:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                texts.extend(f.read().splitlines())
+
+    mismatches = parity_check(texts, set(stopwords.words("english")))
+
+    for index, expected, got in mismatches:
+        print(f"Mismatch in text {index}:\n  nltk : {expected}\n  regex: {got}")
+
+    print(f"{len(texts) - len(mismatches)}/{len(texts)} texts identical")
@@ -0,0 +1,452 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from config import Config
+from utils.file_lock import file_lock
+
+
+# Persistent approximate nearest-neighbour index of sentence embeddings
+#
+# Every processed submission adds its sentence embeddings here so a new
+# document can be checked semantically against the whole history.
+#
+#   <SENTENCE_INDEX_DIR>/vectors.f32    float32 rows, append-only, memory-mapped
+#   <SENTENCE_INDEX_DIR>/rows.jsonl     one {"owner", "user_id", "text", "content"} per row
+#   <SENTENCE_INDEX_DIR>/deleted.json   owners removed since the last compaction
+#   <SENTENCE_INDEX_DIR>/ivf.npy        IVF centroids (k-means, NumPy)
+#   <SENTENCE_INDEX_DIR>/ivf.json       rows the centroids were trained on
+#
+# Rows belong to an owner ("result:<id>" / "file:<id>"), deleting an owner
+# tombstones its rows. "content" is a hash of the whole document, so a
+# user's document is indexed once however often it is uploaded or
+# re-checked. Search is exact (flat) until enough rows exist to train the
+# IVF coarse quantizer; afterwards only the nprobe nearest lists are
+# scanned.
+#
+# The files are shared by every web worker and CLI process. Writes hold an
+# exclusive lock on index.lock; each process keeps its own in-memory view
+# and re-syncs it whenever the files change on disk (appended rows are read
+# incrementally, anything else reloads). Rewrites go through os.replace, so
+# a reader still holding the old rows/vectors keeps a consistent snapshot.
+
+STATE_FILES = ("rows.jsonl", "vectors.f32", "deleted.json", "ivf.npy")
+
+
+class SentenceIndex:
+
+    DIM = 384
+
+    def __init__(self, path=None):
+        self.path = path or Config.SENTENCE_INDEX_DIR
+        self.lock = threading.RLock()
+        self._rows_file = None
+        os.makedirs(self.path, exist_ok=True)
+
+        with self.lock, file_lock(self._file("index.lock"), shared=True):
+            self._load()
+            self._stamp = self._state()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    # (inode, size, mtime) per state file, None when missing
+    def _state(self):
+        state = []
+        for name in STATE_FILES:
+            try:
+                st = os.stat(self._file(name))
+                state.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def _load(self):
+        self.owners = []
+        self.users = []
+        self.offsets = []
+        self.contents = {}
+        self._rows_end = 0
+
+        # Kept open: row text stays readable even after another process
+        # compacts rows.jsonl underneath us
+        if self._rows_file:
+            self._rows_file.close()
+        self._rows_file = open(self._file("rows.jsonl"), "ab+")
+        self._read_rows()
+
+        self.deleted = set()
+        if os.path.exists(self._file("deleted.json")):
+            with open(self._file("deleted.json"), "r", encoding="utf-8") as f:
+                self.deleted = set(json.load(f))
+
+        self.centroids = None
+        self.trained_rows = 0
+        if os.path.exists(self._file("ivf.npy")):
+            self.centroids = np.load(self._file("ivf.npy"))
+            with open(self._file("ivf.json"), "r", encoding="utf-8") as f:
+                self.trained_rows = json.load(f)["trained_rows"]
+
+        self._map_vectors()
+        self._owner_array = np.asarray(self.owners, dtype=object)
+        self._user_array = np.asarray(self.users, dtype=object)
+        self._alive = ~np.isin(self._owner_array, list(self.deleted)) if self.owners else np.zeros(0, dtype=bool)
+        self._assign = self._assign_rows(self.vectors) if self.centroids is not None else None
+        self._lists = None
+
+    # Parse rows appended after _rows_end; returns how many were read
+    def _read_rows(self):
+        f = self._rows_file
+        f.seek(self._rows_end)
+        added = 0
+
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            row = json.loads(line)
+            self.owners.append(row["owner"])
+            self.users.append(str(row.get("user_id")))
+            self.offsets.append(offset)
+            if row.get("content"):
+                key = (self.users[-1], row["content"])
+                self.contents.setdefault(key, set()).add(row["owner"])
+            added += 1
+
+        self._rows_end = offset
+        return added
+
+    # Take in rows another process appended (no rewrite, no new deletions)
+    def _extend(self):
+        start = len(self.owners)
+        if not self._read_rows():
+            return
+
+        self._map_vectors()
+        self._owner_array = np.asarray(self.owners, dtype=object)
+        self._user_array = np.asarray(self.users, dtype=object)
+        self._alive = np.concatenate([
+            self._alive,
+            ~np.isin(self._owner_array[start:], list(self.deleted))
+        ])
+
+        if self.centroids is not None:
+            self._assign = np.concatenate([self._assign, self._assign_rows(self.vectors[start:])])
+            self._lists = None
+
+    # Bring the in-memory view in line with the files; callers hold the locks
+    def _sync(self):
+        state = self._state()
+        if state == self._stamp:
+            return
+
+        rows, _, deleted, ivf = state
+        old_rows, _, old_deleted, old_ivf = self._stamp
+
+        appended = (
+            rows is not None and old_rows is not None
+            and rows[0] == old_rows[0] and rows[1] >= old_rows[1]
+            and deleted == old_deleted and ivf == old_ivf
+        )
+
+        if appended:
+            self._extend()
+        else:
+            self._load()
+
+        self._stamp = state
+
+    # Pick up writes made by other processes
+    def refresh(self):
+        if self._state() == self._stamp:
+            return
+
+        with self.lock, file_lock(self._file("index.lock"), shared=True):
+            self._sync()
+
+    # Exclusive section for writers: synced first, re-stamped afterwards
+    @contextmanager
+    def _writing(self):
+        with self.lock, file_lock(self._file("index.lock")):
+            self._sync()
+            try:
+                yield
+            finally:
+                self._stamp = self._state()
+
+    def _map_vectors(self):
+        rows = len(self.owners)
+        if rows and os.path.exists(self._file("vectors.f32")):
+            self.vectors = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, self.DIM))
+        else:
+            self.vectors = np.zeros((0, self.DIM), dtype=np.float32)
+
+    def __len__(self):
+        return int(self._alive.sum())
+
+    # ---------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------
+
+    # Whether user_id already has a live document with this content hash
+    def has_content(self, user_id, content):
+        self.refresh()
+
+        with self.lock:
+            return self._has_content(user_id, content)
+
+    def _has_content(self, user_id, content):
+        owners = self.contents.get((str(user_id), content), ())
+        return any(owner not in self.deleted for owner in owners)
+
+    # content: document hash; returns 0 without writing if that user's
+    # document is already indexed
+    def add(self, owner, user_id, sentences, embeddings, content=None):
+        if not len(sentences):
+            return 0
+
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        with self._writing():
+            if content and self._has_content(user_id, content):
+                return 0
+
+            # Vectors first: a row is only visible once its vector exists
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.write(embeddings.tobytes())
+
+            with open(self._file("rows.jsonl"), "ab") as f:
+                f.write(b"".join(
+                    (json.dumps({"owner": owner, "user_id": user_id, "text": text, "content": content}) + "\n").encode("utf-8")
+                    for text in sentences
+                ))
+
+            self._extend()
+            self._maybe_train()
+
+        return len(sentences)
+
+    def delete_owner(self, owner):
+        with self._writing():
+            if owner in self.deleted or not (self._owner_array == owner).any():
+                return
+
+            self.deleted.add(owner)
+            self._alive &= self._owner_array != owner
+
+            self._write_json("deleted.json", sorted(self.deleted))
+
+            # Rewrite once tombstones make up a large share of the rows
+            if len(self.owners) and (1 - self._alive.mean()) > Config.SENTENCE_INDEX_COMPACT_RATIO:
+                self._compact()
+
+    def _write_json(self, name, data):
+        with open(self._file(name + ".tmp"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(self._file(name + ".tmp"), self._file(name))
+
+    def compact(self):
+        with self._writing():
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._alive)
+        vectors = np.asarray(self.vectors[keep]) if len(keep) else np.zeros((0, self.DIM), dtype=np.float32)
+        rows = [self._row(i) for i in keep]
+
+        tmp_vectors = self._file("vectors.f32.tmp")
+        tmp_rows = self._file("rows.jsonl.tmp")
+
+        with open(tmp_vectors, "wb") as f:
+            f.write(vectors.tobytes())
+
+        with open(tmp_rows, "wb") as f:
+            for row in rows:
+                f.write((json.dumps(row) + "\n").encode("utf-8"))
+
+        os.replace(tmp_vectors, self._file("vectors.f32"))
+        os.replace(tmp_rows, self._file("rows.jsonl"))
+
+        if os.path.exists(self._file("deleted.json")):
+            os.remove(self._file("deleted.json"))
+
+        self._load()
+
+    # ---------------------------------------------------------------
+    # IVF coarse quantizer
+    # ---------------------------------------------------------------
+
+    def _nlist(self, rows):
+        return max(1, min(Config.SENTENCE_INDEX_NLIST, int(np.sqrt(rows))))
+
+    def _maybe_train(self):
+        rows = int(self._alive.sum())
+
+        if rows < Config.SENTENCE_INDEX_TRAIN_MIN:
+            return
+
+        # Retrain when the index has grown well past the training size
+        if self.centroids is not None and rows < 4 * self.trained_rows:
+            return
+
+        self._train()
+
+    def train(self, iterations=10, sample=20000):
+        with self._writing():
+            self._train(iterations, sample)
+
+    def _train(self, iterations=10, sample=20000):
+        alive = np.flatnonzero(self._alive)
+        if not len(alive):
+            return
+
+        rng = np.random.default_rng(0)
+        picked = rng.choice(alive, size=min(sample, len(alive)), replace=False)
+        data = np.asarray(self.vectors[np.sort(picked)])
+
+        nlist = self._nlist(len(alive))
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+
+        # Spherical k-means (vectors are L2-normalised)
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[labels == c]
+                if len(members):
+                    centre = members.sum(axis=0)
+                    centroids[c] = centre / (np.linalg.norm(centre) or 1.0)
+
+        self.centroids = centroids.astype(np.float32)
+        self.trained_rows = len(alive)
+
+        # ivf.json first: ivf.npy changing is what other processes watch
+        self._write_json("ivf.json", {"trained_rows": self.trained_rows})
+        with open(self._file("ivf.npy.tmp"), "wb") as f:
+            np.save(f, self.centroids)
+        os.replace(self._file("ivf.npy.tmp"), self._file("ivf.npy"))
+
+        self._assign = self._assign_rows(self.vectors)
+        self._lists = None
+
+    def _assign_rows(self, vectors, batch=8192):
+        if self.centroids is None or not len(vectors):
+            return np.zeros(0, dtype=np.int32)
+
+        parts = [
+            np.argmax(np.asarray(vectors[i:i + batch]) @ self.centroids.T, axis=1).astype(np.int32)
+            for i in range(0, len(vectors), batch)
+        ]
+        return np.concatenate(parts)
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+        return self._lists
+
+    # ---------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------
+
+    def _row(self, i):
+        with self.lock:
+            self._rows_file.seek(self.offsets[i])
+            return json.loads(self._rows_file.readline())
+
+    # Top-k neighbours per query vector: [[(row, score), ...], ...]
+    def search(self, queries, k=3, exclude_user=None, nprobe=None):
+        queries = np.asarray(queries, dtype=np.float32)
+        nprobe = nprobe or Config.SENTENCE_INDEX_NPROBE
+
+        self.refresh()
+
+        with self.lock:
+            if not len(self.owners):
+                return [[] for _ in queries]
+
+            mask = self._alive.copy()
+            if exclude_user is not None:
+                mask &= self._user_array != str(exclude_user)
+
+            results = []
+
+            if self.centroids is None:
+                scores = queries @ np.asarray(self.vectors).T
+                scores[:, ~mask] = -np.inf
+            else:
+                lists = self._inverted_lists()
+                probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+            for qi, query in enumerate(queries):
+                if self.centroids is None:
+                    rows = np.arange(len(self.owners))
+                    row_scores = scores[qi]
+                else:
+                    rows = np.concatenate([lists[c] for c in probes[qi]])
+                    rows = np.sort(rows[mask[rows]])
+                    row_scores = np.asarray(self.vectors[rows]) @ query if len(rows) else np.zeros(0)
+
+                top = min(k, len(rows))
+                if not top:
+                    results.append([])
+                    continue
+
+                best = np.argpartition(-row_scores, top - 1)[:top]
+                best = best[np.argsort(-row_scores[best])]
+
+                results.append([
+                    (int(rows[b]), float(row_scores[b]))
+                    for b in best
+                    if np.isfinite(row_scores[b])
+                ])
+
+            return results
+
+    def describe(self, row):
+        data = self._row(row)
+        return {"owner": data["owner"], "text": data["text"]}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_sentence_index():
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = SentenceIndex()
+        return _index
+
+
+# Keep the index in step with deleted Result / File rows.
+# owners maps model -> owner prefix, e.g. {Result: "result", File: "file"}.
+# Deleted owners are collected at flush and applied only after commit.
+
+def track_deletions(session, owners):
+
+    for model, prefix in owners.items():
+        @event.listens_for(model, "after_delete")
+        def _collect(mapper, connection, target, prefix=prefix):
+            sess = object_session(target)
+            if sess is not None:
+                sess.info.setdefault("deleted_owners", set()).add(f"{prefix}:{target.id}")
+
+    @event.listens_for(session, "after_commit")
+    def _apply(sess):
+        deleted = sess.info.pop("deleted_owners", set())
+        if not deleted:
+            return
+        index = get_sentence_index()
+        for owner in deleted:
+            index.delete_owner(owner)
+
+    @event.listens_for(session, "after_rollback")
+    def _discard(sess):
+        sess.info.pop("deleted_owners", None)
@@ -77,10 +77,12 @@ export default function Results() {
   const tfidf = Number(result.tfidf_score ?? result.overall_score) || 0
   const jaccard = Number(result.jaccard_score) || 0
   const sequence = Number(result.sequence_score) || 0
+  // Metrics the scoring cascade estimated from bounds instead of measuring
+  const estimated = result.estimated_scores || []
   const similarityScores = [
-    { label: 'Exact match', value: tfidf, color: 'var(--danger)' },
-    { label: 'Minimal match', value: jaccard, color: 'var(--warning)' },
-    { label: 'Moderate match', value: sequence, color: 'var(--success)' },
+    { label: 'Exact match', value: tfidf, color: 'var(--danger)', estimated: estimated.includes('tfidf') },
+    { label: 'Minimal match', value: jaccard, color: 'var(--warning)', estimated: estimated.includes('jaccard') },
+    { label: 'Moderate match', value: sequence, color: 'var(--success)', estimated: estimated.includes('sequence') },
     { label: 'High match', value: Math.max(0, score - tfidf), color: 'var(--primary)' },
   ]
 
@@ -148,7 +150,9 @@ export default function Results() {
                 <div className="score-bar-track">
                   <div className="score-bar-fill" style={{ width: `${Math.min(100, s.value)}%`, backgroundColor: s.color }} />
                 </div>
-                <span className="score-bar-value">{s.value.toFixed(2)}</span>
+                <span className="score-bar-value" title={s.estimated ? 'Not measured: estimated from the early-exit bounds' : undefined}>
+                  {s.estimated ? `~${s.value.toFixed(2)} (not measured)` : s.value.toFixed(2)}
+                </span>
               </div>
             ))}
           </div>